@@ -1,17 +1,11 @@
-import dotenv 
-import pkg_resources
-
 from vmk_spectrum3_wrapper.loggers import setdefault_logger
 
 
-dotenv.load_dotenv()
 setdefault_logger()
 
 
-distribution = pkg_resources.get_distribution('vmk-spectrum3-wrapper')
-NAME = distribution.project_name
+NAME = 'vmk-spectrum3-wrapper'
 DESCRIPTION = 'It is a wrapper for `vmk_spectrum3` library.'
-VERSION = distribution.version
 
 AUTHOR_NAME = 'Pavel Vaschenko'
 AUTHOR_EMAIL = 'vaschenko@vmk.ru'
@@ -19,4 +13,10 @@ AUTHOR_EMAIL = 'vaschenko@vmk.ru'
 ORGANIZATION_NAME = 'VMK-Optoelektronika'
 
 
-__version__ = VERSION
+def __getattr__(name: str):  # версия пакета читается из метаданных при первом обращении
+    if name in ('VERSION', '__version__'):
+        from importlib.metadata import version
+
+        return version(NAME)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
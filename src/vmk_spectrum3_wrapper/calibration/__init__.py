@@ -0,0 +1,3 @@
+from .calibration import BiasFitter, calibrate_bias, calibrate_dark, get_assembly_ids
+from .dark_model import DarkModel, calibrate_dark_model
+from .store import CalibrationKey, CalibrationStore, fingerprint
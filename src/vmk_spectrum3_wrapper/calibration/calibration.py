@@ -0,0 +1,252 @@
+from collections.abc import Sequence
+import logging
+import time
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.calibration.exceptions import CalibrationError
+from vmk_spectrum3_wrapper.calibration.store import CalibrationKey, CalibrationStore, fingerprint
+from vmk_spectrum3_wrapper.data import Data, Meta
+from vmk_spectrum3_wrapper.device import Device
+from vmk_spectrum3_wrapper.measurement_manager.filters import StandardIntegrationPreset, SwitchFilter
+from vmk_spectrum3_wrapper.types import Array, MilliSecond, U
+from vmk_spectrum3_wrapper.units import Units
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def calibrate_dark(
+    device: Device,
+    exposure: MilliSecond | tuple[MilliSecond, MilliSecond],
+    capacity: int | tuple[int, int],
+    units: Units | None = None,
+    bias: Data | None = None,
+    show: bool = False,
+    save: bool = False,
+    store: CalibrationStore | None = None,
+) -> Data:
+    """Calibrate device by dark signal (or reuse a valid one from `store`)."""
+    key = CalibrationKey(
+        kind='dark',
+        exposure=exposure,
+        capacity=capacity,
+        units=units or Units.percent,
+        assembly_ids=get_assembly_ids(device),
+        bias=fingerprint(bias),
+    )
+
+    if store is not None:
+        dark = store.load(key)
+        if dark is not None:
+            LOGGER.info('Dark %s is loaded from %r', key.name, store)
+            return dark
+
+    device = device.setup(
+        n_times=1,
+        exposure=exposure,
+        capacity=capacity,
+        filter={
+            int: StandardIntegrationPreset(units=units, bias=bias),
+            tuple: SwitchFilter([
+                StandardIntegrationPreset(units=units, bias=bias),
+                StandardIntegrationPreset(units=units, bias=bias),
+            ]),
+        }.get(type(capacity)),
+    )
+    dark = device.read()
+
+    # show
+    if show:
+        dark.show()
+
+    # save
+    if save:
+        dark.save('dark.pkl')
+    if store is not None:
+        store.save(key, dark)
+
+    #
+    return dark
+
+
+class BiasFitter:
+    """Линейная аппроксимация `intensity = bias + slope * exposure` всех отсчетов одновременно.
+
+    Суммы `n, Sx, Sxx, Sy, Sxy, Syy` (без зашкаленных отсчетов) накапливаются по мере получения экспозиций, поэтому промежуточные `data` не хранятся.
+    Дисперсия отсчетов, аппроксимированных ровно по двум экспозициям, оценивается по остаткам всех отсчетов; параметры неопределенных отсчетов (см. маску) заменяются медианой определенных.
+    """
+
+    def __init__(self, n_numbers: int):
+        self._n = np.zeros(n_numbers, dtype=int)
+        self._sx = np.zeros(n_numbers)
+        self._sxx = np.zeros(n_numbers)
+        self._sy = np.zeros(n_numbers)
+        self._sxy = np.zeros(n_numbers)
+        self._syy = np.zeros(n_numbers)
+
+    @property
+    def n_numbers(self) -> int:
+        return len(self._n)
+
+    def update(self, exposure: MilliSecond, intensity: Array[U], clipped: Array[bool] | None = None) -> None:
+        """Добавить экспозицию `exposure` c интенсивностью `intensity` (формы `(n_numbers, )`)."""
+        mask = np.ones(self.n_numbers, dtype=bool) if clipped is None else ~clipped
+        x = mask * exposure
+        y = np.where(mask, intensity, 0)
+
+        self._n += mask
+        self._sx += x
+        self._sxx += x * exposure
+        self._sy += y
+        self._sxy += x * y
+        self._syy += y * y
+
+    def fit(self) -> tuple[Array[U], Array[U], Array[U], Array[bool]]:
+        """Рассчитать `bias`, `slope`, стандартное отклонение `bias` и маску неопределенных отсчетов."""
+        bias, slope, scale, clipped = self._solve()
+
+        return fill(bias, clipped), fill(slope, clipped), fill(np.sqrt(scale * self._sxx), clipped), clipped
+
+    def covariance(self) -> tuple[Array[U], Array[U], Array[U]]:
+        """Рассчитать дисперсии `bias`, `slope` и их ковариацию."""
+        _, _, scale, clipped = self._solve()
+
+        return fill(scale * self._sxx, clipped), fill(scale * self._n, clipped), fill(-scale * self._sx, clipped)
+
+    def _solve(self) -> tuple[Array[U], Array[U], Array[U], Array[bool]]:
+        n, sx, sxx, sy, sxy, syy = self._n, self._sx, self._sxx, self._sy, self._sxy, self._syy
+
+        det = n*sxx - sx**2
+        clipped = (n < 2) | (det <= 0)  # менее двух различных незашкаленных экспозиций
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(clipped, np.nan, (n*sxy - sx*sy) / det)
+            bias = np.where(clipped, np.nan, (sy - slope*sx) / n)
+
+            residual = np.maximum(syy - bias*sy - slope*sxy, 0)  # сумма квадратов остатков
+
+            determined = ~clipped & (n > 2)
+            if np.any(determined):
+                pooled = np.sum(residual[determined]) / np.sum(n[determined] - 2)  # дисперсия по остаткам всех отсчетов
+            else:
+                pooled = np.nan
+                clipped = clipped | (n <= 2)  # дисперсия не определена: аппроксимация по двум экспозициям без остатков
+            if np.all(clipped):
+                raise CalibrationError('Bias is not determined: at least 3 different unclipped exposures are required!')
+
+            variance = np.where(n > 2, residual / (n - 2), pooled)
+
+            return bias, slope, np.where(clipped, np.nan, variance / det), clipped
+
+
+def fill(value: Array[U], clipped: Array[bool]) -> Array[U]:
+    """Заменить значения неопределенных отсчетов `clipped` медианой определенных."""
+
+    if not np.any(clipped):
+        return value
+    return np.where(clipped, np.median(value[~clipped]), value)
+
+
+def calibrate_bias(
+    device: Device,
+    exposure: Sequence[MilliSecond],
+    capacity: int,
+    units: Units | None = None,
+    show: bool = False,
+    save: bool = False,
+    store: CalibrationStore | None = None,
+) -> Data:
+    """Calibrate device by bias signal (or reuse a valid one from `store`)."""
+    exposure = np.array(exposure)
+    key = CalibrationKey(
+        kind='bias',
+        exposure=None,
+        capacity=None,
+        units=units or Units.percent,
+        assembly_ids=get_assembly_ids(device),
+    )
+
+    if store is not None:
+        bias = store.load(key)
+        if bias is not None:
+            LOGGER.info('Bias %s is loaded from %r', key.name, store)
+            return bias
+
+    from tqdm import tqdm  # `tqdm` импортируется только при калибровке
+
+    fitter = None
+    started_at = time.time()
+    for tau in tqdm(exposure):
+        device = device.setup(
+            n_times=1,
+            exposure=tau.item(),
+            capacity=capacity,
+            filter=StandardIntegrationPreset(
+                units=units,
+            ),
+        )
+        datum = device.read()
+
+        #
+        fitter = fitter or BiasFitter(datum.n_numbers)
+        fitter.update(
+            exposure=tau,
+            intensity=datum.intensity[0],
+            clipped=None if datum.clipped is None else datum.clipped[0],
+        )
+    finished_at = time.time()
+
+    # bias
+    intensity, _, deviation, clipped = fitter.fit()
+
+    bias = Data(
+        units=datum.units,
+        intensity=intensity,
+        clipped=clipped,
+        deviation=deviation,
+        meta=Meta(
+            exposure=tuple(exposure.tolist()),
+            capacity=capacity,
+            started_at=started_at,
+            finished_at=finished_at,
+        ),
+    )
+
+    # show
+    if show:
+        import matplotlib.pyplot as plt
+
+        plt.subplots(figsize=(6, 4), tight_layout=True)
+
+        plt.step(
+            bias.number, bias.intensity.flatten(),
+            where='mid',
+            color='black', linestyle='-', linewidth=1.5,
+        )
+        plt.fill_between(
+            bias.number,
+            (bias.intensity - bias.deviation).flatten(),
+            (bias.intensity + bias.deviation).flatten(),
+            step='mid',
+            color='grey', alpha=.5,
+        )
+
+        plt.show()
+
+    # save
+    if save:
+        bias.save('bias.pkl')
+    if store is not None:
+        store.save(key, bias)
+
+    #
+    return bias
+
+
+def get_assembly_ids(device: Device) -> tuple[str, ...]:
+    """Идентификаторы сборок устройства (по статусу подключения)."""
+
+    if device.status is None:
+        return ()
+    return tuple(sorted(device.status))
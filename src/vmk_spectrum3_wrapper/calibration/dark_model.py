@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.calibration.calibration import BiasFitter, calibrate_dark
+from vmk_spectrum3_wrapper.calibration.exceptions import CalibrationError
+from vmk_spectrum3_wrapper.calibration.store import CalibrationStore
+from vmk_spectrum3_wrapper.data import Data, Meta
+from vmk_spectrum3_wrapper.device import Device
+from vmk_spectrum3_wrapper.types import Array, MilliSecond, U
+from vmk_spectrum3_wrapper.units import Units
+
+
+class DarkModel:
+    """Модель темнового сигнала `dark = bias + rate * exposure` всех отсчетов.
+
+    Темновой сигнал рассчитывается для любого времени экспозиции (в том числе для пары экспозиций схемы HDR); рассчитанные `dark` кэшируются.
+    Параметры:
+        `units` - единицы темнового сигнала;
+        `bias`, `rate` - параметры модели;
+        `covariance` - дисперсии `bias`, `rate` и их ковариация;
+        `clipped` - маска отсчетов, для которых модель не определена;
+        `maxsize` - максимальное количество кэшированных `dark`.
+    """
+
+    def __init__(
+        self,
+        units: Units,
+        bias: Array[U],
+        rate: Array[U],
+        covariance: tuple[Array[U], Array[U], Array[U]],
+        clipped: Array[bool],
+        meta: Meta | None = None,
+        maxsize: int = 32,
+    ):
+        self._units = units
+        self._bias = bias
+        self._rate = rate
+        self._covariance = covariance
+        self._clipped = clipped
+        self._meta = meta
+
+        self._maxsize = maxsize
+        self._cache = OrderedDict()
+
+    @property
+    def units(self) -> Units:
+        return self._units
+
+    @property
+    def bias(self) -> Array[U]:
+        return self._bias
+
+    @property
+    def rate(self) -> Array[U]:
+        return self._rate
+
+    @property
+    def n_numbers(self) -> int:
+        return len(self._bias)
+
+    @classmethod
+    def fit(
+        cls,
+        exposure: Sequence[MilliSecond],
+        data: Sequence[Data],
+        **kwargs,
+    ) -> 'DarkModel':
+        """Рассчитать модель по темновым сигналам `data`, измеренным при временах экспозиции `exposure`."""
+
+        if len(exposure) != len(data):
+            raise CalibrationError(f'Exposure and data are not consistent: {len(exposure)} != {len(data)}!')
+        if len({datum.units for datum in data}) != 1:
+            raise CalibrationError('Data with different units are not supported!')
+
+        fitter = BiasFitter(data[0].n_numbers)
+        for tau, datum in zip(exposure, data):
+            fitter.update(
+                exposure=tau,
+                intensity=datum.intensity[0],
+                clipped=None if datum.clipped is None else datum.clipped[0],
+            )
+        bias, rate, _, clipped = fitter.fit()
+
+        return cls(
+            units=data[0].units,
+            bias=bias,
+            rate=rate,
+            covariance=fitter.covariance(),
+            clipped=clipped,
+            meta=Meta(
+                exposure=tuple(exposure),
+                capacity=None,
+                started_at=min((datum.meta.started_at for datum in data if datum.meta), default=None),
+                finished_at=max((datum.meta.finished_at for datum in data if datum.meta), default=None),
+            ),
+            **kwargs,
+        )
+
+    def __call__(self, exposure: MilliSecond | tuple[MilliSecond, MilliSecond]) -> Data:
+        """Рассчитать `dark` для времени экспозиции `exposure` (кэшированный `dark` доступен только для чтения)."""
+
+        if exposure in self._cache:
+            self._cache.move_to_end(exposure)
+            return self._cache[exposure]
+
+        dark = self._evaluate(exposure)
+
+        self._cache[exposure] = dark
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+        return dark
+
+    def _evaluate(self, exposure: MilliSecond | tuple[MilliSecond, MilliSecond]) -> Data:
+        tau = np.atleast_1d(exposure).astype(float)[:, np.newaxis]
+        variance_bias, variance_rate, covariance = self._covariance
+
+        intensity = self._bias + self._rate*tau
+        clipped = np.broadcast_to(self._clipped, intensity.shape).copy()
+        deviation = np.sqrt(np.maximum(variance_bias + 2*tau*covariance + tau**2*variance_rate, 0))
+
+        for value in (intensity, clipped, deviation):
+            value.setflags(write=False)
+
+        return Data(
+            units=self.units,
+            intensity=intensity,
+            clipped=clipped,
+            deviation=deviation,
+            meta=Meta(
+                exposure=exposure,
+                capacity=None,
+                started_at=self._meta.started_at if self._meta else None,
+                finished_at=self._meta.finished_at if self._meta else None,
+            ),
+        )
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.units}, n_numbers={self.n_numbers})'
+
+
+def calibrate_dark_model(
+    device: Device,
+    exposure: Sequence[MilliSecond],
+    capacity: int,
+    units: Units | None = None,
+    bias: Data | None = None,
+    store: CalibrationStore | None = None,
+) -> DarkModel:
+    """Calibrate device by dark signal at a few exposures and fit a dark model."""
+
+    data = [
+        calibrate_dark(
+            device=device,
+            exposure=tau,
+            capacity=capacity,
+            units=units,
+            bias=bias,
+            store=store,
+        )
+        for tau in exposure
+    ]
+
+    return DarkModel.fit(exposure, data)
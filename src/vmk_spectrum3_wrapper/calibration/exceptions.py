@@ -0,0 +1,6 @@
+class CalibrationError(Exception):
+    pass
+
+
+class CalibrationStoreError(CalibrationError):
+    pass
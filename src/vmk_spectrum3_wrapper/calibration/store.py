@@ -0,0 +1,226 @@
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Literal, Mapping
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.adc import ADC
+from vmk_spectrum3_wrapper.calibration.exceptions import CalibrationStoreError
+from vmk_spectrum3_wrapper.config import DEFAULT_ADC, DEFAULT_DETECTOR
+from vmk_spectrum3_wrapper.data import Data, Meta
+from vmk_spectrum3_wrapper.detector import Detector
+from vmk_spectrum3_wrapper.types import MilliSecond, Path, Second
+from vmk_spectrum3_wrapper.units import Units
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CalibrationKey:
+    """Ключ калибровки (`exposure`, `capacity` и `bias` калибровки `bias` не задаются).
+
+    Калибровка `dark` измеряется за вычетом `bias`, поэтому ее ключ содержит отпечаток `bias` (см. `fingerprint`): после сохранения нового `bias` прежний `dark` не находится.
+    """
+    kind: Literal['bias', 'dark']
+    exposure: MilliSecond | tuple[MilliSecond, MilliSecond] | None
+    capacity: int | tuple[int, int] | None
+    units: Units
+    assembly_ids: tuple[str, ...] = field(default=())
+    detector: Detector = field(default=DEFAULT_DETECTOR)
+    adc: ADC = field(default=DEFAULT_ADC)
+    bias: str | None = field(default=None)
+
+    @property
+    def name(self) -> str:
+        """Имя файлов калибровки в хранилище."""
+        dump = json.dumps(self.dumps(), sort_keys=True)
+
+        return '{kind}-{hash}'.format(
+            kind=self.kind,
+            hash=hashlib.sha1(dump.encode()).hexdigest()[:16],
+        )
+
+    def dumps(self) -> Mapping[str, Any]:
+
+        def inner(value):
+            if value is None:
+                return None
+            if isinstance(value, tuple | list):
+                return [inner(item) for item in value]
+            return float(value)
+
+        return {
+            'kind': self.kind,
+            'exposure': inner(self.exposure),
+            'capacity': inner(self.capacity),
+            'units': str(self.units),
+            'assembly_ids': sorted(self.assembly_ids),
+            'detector': self.detector.name,
+            'adc': self.adc.name,
+            'bias': self.bias,
+        }
+
+
+def fingerprint(data: Data | None) -> str | None:
+    """Отпечаток калибровки `data` (по интенсивности)."""
+
+    if data is None:
+        return None
+    return hashlib.sha1(np.ascontiguousarray(data.intensity).tobytes()).hexdigest()[:16]
+
+
+class CalibrationStore:
+    """Хранилище калибровок (`bias`, `dark`).
+
+    Каждая калибровка хранится набором `.npy` файлов (загружаются memory-mapped), описание калибровок и время их измерения - в файле `index.json`.
+    Файлы калибровки заменяются атомарно: загруженные ранее (memory-mapped) калибровки остаются доступны после перезаписи.
+    Параметры:
+        `directory` - путь к хранилищу;
+        `expiry` - срок годности калибровок (`None` - бессрочно).
+    """
+    INDEX = 'index.json'
+    FIELDS = ('intensity', 'clipped', 'deviation', 'number')
+
+    def __init__(
+        self,
+        directory: Path,
+        expiry: Second | None = 12*60*60,
+    ):
+        os.makedirs(directory, exist_ok=True)
+
+        self._directory = directory
+        self._expiry = expiry
+        self._index = self._read_index()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def expiry(self) -> Second | None:
+        return self._expiry
+
+    def save(self, key: CalibrationKey, data: Data) -> None:
+        """Сохранить калибровку `data` по ключу `key`."""
+
+        fields = []
+        for name in self.FIELDS:
+            value = data.number if name == 'number' else getattr(data, name)
+            if value is None:
+                continue
+
+            filepath = self._filepath(key, name)
+            with open(f'{filepath}.tmp', 'wb') as file:
+                np.save(file, np.asarray(value))
+            os.replace(f'{filepath}.tmp', filepath)  # файл не перезаписывается на месте (может быть отображен в память)
+            fields.append(name)
+
+        self._index[key.name] = {
+            'key': key.dumps(),
+            'units': str(data.units),
+            'fields': fields,
+            'meta': data.meta.dumps() if data.meta else None,
+            'created_at': time.time(),
+        }
+        self._write_index()
+
+    def load(self, key: CalibrationKey, timestamp: float | None = None) -> Data | None:
+        """Загрузить калибровку по ключу `key` (`None`, если калибровка не найдена или просрочена)."""
+
+        entry = self._index.get(key.name)
+        if entry is None:
+            return None
+        if self.is_expired(key, timestamp=timestamp):
+            LOGGER.info('Calibration %s is expired!', key.name)
+            return None
+
+        try:
+            values = {
+                name: np.load(self._filepath(key, name), mmap_mode='r')
+                for name in entry['fields']
+            }
+        except OSError as error:
+            raise CalibrationStoreError(f'Calibration {key.name} is corrupted: {error}') from error
+
+        return Data(
+            units=key.units,
+            intensity=values['intensity'],
+            clipped=values.get('clipped'),
+            deviation=values.get('deviation'),
+            number=values.get('number'),
+            meta=None if entry['meta'] is None else Meta.loads(entry['meta']),
+        )
+
+    def find(
+        self,
+        kind: Literal['bias', 'dark'],
+        exposure: MilliSecond | tuple[MilliSecond, MilliSecond] | None = None,
+        capacity: int | tuple[int, int] | None = None,
+        units: Units | None = None,
+        *,
+        assembly_ids: tuple[str, ...],
+        bias: Data | None = None,
+    ) -> Data | None:
+        """Найти действительную калибровку (`assembly_ids` - идентификаторы сборок устройства, см. `get_assembly_ids`)."""
+
+        return self.load(CalibrationKey(
+            kind=kind,
+            exposure=exposure,
+            capacity=capacity,
+            units=units or Units.percent,
+            assembly_ids=tuple(sorted(assembly_ids)),
+            bias=None if kind == 'bias' else fingerprint(bias),
+        ))
+
+    def is_expired(self, key: CalibrationKey, timestamp: float | None = None) -> bool:
+        entry = self._index[key.name]
+        timestamp = timestamp or time.time()
+
+        return self.expiry is not None and timestamp - entry['created_at'] > self.expiry
+
+    def remove(self, key: CalibrationKey) -> None:
+        """Удалить калибровку по ключу `key`."""
+
+        entry = self._index.pop(key.name, None)
+        if entry is None:
+            return
+
+        for name in entry['fields']:
+            filepath = self._filepath(key, name)
+            if os.path.exists(filepath):
+                os.remove(filepath)
+        self._write_index()
+
+    def _filepath(self, key: CalibrationKey, name: str) -> Path:
+        return os.path.join(self.directory, f'{key.name}.{name}.npy')
+
+    def _read_index(self) -> dict[str, Mapping[str, Any]]:
+        filepath = os.path.join(self.directory, self.INDEX)
+        if not os.path.exists(filepath):
+            return {}
+
+        with open(filepath, 'r') as file:
+            return json.load(file)
+
+    def _write_index(self) -> None:
+        filepath = os.path.join(self.directory, self.INDEX)
+
+        with open(f'{filepath}.tmp', 'w') as file:
+            json.dump(self._index, file, indent=4)
+        os.replace(f'{filepath}.tmp', filepath)  # индекс заменяется атомарно
+
+    def __contains__(self, key: CalibrationKey) -> bool:
+        return key.name in self._index and not self.is_expired(key)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.directory}, {len(self)} calibrations)'
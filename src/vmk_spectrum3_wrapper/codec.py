@@ -0,0 +1,377 @@
+"""Сжатие массивов без потерь (только стандартная библиотека: `zlib`, `lzma`).
+
+Массив разбивается на блоки по `block_size` строк; каждый блок кодируется и сжимается независимо, поэтому любые строки читаются без распаковки всего массива.
+Блоки сжимаются и распаковываются в пуле потоков (`zlib` и `lzma` освобождают GIL).
+"""
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import lzma
+import os
+import struct
+from typing import Any, Literal, Mapping
+import zlib
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.exception import CodecError
+from vmk_spectrum3_wrapper.types import Array, Path
+
+
+class Codec:
+    """Кодек сжатия массивов без потерь.
+
+    Параметры:
+        `compression` - алгоритм сжатия;
+        `filter` - предварительное кодирование блока: `shuffle` - перестановка байтов, `delta` - разности соседних отсчетов строки (целочисленных массивов или полей) и перестановка байтов;
+        `level` - уровень сжатия;
+        `block_size` - количество строк в блоке;
+        `n_workers` - количество потоков сжатия.
+    """
+
+    def __init__(
+        self,
+        compression: Literal['zlib', 'lzma'] = 'zlib',
+        filter: Literal['shuffle', 'delta'] | None = 'shuffle',
+        level: int | None = None,
+        block_size: int = 64,
+        n_workers: int | None = None,
+    ):
+        if compression not in ('zlib', 'lzma'):
+            raise CodecError(f'Compression {compression} is not supported!')
+        if filter not in ('shuffle', 'delta', None):
+            raise CodecError(f'Filter {filter} is not supported!')
+
+        self._compression = compression
+        self._filter = filter
+        self._level = level
+        self._block_size = block_size
+        self._n_workers = n_workers or min(4, os.cpu_count() or 1)
+        self._executor = None
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._n_workers, thread_name_prefix=self.__class__.__name__)
+        return self._executor
+
+    # --------        block        --------
+    def encode_block(self, value: Array) -> bytes:
+        """Закодировать и сжать блок `value`."""
+        value = np.ascontiguousarray(value)
+
+        if self._filter == 'delta':
+            value = value.copy()
+
+            for name in integer_fields(value.dtype):
+                item = value if name is None else value[name]
+                item[..., 1:] -= item[..., :-1].copy()  # переполнение беззнаковых типов обратимо
+        if self._filter in ('shuffle', 'delta'):
+            value = value.view(np.uint8).reshape(-1, value.dtype.itemsize).T
+
+        buffer = np.ascontiguousarray(value).tobytes()
+        if self._compression == 'zlib':
+            return zlib.compress(buffer, level=-1 if self._level is None else self._level)
+        return lzma.compress(buffer, preset=self._level)
+
+    def decode_block(self, buffer: bytes, dtype: np.dtype, shape: tuple[int, ...]) -> Array:
+        """Распаковать и декодировать блок формы `shape`."""
+        dtype = np.dtype(dtype)
+        shape, dtype = (*shape, *dtype.shape), dtype.base
+
+        if self._compression == 'zlib':
+            buffer = zlib.decompress(buffer)
+        else:
+            buffer = lzma.decompress(buffer)
+
+        value = np.frombuffer(buffer, dtype=np.uint8)
+        if self._filter in ('shuffle', 'delta'):
+            value = value.reshape(dtype.itemsize, -1).T.copy()
+        value = value.view(dtype).reshape(shape)
+
+        if self._filter == 'delta':
+            for name in integer_fields(value.dtype):
+                item = value if name is None else value[name]
+                item[...] = np.cumsum(item, axis=-1, dtype=item.dtype)
+
+        return value
+
+    def for_dtype(self, dtype: np.dtype) -> 'Codec':
+        """Кодек для массивов типа `dtype`: нецелочисленные массивы кодируются без разностей (только перестановкой байтов)."""
+        dtype = np.dtype(dtype)
+        if self._filter != 'delta' or dtype.names is not None or dtype.base.kind in 'iu':
+            return self
+
+        return self.__class__(
+            compression=self._compression,
+            filter='shuffle',
+            level=self._level,
+            block_size=self._block_size,
+            n_workers=self._n_workers,
+        )
+
+    def validate(self, dtype: np.dtype) -> None:
+        """Проверить, что массивы типа `dtype` могут быть сжаты кодеком."""
+        self.encode_block(np.zeros(1, dtype=dtype))
+
+    # --------        array        --------
+    def submit(self, value: Array) -> Future:
+        """Сжать блок `value` в пуле потоков."""
+        return self.executor.submit(self.encode_block, value)
+
+    def encode(self, value: Array) -> list[bytes]:
+        """Сжать массив `value` поблочно (вдоль первой оси)."""
+
+        return list(self.executor.map(
+            self.encode_block,
+            [value[i:i+self.block_size] for i in range(0, max(len(value), 1), self.block_size)],
+        ))
+
+    def decode(self, blocks: Sequence[bytes], dtype: np.dtype, shape: tuple[int, ...], start: int = 0) -> Array:
+        """Распаковать блоки `blocks` массива формы `shape`, начиная с блока `start`."""
+        n_rows = shape[0]
+
+        def inner(i: int, buffer: bytes) -> Array:
+            rows = min(self.block_size, n_rows - i*self.block_size)
+            return self.decode_block(buffer, dtype=dtype, shape=(rows, *shape[1:]))
+
+        return np.concatenate(list(self.executor.map(inner, range(start, start + len(blocks)), blocks)))
+
+    def dumps(self) -> Mapping[str, Any]:
+        return {
+            'compression': self._compression,
+            'filter': self._filter,
+            'level': self._level,
+            'block_size': self._block_size,
+        }
+
+    @classmethod
+    def loads(cls, __dump: Mapping[str, Any]) -> 'Codec':
+        return cls(**__dump)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self._compression}, filter={self._filter}, block_size={self.block_size})'
+
+
+def integer_fields(__dtype: np.dtype) -> list[str | None]:
+    """Целочисленные поля типа `dtype` (`None` - сам тип), кодируемые разностями."""
+
+    if __dtype.names is None:
+        if __dtype.base.kind not in 'iu':
+            raise CodecError(f'Delta filter is not supported for dtype: {__dtype}!')
+        return [None]
+
+    return [
+        name
+        for name in __dtype.names
+        if __dtype[name].base.kind in 'iu'
+    ]
+
+
+# --------        block file        --------
+MAGIC = b'VMKBLKS\x00'
+SIZE = struct.Struct('<I')
+BLOCK = struct.Struct('<II')  # количество строк и размер сжатого блока
+
+
+class BlockWriter:
+    """Запись строк в файл сжатых блоков (только добавление).
+
+    Блоки сжимаются в пуле потоков кодека и записываются в порядке поступления; каждый блок предваряется количеством строк и размером, поэтому файл читается и без завершения записи.
+    """
+
+    def __init__(self, filepath: Path, dtype: np.dtype, codec: Codec):
+        self._filepath = filepath
+        self._dtype = np.dtype(dtype)
+        self._codec = codec
+        self._codec.validate(self._dtype)
+
+        self._file = open(filepath, 'bw')
+        header = json.dumps({
+            'dtype': np.lib.format.dtype_to_descr(self._dtype.base),
+            'shape': list(self._dtype.shape),  # тип строки может быть подмассивом
+            'codec': codec.dumps(),
+        }).encode()
+        self._file.write(MAGIC + SIZE.pack(len(header)) + header)
+
+        self._buffer = np.zeros(codec.block_size, dtype=self._dtype)
+        self._n_buffered = 0
+        self._pending = []
+        self._n_written = 0
+
+    @property
+    def n_written(self) -> int:
+        """Количество записанных (в том числе ожидающих сжатия) строк."""
+        return self._n_written
+
+    def write(self, row: Array) -> None:
+        """Добавить строку `row`."""
+
+        self._buffer[self._n_buffered] = row
+        self._n_buffered += 1
+        self._n_written += 1
+
+        if self._n_buffered == len(self._buffer):
+            self._submit()
+        self._drain(wait=False)
+
+    def flush(self) -> None:
+        """Дописать сжатые блоки и сбросить файл на диск."""
+
+        self._drain(wait=False)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Сжать оставшиеся строки, дописать блоки и закрыть файл."""
+
+        if self._n_buffered:
+            self._submit()
+        self._drain(wait=True)
+
+        self._file.close()
+
+    def _submit(self) -> None:
+        block = self._buffer[:self._n_buffered].copy()
+
+        self._pending.append((len(block), self._codec.submit(block)))
+        self._n_buffered = 0
+
+    def _drain(self, wait: bool) -> None:
+        while self._pending and (wait or self._pending[0][1].done()):
+            n_rows, future = self._pending.pop(0)
+            buffer = future.result()
+
+            self._file.write(BLOCK.pack(n_rows, len(buffer)))
+            self._file.write(buffer)
+
+
+class BlockReader:
+    """Чтение файла сжатых блоков (распаковываются только блоки, содержащие выбранные строки)."""
+
+    def __init__(self, filepath: Path):
+        with open(filepath, 'br') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise CodecError(f'File {filepath} is not a block file!')
+
+            size, = SIZE.unpack(file.read(SIZE.size))
+            header = json.loads(file.read(size).decode())
+
+            blocks = []
+            while True:
+                prefix = file.read(BLOCK.size)
+                if len(prefix) < BLOCK.size:
+                    break
+
+                n_rows, size = BLOCK.unpack(prefix)
+                offset = file.tell()
+                if file.seek(size, os.SEEK_CUR) > os.path.getsize(filepath):  # недописанный блок отбрасывается
+                    break
+                blocks.append((offset, size, n_rows))
+
+        self._filepath = filepath
+        self._dtype = np.dtype((np.lib.format.descr_to_dtype(header['dtype']), tuple(header.get('shape', ()))))
+        self._codec = Codec.loads(header['codec'])
+        self._blocks = blocks
+        self._starts = np.cumsum([0, *[n_rows for _, _, n_rows in blocks]])
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def n_blocks(self) -> int:
+        return len(self._blocks)
+
+    def read(self, start: int = 0, stop: int | None = None) -> Array:
+        """Прочитать строки `[start, stop)`."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return np.zeros(0, dtype=self.dtype)
+
+        lo = np.searchsorted(self._starts, start, side='right') - 1
+        hi = np.searchsorted(self._starts, stop, side='left')
+
+        value = np.concatenate(list(self._codec.executor.map(self._read_block, range(lo, hi))))
+        return value[start - self._starts[lo]:stop - self._starts[lo]]
+
+    def _read_block(self, i: int) -> Array:
+        offset, size, n_rows = self._blocks[i]
+
+        with open(self._filepath, 'br') as file:
+            file.seek(offset)
+            buffer = file.read(size)
+
+        return self._codec.decode_block(buffer, dtype=self.dtype, shape=(n_rows, ))
+
+    def __getitem__(self, key: str | int | slice | Array[int]) -> 'Array | BlockField':
+        if isinstance(key, str):
+            return BlockField(self, key)
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            return self.read(start, stop)[::step] if step > 0 else self[np.arange(start, stop, step)]
+        if isinstance(key, (int, np.integer)):
+            key = key + len(self) if key < 0 else key
+            return self.read(key, key + 1)[0]
+
+        key = np.asarray(key)
+        if len(key) == 0:
+            return np.zeros(0, dtype=self.dtype)
+
+        start, stop = int(np.min(key)), int(np.max(key)) + 1
+        return self.read(start, stop)[key - start]
+
+    def __array__(self, dtype=None) -> Array:
+        return self.read().astype(dtype) if dtype else self.read()
+
+    def __iter__(self) -> Iterator[Array]:
+        for i in range(self.n_blocks):
+            yield from self._read_block(i)
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self._filepath}, {len(self)} rows in {self.n_blocks} blocks)'
+
+
+class BlockField:
+    """Поле структурированного массива файла сжатых блоков (распаковывается при выборе строк)."""
+
+    def __init__(self, reader: BlockReader, name: str):
+        self._reader = reader
+        self._name = name
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._reader.dtype[self._name].base
+
+    @property
+    def itemsize(self) -> int:
+        return self.dtype.itemsize
+
+    def __getitem__(self, key: int | slice | Array[int]) -> Array:
+        return self._reader[key][self._name]
+
+    def __array__(self, dtype=None) -> Array:
+        value = self._reader.read()[self._name]
+        return value.astype(dtype) if dtype else value
+
+    def __eq__(self, other: Any) -> Array[bool]:
+        return np.asarray(self) == other
+
+    def __len__(self) -> int:
+        return len(self._reader)
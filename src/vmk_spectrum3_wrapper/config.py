@@ -1,13 +1,23 @@
 import os
 
-from dotenv import load_dotenv
-
 from vmk_spectrum3_wrapper.adc import ADC
 from vmk_spectrum3_wrapper.detector import Detector
-from vmk_spectrum3_wrapper.types import MilliSecond
+from vmk_spectrum3_wrapper.exception import ShuffleError
+from vmk_spectrum3_wrapper.shuffle import Shuffle
+from vmk_spectrum3_wrapper.types import MilliSecond, Path
+
+
+def load_env(filepath: Path = os.path.join('.', '.env')) -> None:
+    """Загрузить переменные окружения из файла `filepath` (`dotenv` импортируется только при наличии файла)."""
+
+    if not os.path.isfile(filepath):
+        return
 
+    from dotenv import load_dotenv
+    load_dotenv(filepath, verbose=True)
 
-load_dotenv(os.path.join('.', '.env'), verbose=True)
+
+load_env()
 
 
 def load_default_adc(default: ADC = ADC._16bit) -> ADC:
@@ -65,8 +75,24 @@ def load_change_exposure_timeout(default: MilliSecond = 1000) -> MilliSecond:
         return timeout
 
 
+def load_default_shuffle(default: Shuffle | None = None) -> Shuffle | None:
+
+    filepath = os.getenv('DEFAULT_SHUFFLE')
+    if filepath is None:
+        return default
+
+    try:
+        shuffle = Shuffle.load(filepath)
+    except (ShuffleError, KeyError, ValueError) as error:
+        print(f'Shuffle: {filepath} could not be loaded! {error}')
+        return default
+    else:
+        return shuffle
+
+
 LOGGING_LEVEL = os.getenv('LOGGING_LEVEL') or 'INFO'
 
 DEFAULT_ADC = load_default_adc()
 DEFAULT_DETECTOR = load_default_detector()
 CHANGE_EXPOSURE_TIMEOUT = load_change_exposure_timeout()
+DEFAULT_SHUFFLE = load_default_shuffle()
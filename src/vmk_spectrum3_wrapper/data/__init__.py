@@ -1,2 +1,4 @@
+from .archive import Archive
+from .batch import Batch
 from .data import Data, Datum
 from .meta import Meta
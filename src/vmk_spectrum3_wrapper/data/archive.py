@@ -0,0 +1,179 @@
+import os
+from typing import Literal
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.data.exceptions import ArchiveError
+from vmk_spectrum3_wrapper.types import Array, MilliSecond, Path
+from vmk_spectrum3_wrapper.units import Units
+
+from .data import Data
+from .io import align, dump_data, read_data
+
+
+UNITS = (Units.digit, Units.percent, Units.electron)
+
+INDEX_DTYPE = np.dtype([
+    ('started_at', '<f8'),
+    ('finished_at', '<f8'),
+    ('exposure', '<f8', (2, )),  # второе время экспозиции стандартной схемы - `nan`
+    ('capacity', '<i8', (2, )),  # второе количество накоплений стандартной схемы - `0`
+    ('units', 'u1'),
+    ('n_times', '<i8'),
+    ('n_numbers', '<i8'),
+    ('offset', '<i8'),  # смещение записи (двоичного формата `data.io`) в файле записей
+], align=True)
+
+
+class Archive:
+    """Архив измерений (только добавление).
+
+    Записи хранятся последовательно в файле `records.bin` в двоичном формате `data.io` (заголовок и выровненные секции массивов исходных типов), поля `meta` записей - в файле индекса `index.bin`.
+    Записи добавляются в порядке начала измерения, поэтому выбор по времени выполняется бинарным поиском; записи загружаются memory-mapped.
+    Время записей - `Meta.started_at` по системным часам (`time.time`), поэтому записи разных процессов выбираются по абсолютному времени.
+    """
+    RECORDS = 'records.bin'
+    INDEX = 'index.bin'
+
+    def __init__(self, directory: Path):
+        os.makedirs(directory, exist_ok=True)
+
+        self._directory = directory
+        self._index = self._read_index()
+        self._n_records = len(self._index)
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def index(self) -> Array:
+        """Индекс записей (структурированный массив `INDEX_DTYPE`)."""
+        return self._index[:self._n_records]
+
+    def append(self, data: Data) -> int:
+        """Добавить запись `data` и вернуть ее номер."""
+
+        if data.meta is None:
+            raise ArchiveError('Data without meta could not be archived!')
+        if self._n_records and data.meta.started_at < self.index['started_at'][-1]:
+            raise ArchiveError('Data should be archived in order of `started_at`!')
+
+        # records
+        filepath = os.path.join(self.directory, self.RECORDS)
+        with open(filepath, 'ab') as file:
+            offset = align(file.tell())
+            file.write(b'\x00' * (offset - file.tell()))
+
+            dump_data(
+                file,
+                units=data.units,
+                values={
+                    'intensity': data.intensity,
+                    'clipped': data.clipped,
+                    'deviation': data.deviation,
+                    'number': data._number,
+                    'rejected': data.rejected,
+                },
+                meta=data.meta,
+            )
+
+        # index (записывается последним, так как отмечает запись добавленной)
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        record['started_at'] = data.meta.started_at
+        record['finished_at'] = data.meta.finished_at
+        record['exposure'] = pair(data.meta.exposure, fill_value=np.nan)
+        record['capacity'] = pair(data.meta.capacity, fill_value=0)
+        record['units'] = UNITS.index(data.units)
+        record['n_times'] = data.n_times
+        record['n_numbers'] = data.n_numbers
+        record['offset'] = offset
+
+        with open(os.path.join(self.directory, self.INDEX), 'ab') as file:
+            file.write(record.tobytes())
+        self._push(record)
+
+        return self._n_records - 1
+
+    def query(
+        self,
+        started_after: float | None = None,
+        started_before: float | None = None,
+        exposure: MilliSecond | tuple[MilliSecond, MilliSecond] | None = None,
+        capacity: int | tuple[int, int] | None = None,
+        schema: Literal['standard', 'extended'] | None = None,
+    ) -> Array[int]:
+        """Номера записей, начатых в интервале `[started_after, started_before)` и измеренных с заданными параметрами."""
+        index = self.index
+
+        lo = 0 if started_after is None else np.searchsorted(index['started_at'], started_after, side='left')
+        hi = len(index) if started_before is None else np.searchsorted(index['started_at'], started_before, side='left')
+        selected = index[lo:hi]
+
+        mask = np.ones(len(selected), dtype=bool)
+        if exposure is not None:
+            mask &= np.all(np.isclose(selected['exposure'], pair(exposure, fill_value=np.nan), equal_nan=True), axis=1)
+        if capacity is not None:
+            mask &= np.all(selected['capacity'] == pair(capacity, fill_value=0), axis=1)
+        if schema is not None:
+            is_extended = selected['capacity'][:, 1] > 0
+            mask &= is_extended if schema == 'extended' else ~is_extended
+
+        return lo + np.flatnonzero(mask)
+
+    def select(self, *args, **kwargs) -> list[Data]:
+        """Записи, удовлетворяющие условиям (см. `query`)."""
+
+        return [
+            self[i]
+            for i in self.query(*args, **kwargs)
+        ]
+
+    def __getitem__(self, i: int) -> Data:
+        """Загрузить запись с номером `i` (memory-mapped)."""
+
+        if not (-self._n_records <= i < self._n_records):
+            raise IndexError(f'Record {i} is out of archive with {self._n_records} records!')
+
+        units, values, meta = read_data(
+            os.path.join(self.directory, self.RECORDS),
+            offset=int(self.index[i]['offset']),
+        )
+
+        return Data(
+            units=units,
+            meta=meta,
+            **values,
+        )
+
+    def __len__(self) -> int:
+        return self._n_records
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.directory}, {len(self)} records)'
+
+    def _read_index(self) -> Array:
+        filepath = os.path.join(self.directory, self.INDEX)
+        if not os.path.exists(filepath):
+            return np.zeros(0, dtype=INDEX_DTYPE)
+
+        n_records = os.path.getsize(filepath) // INDEX_DTYPE.itemsize  # недописанная запись индекса отбрасывается
+        return np.fromfile(filepath, dtype=INDEX_DTYPE, count=n_records)
+
+    def _push(self, record: Array) -> None:
+        if self._n_records == len(self._index):  # емкость индекса удваивается
+            index = np.zeros(max(2*len(self._index), 16), dtype=INDEX_DTYPE)
+            index[:self._n_records] = self._index[:self._n_records]
+            self._index = index
+
+        self._index[self._n_records] = record[0]
+        self._n_records += 1
+
+
+def pair(__value: float | tuple[float, float], fill_value: float) -> tuple[float, float]:
+
+    if isinstance(__value, tuple | list):
+        return tuple(__value)
+    return (__value, fill_value)
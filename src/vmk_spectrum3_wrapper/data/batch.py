@@ -0,0 +1,132 @@
+from collections.abc import Sequence
+from typing import Iterator, overload
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.data.exceptions import ArrayShapeError
+from vmk_spectrum3_wrapper.types import Array, U
+from vmk_spectrum3_wrapper.units import Units
+
+from .data import Datum
+from .utils import arange
+
+
+class Batch:
+    """Стек `datum` нескольких схем измерения с формой `(n_schemas, n_times, n_numbers)`."""
+
+    def __init__(
+        self,
+        units: Units,
+        intensity: Array[U],
+        clipped: Array[bool] | None = None,
+        deviation: Array[U] | None = None,
+        number: Array[int] | None = None,
+        rejected: Array[int] | None = None,
+    ):
+        self.units = units
+        self.intensity = stack_reshape(intensity)
+        self.clipped = stack_reshape(clipped, shape=self.intensity.shape)
+        self.deviation = stack_reshape(deviation, shape=self.intensity.shape)
+        self.rejected = stack_reshape(rejected, shape=self.intensity.shape)
+
+        if number is not None and len(number) != self.n_numbers:
+            raise ArrayShapeError(f'Number with shape: {number.shape} is not consistent with {self.n_numbers} numbers!')
+        self._number = number
+
+    @property
+    def n_schemas(self) -> int:
+        return self.intensity.shape[0]
+
+    @property
+    def n_times(self) -> int:
+        return self.intensity.shape[1]
+
+    @property
+    def n_numbers(self) -> int:
+        return self.intensity.shape[2]
+
+    @property
+    def number(self) -> Array[int]:
+        """Номера отсчетов (исходного кадра)."""
+        if self._number is None:
+            return arange(self.n_numbers)
+        return self._number
+
+    @classmethod
+    def create(
+        cls,
+        __frames: Array[U],
+        n_times: int,
+        units: Units = Units.digit,
+    ) -> 'Batch':
+        """Разбить последовательность кадров `frames` на схемы измерения по `n_times` кадров (без копирования)."""
+
+        if __frames.ndim != 2:
+            raise ArrayShapeError(f'Frames with shape: {__frames.shape} are not supported!')
+        if __frames.shape[0] % n_times:
+            raise ArrayShapeError(f'Frames with shape: {__frames.shape} could not be splitted by {n_times} frames!')
+
+        return cls(
+            units=units,
+            intensity=__frames.reshape(-1, n_times, __frames.shape[1]),
+        )
+
+    @classmethod
+    def stack(cls, __data: Sequence[Datum]) -> 'Batch':
+        """Собрать стек из последовательности `datum`."""
+
+        def inner(values):
+            if values[0] is None:
+                return None
+
+            return np.stack(values)
+
+        return cls(
+            units=__data[0].units,
+            intensity=inner([datum.intensity for datum in __data]),
+            clipped=inner([datum.clipped for datum in __data]),
+            deviation=inner([datum.deviation for datum in __data]),
+            number=__data[0].number,
+            rejected=inner([datum.rejected for datum in __data]),
+        )
+
+    def __getitem__(self, index: int) -> Datum:
+        """Получить `datum` схемы измерения с номером `index`."""
+
+        return Datum(
+            units=self.units,
+            intensity=self.intensity[index],
+            clipped=None if self.clipped is None else self.clipped[index],
+            deviation=None if self.deviation is None else self.deviation[index],
+            number=self._number,
+            rejected=None if self.rejected is None else self.rejected[index],
+        )
+
+    def __iter__(self) -> Iterator[Datum]:
+        for index in range(self.n_schemas):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return self.n_schemas
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.units}, {self.n_schemas}x{self.n_times}x{self.n_numbers})'
+
+
+@overload
+def stack_reshape(__value: Array[U], shape: tuple[int, int, int] | None = None) -> Array[U]: ...
+@overload
+def stack_reshape(__value: None, shape: tuple[int, int, int] | None = None) -> None: ...
+def stack_reshape(__value, shape=None):
+
+    if __value is None:
+        return None
+
+    if __value.ndim != 3:
+        raise ArrayShapeError(f'Array with shape: {__value.shape} is not supported!')
+    if shape is not None and __value.shape != shape:
+        raise ArrayShapeError(f'Array with shape: {__value.shape} is not consistent with {shape}!')
+
+    return __value
@@ -1,19 +1,26 @@
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
+import logging
 import pickle
-from typing import Any, Mapping
+from typing import Any, Literal, Mapping
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+from vmk_spectrum3_wrapper.codec import Codec
 from vmk_spectrum3_wrapper.types import Array, U
 from vmk_spectrum3_wrapper.units import Units
 
+from .exceptions import ArrayShapeError
+from .io import is_data_file, read_data, read_meta, write_data
 from .meta import Meta
-from .utils import crop, join, reshape
+from .utils import arange, crop, crop_number, is_view, join, reshape
+
+
+LOGGER = logging.getLogger(__name__)
 
 
 class BaseData(ABC):
+    __slots__ = ('intensity', 'units', 'clipped', 'deviation', 'meta', '_number', '_shared', 'rejected')
 
     def __init__(
         self,
@@ -22,12 +29,47 @@ class BaseData(ABC):
         clipped: Array[bool] | None = None,
         deviation: Array[bool] | None = None,
         meta: Meta | None = None,
+        number: Array[int] | None = None,
+        shared: bool = True,
+        rejected: Array[int] | None = None,
     ):
         self.intensity = intensity
         self.units = units
         self.clipped = clipped
         self.deviation = deviation
         self.meta = meta
+        self.rejected = rejected  # количество отклоненных интегральным фильтром кадров (см. `MedianIntegrationFilter`)
+
+        if number is not None and len(number) != self.n_numbers:
+            raise ArrayShapeError(f'Number with shape: {number.shape} is not consistent with {self.n_numbers} numbers!')
+        self._number = number
+        self._shared = shared
+
+    @classmethod
+    def _create(
+        cls,
+        units: Units,
+        intensity: Array[U],
+        clipped: Array[bool] | None = None,
+        deviation: Array[bool] | None = None,
+        meta: Meta | None = None,
+        number: Array[int] | None = None,
+        shared: bool = True,
+        rejected: Array[int] | None = None,
+    ) -> 'BaseData':
+        """Создать без проверки массивов (для фильтров: массивы формы `(n_times, n_numbers)` и `number` согласованы)."""
+        self = object.__new__(cls)
+
+        self.intensity = intensity
+        self.units = units
+        self.clipped = clipped
+        self.deviation = deviation
+        self.meta = meta
+        self.rejected = rejected
+        self._number = number
+        self._shared = shared
+
+        return self
 
     @property
     def n_times(self) -> int:
@@ -47,7 +89,18 @@ class BaseData(ABC):
 
     @property
     def number(self) -> Array[int]:
-        return np.arange(self.n_numbers)
+        """Номера отсчетов (исходного кадра)."""
+        if self._number is None:
+            return arange(self.n_numbers)
+        return self._number
+
+    @property
+    def shared(self) -> bool:
+        """Используются ли массивы другими объектами (копирование при записи).
+
+        Фильтры могут перезаписывать массивы только необщих (`shared=False`) данных.
+        """
+        return self._shared
 
     @abstractmethod
     def show(self) -> None:
@@ -64,6 +117,7 @@ class BaseData(ABC):
 
 
 class Datum(BaseData):
+    __slots__ = ()
 
     def __init__(
         self,
@@ -71,34 +125,32 @@ class Datum(BaseData):
         intensity: Array[U],
         clipped: Array[bool] | None = None,
         deviation: Array[bool] | None = None,
+        number: Array[int] | None = None,
+        shared: bool = True,
+        rejected: Array[int] | None = None,
     ):
         super().__init__(
             units=units,
             intensity=reshape(intensity),
             clipped=reshape(clipped),
             deviation=reshape(deviation),
+            number=number,
+            shared=shared,
+            rejected=reshape(rejected),
         )
 
-    def show(self) -> None:
+    def show(self, kind: Literal['auto', 'lines', 'image'] = 'auto') -> None:
+        """Отрисовать кадры линиями или изображением время x отсчет (см. `data.plotting`)."""
+        import matplotlib.pyplot as plt  # `matplotlib` импортируется только при отрисовке
+
+        from .plotting import plot_data
+
         fig, ax = plt.subplots(figsize=(6, 4), tight_layout=True)
 
-        color = 'black' if self.n_times == 1 else None
-        for t in range(self.n_times):
-            plt.step(
-                self.number, self.intensity[t, :],
-                where='mid',
-                color=color, linestyle='-', linewidth=1,
-            )
-
-            if self.clipped is not None:
-                mask = self.clipped[t, :]
-                plt.plot(
-                    self.number[mask], self.intensity[t, mask],
-                    color='red', linestyle='none', marker='.', markersize=2,
-                )
+        kind = plot_data(ax, self.number, self.intensity, clipped=self.clipped, kind=kind)
 
         plt.xlabel('Номер отсчета')
-        plt.ylabel('Интенсивность, отн. ед.')
+        plt.ylabel('Интенсивность, отн. ед.' if kind == 'lines' else 'Номер кадра')
 
         plt.show()
 
@@ -109,6 +161,8 @@ class Datum(BaseData):
             'intensity': pickle.dumps(self.intensity),
             'clipped': pickle.dumps(self.clipped),
             'deviation': pickle.dumps(self.deviation),
+            'number': pickle.dumps(self._number),
+            'rejected': pickle.dumps(self.rejected),
         }
         return dat
 
@@ -126,6 +180,8 @@ class Datum(BaseData):
             intensity=pickle.loads(__dump.get('intensity')),
             clipped=pickle.loads(__dump.get('clipped')),
             deviation=pickle.loads(__dump.get('deviation')),
+            number=pickle.loads(__dump['number']) if 'number' in __dump else None,
+            rejected=pickle.loads(__dump['rejected']) if 'rejected' in __dump else None,
         )
         return datum
 
@@ -133,7 +189,10 @@ class Datum(BaseData):
         self,
         index: tuple[int | Array[int] | slice, int | Array[int] | slice],
     ) -> 'BaseData':
-        """Итерировать по `index` вдоль времени и пространству."""
+        """Итерировать по `index` вдоль времени и пространству.
+
+        Выбор номерами и срезами (в том числе равномерно возрастающими номерами) выполняется без копирования; такие данные общие (`shared`).
+        """
         cls = self.__class__
 
         return cls(
@@ -141,10 +200,14 @@ class Datum(BaseData):
             intensity=crop(self.intensity, index),
             clipped=crop(self.clipped, index),
             deviation=crop(self.deviation, index),
+            number=crop_number(self.number, index),
+            shared=is_view(index),
+            rejected=crop(self.rejected, index),
         )
 
 
 class Data(BaseData):
+    __slots__ = ()
 
     def __init__(
         self,
@@ -153,6 +216,9 @@ class Data(BaseData):
         clipped: Array[bool] | None = None,
         deviation: Array[bool] | None = None,
         meta: Meta | None = None,
+        number: Array[int] | None = None,
+        shared: bool = True,
+        rejected: Array[int] | None = None,
     ):
         super().__init__(
             units=units,
@@ -160,25 +226,20 @@ class Data(BaseData):
             clipped=reshape(clipped),
             deviation=reshape(deviation),
             meta=meta,
+            number=number,
+            shared=shared,
+            rejected=reshape(rejected),
         )
 
-    def show(self) -> None:
+    def show(self, kind: Literal['auto', 'lines', 'image'] = 'auto') -> None:
+        """Отрисовать кадры линиями или изображением время x отсчет (см. `data.plotting`)."""
+        import matplotlib.pyplot as plt  # `matplotlib` импортируется только при отрисовке
+
+        from .plotting import plot_data
+
         fig, ax = plt.subplots(figsize=(6, 4), tight_layout=True)
 
-        color = 'black' if self.n_times == 1 else None
-        for t in range(self.n_times):
-            plt.step(
-                self.number, self.intensity[t, :],
-                where='mid',
-                color=color, linestyle='-', linewidth=1,
-            )
-
-            if self.clipped is not None:
-                mask = self.clipped[t, :]
-                plt.plot(
-                    self.number[mask], self.intensity[t, mask],
-                    color='red', linestyle='none', marker='.', markersize=2,
-                )
+        kind = plot_data(ax, self.number, self.intensity, clipped=self.clipped, kind=kind)
 
         plt.xlabel(r'Номер отсчета')
         plt.ylabel(r'Интенсивность, {units}'.format(
@@ -187,7 +248,7 @@ class Data(BaseData):
                 Units.electron: '$e^{-}$',
                 Units.percent: 'отн. ед.',
             }[self.units],
-        ))
+        ) if kind == 'lines' else r'Номер кадра')
         plt.show()
 
     @classmethod
@@ -203,6 +264,8 @@ class Data(BaseData):
             clipped=join([item.clipped for item in __frames]),
             deviation=join([item.deviation for item in __frames]),
             meta=meta,
+            number=__frames[0]._number,
+            rejected=join([item.rejected for item in __frames]),
         )
 
     def dumps(self) -> Mapping[str, Any]:
@@ -212,15 +275,28 @@ class Data(BaseData):
             'intensity': pickle.dumps(self.intensity),
             'clipped': pickle.dumps(self.clipped),
             'deviation': pickle.dumps(self.deviation),
+            'number': pickle.dumps(self._number),
+            'rejected': pickle.dumps(self.rejected),
             'meta': self.meta.dumps() if self.meta else None,
         }
         return dat
 
-    def save(self, filepath: str | None = None) -> None:
-        dat = self.dumps()
+    def save(self, filepath: str | None = None, codec: Codec | None = None) -> None:
+        """Сохранить в двоичном формате (см. `data.io`); массивы сжимаются кодеком `codec`."""
 
-        with open(filepath, 'bw') as file:
-            pickle.dump(dat, file)
+        write_data(
+            filepath,
+            units=self.units,
+            values={
+                'intensity': self.intensity,
+                'clipped': self.clipped,
+                'deviation': self.deviation,
+                'number': self._number,
+                'rejected': self.rejected,
+            },
+            meta=self.meta,
+            codec=codec,
+        )
 
     @classmethod
     def loads(cls, _dump: Mapping[str, Any]) -> 'Data':
@@ -236,23 +312,49 @@ class Data(BaseData):
             intensity=pickle.loads(_dump.get('intensity')),
             clipped=pickle.loads(_dump.get('clipped')),
             deviation=pickle.loads(_dump.get('deviation')),
+            number=pickle.loads(_dump['number']) if 'number' in _dump else None,
+            rejected=pickle.loads(_dump['rejected']) if 'rejected' in _dump else None,
             meta=Meta.loads(_dump.get('meta')) if _dump.get('meta') else None,
         )
         return datum
 
     @classmethod
-    def load(cls, filepath: str) -> 'Data':
-        with open(filepath, 'br') as file:
-            dat = pickle.load(file)
+    def load(
+        cls,
+        filepath: str,
+        index: tuple[int | Array[int] | slice, int | Array[int] | slice] | None = None,
+    ) -> 'Data':
+        """Загрузить `data` (memory-mapped); `index` задает выбираемые отсчеты вдоль времени и пространству."""
+
+        if not is_data_file(filepath):
+            LOGGER.warning('File %s is saved in legacy pickle format! Resave it to load memory-mapped.', filepath)
+
+            with open(filepath, 'br') as file:
+                dat = pickle.load(file)
 
-        data = cls.loads(dat)
-        return data
+            data = cls.loads(dat)
+            return data if index is None else data[index]
+
+        units, values, meta = read_data(filepath, index=index)
+        return cls(
+            units=units,
+            meta=meta,
+            **values,
+        )
+
+    @classmethod
+    def load_meta(cls, filepath: str) -> Meta | None:
+        """Загрузить только `meta` (без чтения массивов)."""
+        return read_meta(filepath)
 
     def __getitem__(
         self,
         index: tuple[int | Array[int] | slice, int | Array[int] | slice],
     ) -> 'BaseData':
-        """Итерировать по `index` вдоль времени и пространству."""
+        """Итерировать по `index` вдоль времени и пространству.
+
+        Выбор номерами и срезами (в том числе равномерно возрастающими номерами) выполняется без копирования; такие данные общие (`shared`).
+        """
         cls = self.__class__
 
         return cls(
@@ -261,4 +363,7 @@ class Data(BaseData):
             clipped=crop(self.clipped, index),
             deviation=crop(self.deviation, index),
             meta=self.meta,
+            number=crop_number(self.number, index),
+            shared=is_view(index),
+            rejected=crop(self.rejected, index),
         )
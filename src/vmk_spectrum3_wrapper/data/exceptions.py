@@ -5,3 +5,11 @@ class DataError(Exception):
 
 class ArrayShapeError(DataError):
     pass
+
+
+class DataFormatError(DataError):
+    pass
+
+
+class ArchiveError(DataError):
+    pass
@@ -0,0 +1,271 @@
+"""Двоичный формат файлов `data`.
+
+Файл состоит из заголовка и выровненных секций массивов:
+    `MAGIC` (8 байт), версия формата и размер заголовка (по 4 байта, little-endian);
+    заголовок - JSON с единицами, `meta` и описанием секций (тип, форма и смещение каждого массива);
+    секции `intensity`, `clipped`, `deviation`, `number` и `rejected` (при наличии), выровненные по `ALIGNMENT` байт.
+
+Секции загружаются memory-mapped, поэтому загрузка `meta` или части отсчетов не читает весь файл.
+Секции, сжатые кодеком (см. `codec`), хранятся блоками строк; при загрузке распаковываются только блоки выбранных строк.
+"""
+import json
+import struct
+from typing import Any, BinaryIO, Mapping
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.codec import Codec
+from vmk_spectrum3_wrapper.data.exceptions import DataFormatError
+from vmk_spectrum3_wrapper.types import Array, Path
+from vmk_spectrum3_wrapper.units import Units
+
+from .meta import Meta
+from .utils import as_slice
+
+
+MAGIC = b'VMKDATA\x00'
+VERSION = 1
+ALIGNMENT = 64
+PREAMBLE = struct.Struct('<8sII')
+
+FIELDS = ('intensity', 'clipped', 'deviation', 'number', 'rejected')
+
+
+def is_data_file(filepath: Path) -> bool:
+    """Является ли файл `filepath` файлом двоичного формата."""
+
+    with open(filepath, 'br') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write_data(
+    filepath: Path,
+    units: Units,
+    values: Mapping[str, Array | None],
+    meta: Meta | None = None,
+    codec: Codec | None = None,
+) -> None:
+    """Записать массивы `values` (`intensity`, `clipped`, `deviation`, `number`, `rejected`) в файл `filepath` (сжатые кодеком `codec`)."""
+
+    with open(filepath, 'bw') as file:
+        dump_data(file, units=units, values=values, meta=meta, codec=codec)
+
+
+def dump_data(
+    file: BinaryIO,
+    units: Units,
+    values: Mapping[str, Array | None],
+    meta: Meta | None = None,
+    codec: Codec | None = None,
+) -> None:
+    """Записать массивы `values` в открытый файл `file` с текущей (выровненной) позиции, в том числе в режиме добавления (см. `write_data`)."""
+    values = {
+        name: np.ascontiguousarray(value)
+        for name, value in values.items()
+        if value is not None
+    }
+
+    sections, buffers, offset = {}, {}, 0
+    for name, value in values.items():
+        sections[name] = {
+            'dtype': value.dtype.str,
+            'shape': list(value.shape),
+            'offset': offset,
+        }
+
+        if codec is None or name == 'number':
+            buffers[name] = [value.data]
+        else:
+            section_codec = codec.for_dtype(value.dtype)  # разности применяются только к целочисленным секциям
+            try:
+                buffers[name] = section_codec.encode(value)
+            finally:
+                if section_codec is not codec:
+                    section_codec.close()
+            sections[name]['codec'] = section_codec.dumps()
+            sections[name]['blocks'] = [len(buffer) for buffer in buffers[name]]
+
+        offset = align(offset + sum(len(buffer) if isinstance(buffer, bytes) else buffer.nbytes for buffer in buffers[name]))
+
+    header = dump_header({
+        'units': str(units),
+        'meta': meta.dumps() if meta else None,
+        'sections': sections,
+    })
+
+    file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+    file.write(header)
+
+    start = file.tell()
+    for name in values:
+        file.write(b'\x00' * (start + sections[name]['offset'] - file.tell()))  # выравнивание записывается явно (без `seek`)
+        for buffer in buffers[name]:
+            file.write(buffer)
+
+
+def create_data(
+    filepath: Path,
+    units: Units,
+    fields: Mapping[str, tuple[np.dtype, tuple[int, ...]]],
+    meta: Meta | None = None,
+) -> Mapping[str, np.memmap]:
+    """Создать файл `filepath` с незаполненными секциями `fields` (тип и форма массивов) и вернуть секции memory-mapped для записи по частям."""
+
+    sections, offset = {}, 0
+    for name, (dtype, shape) in fields.items():
+        dtype = np.dtype(dtype)
+        sections[name] = {
+            'dtype': dtype.str,
+            'shape': list(shape),
+            'offset': offset,
+        }
+        offset = align(offset + dtype.itemsize*int(np.prod(shape)))
+
+    header = dump_header({
+        'units': str(units),
+        'meta': meta.dumps() if meta else None,
+        'sections': sections,
+    })
+
+    with open(filepath, 'bw') as file:
+        file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+        file.truncate(PREAMBLE.size + len(header) + offset)
+
+    return {
+        name: np.memmap(
+            filepath,
+            mode='r+',
+            dtype=np.dtype(section['dtype']),
+            shape=tuple(section['shape']),
+            offset=PREAMBLE.size + len(header) + section['offset'],
+        )
+        for name, section in sections.items()
+    }
+
+
+def read_header(filepath: Path, offset: int = 0) -> Mapping[str, Any]:
+    """Прочитать заголовок файла `filepath`, записанный со смещения `offset` (без чтения массивов)."""
+
+    with open(filepath, 'br') as file:
+        file.seek(offset)
+        preamble = file.read(PREAMBLE.size)
+        if len(preamble) < PREAMBLE.size:
+            raise DataFormatError(f'File {filepath} is too short!')
+
+        magic, version, size = PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise DataFormatError(f'File {filepath} is not a data file!')
+        if version > VERSION:
+            raise DataFormatError(f'Data format version {version} is not supported!')
+
+        header = json.loads(file.read(size).decode())
+
+    header['start'] = offset + PREAMBLE.size + size
+    return header
+
+
+def read_meta(filepath: Path) -> Meta | None:
+    """Прочитать `meta` файла `filepath`."""
+    header = read_header(filepath)
+
+    if header['meta'] is None:
+        return None
+    return Meta.loads(header['meta'])
+
+
+def read_data(
+    filepath: Path,
+    index: tuple[int | Array[int] | slice, int | Array[int] | slice] | None = None,
+    offset: int = 0,
+) -> tuple[Units, Mapping[str, Array | None], Meta | None]:
+    """Прочитать массивы файла `filepath`, записанного со смещения `offset` (memory-mapped); `index` задает выбираемые отсчеты вдоль времени и пространства."""
+    header = read_header(filepath, offset=offset)
+
+    values = {}
+    for name in FIELDS:
+        section = header['sections'].get(name)
+        if section is None:
+            values[name] = None
+            continue
+
+        if 'codec' in section:
+            value = read_section(filepath, offset=header['start'] + section['offset'], section=section, time=slice(None) if index is None else index[0])
+            if index is not None:
+                value = value[..., as_slice(index[1])]
+        else:
+            value = np.memmap(
+                filepath,
+                mode='r',
+                dtype=np.dtype(section['dtype']),
+                shape=tuple(section['shape']),
+                offset=header['start'] + section['offset'],
+            )
+            if index is not None:
+                time, number = as_slice(index[0]), as_slice(index[1])
+                value = np.atleast_1d(value[number]) if name == 'number' else value[time, number]
+
+        values[name] = value
+
+    if index is not None and values['number'] is None:  # выбранные отсчеты сохраняют номера исходных отсчетов
+        time, number = index
+        values['number'] = np.atleast_1d(np.arange(header['sections']['intensity']['shape'][-1])[as_slice(number)])
+
+    units = {
+        'Units.digit': Units.digit,
+        'Units.percent': Units.percent,
+        'Units.electron': Units.electron,
+    }.get(header['units'], Units.percent)
+    meta = None if header['meta'] is None else Meta.loads(header['meta'])
+
+    return units, values, meta
+
+
+def read_section(
+    filepath: Path,
+    offset: int,
+    section: Mapping[str, Any],
+    time: int | Array[int] | slice,
+) -> Array:
+    """Прочитать строки `time` сжатой секции (распаковываются только блоки, содержащие выбранные строки)."""
+    codec = Codec.loads(section['codec'])
+    shape = tuple(section['shape'])
+
+    rows = np.arange(shape[0])[as_slice(time)]
+    if np.size(rows) == 0:
+        return np.zeros((0, *shape[1:]), dtype=np.dtype(section['dtype']))
+    lo, hi = int(np.min(rows)) // codec.block_size, int(np.max(rows)) // codec.block_size + 1
+
+    starts = np.cumsum([0, *section['blocks']])
+    with open(filepath, 'br') as file:
+        file.seek(offset + starts[lo])
+        buffer = file.read(starts[hi] - starts[lo])
+
+    blocks = [
+        buffer[starts[i] - starts[lo]:starts[i+1] - starts[lo]]
+        for i in range(lo, hi)
+    ]
+
+    try:
+        value = codec.decode(blocks, dtype=np.dtype(section['dtype']), shape=shape, start=lo)
+    finally:
+        codec.close()
+
+    return value[rows - lo*codec.block_size]
+
+
+def align(__offset: int) -> int:
+    return -(-__offset // ALIGNMENT) * ALIGNMENT
+
+
+def dump_header(__header: Mapping[str, Any]) -> bytes:
+
+    def default(value):
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f'Object of type {type(value)} is not JSON serializable')
+
+    header = json.dumps(__header, default=default).encode()
+    header += b' ' * (align(PREAMBLE.size + len(header)) - PREAMBLE.size - len(header))  # секции начинаются с выровненного смещения
+
+    return header
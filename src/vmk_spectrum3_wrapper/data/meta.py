@@ -6,6 +6,7 @@ from vmk_spectrum3_wrapper.types import MilliSecond
 
 @dataclass(frozen=True, slots=True)
 class Meta:
+    """Параметры измерения; `started_at` и `finished_at` - время окончания измерения первого и последнего кадров по системным часам (`time.time`)."""
     exposure: MilliSecond | tuple[MilliSecond, MilliSecond]
     capacity: int | tuple[int, int]
     started_at: float
@@ -22,9 +23,14 @@ class Meta:
     @classmethod
     def loads(cls, __dump: Mapping[str, Any]) -> 'Meta':
 
+        def inner(value):  # JSON хранит `tuple` как `list`
+            if isinstance(value, list):
+                return tuple(value)
+            return value
+
         meta = cls(
-            exposure=__dump.get('exposure'),
-            capacity=__dump.get('capacity'),
+            exposure=inner(__dump.get('exposure')),
+            capacity=inner(__dump.get('capacity')),
             started_at=__dump.get('started_at'),
             finished_at=__dump.get('finished_at'),
         )
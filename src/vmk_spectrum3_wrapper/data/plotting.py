@@ -0,0 +1,155 @@
+"""Быстрая отрисовка `data` с большим количеством кадров.
+
+Все кадры отрисовываются одним `LineCollection` (или изображением время x отсчет), отсчеты прореживаются по минимуму и максимуму до разрешения экрана; зашкаленные отсчеты отмечаются одним `scatter`.
+"""
+from typing import Literal
+
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from matplotlib.image import AxesImage
+import numpy as np
+
+from vmk_spectrum3_wrapper.types import Array, U
+
+
+MAX_LINES = 64  # максимальное количество кадров, отрисовываемых линиями (в режиме `auto`)
+
+
+def step(number: Array[int], intensity: Array[U]) -> tuple[Array[float], Array[U]]:
+    """Вершины ступенчатых линий (как `plt.step(..., where='mid')`) всех кадров `intensity`."""
+
+    xs = np.repeat(number.astype(float), 2)
+    xs[1:-1] = np.repeat((number[:-1] + number[1:]) / 2, 2)
+    ys = np.repeat(intensity, 2, axis=-1)
+
+    return xs, ys
+
+
+def decimate(number: Array[int], intensity: Array[U], n_bins: int) -> tuple[Array[float], Array[U]]:
+    """Проредить отсчеты всех кадров `intensity` до `n_bins` бинов (минимум и максимум бина сохраняют выбросы)."""
+    n_numbers = intensity.shape[-1]
+
+    factor = -(-n_numbers // max(n_bins, 1))
+    if factor < 2:
+        return step(number, intensity)
+
+    starts = np.arange(0, n_numbers, factor)
+    lo = np.minimum.reduceat(intensity, starts, axis=-1)
+    hi = np.maximum.reduceat(intensity, starts, axis=-1)
+
+    xs = np.repeat(np.add.reduceat(number, starts) / np.diff([*starts, n_numbers]), 2)
+    ys = np.stack([lo, hi], axis=-1).reshape(*intensity.shape[:-1], -1)
+
+    return xs, ys
+
+
+def bin_mean(__value: Array[U], n_bins: int, axis: int) -> Array[float]:
+    """Усреднить `value` вдоль `axis` по бинам (не более `n_bins` бинов)."""
+    n = __value.shape[axis]
+
+    factor = -(-n // max(n_bins, 1))
+    if factor < 2:
+        return __value
+
+    starts = np.arange(0, n, factor)
+    shape = [1, 1]
+    shape[axis] = -1
+
+    return np.add.reduceat(__value, starts, axis=axis) / np.diff([*starts, n]).reshape(shape)
+
+
+def plot_lines(
+    ax: Axes,
+    number: Array[int],
+    intensity: Array[U],
+    clipped: Array[bool] | None = None,
+    n_bins: int | None = None,
+) -> LineCollection:
+    """Отрисовать кадры `intensity` одним `LineCollection`."""
+    n_times = intensity.shape[0]
+
+    xs, ys = decimate(number, intensity, n_bins=n_bins or screen_size(ax)[0])
+    segments = np.empty((n_times, len(xs), 2))
+    segments[:, :, 0] = xs
+    segments[:, :, 1] = ys
+
+    if n_times == 1:
+        colors = ['black']
+    else:
+        cycle = plt.rcParams['axes.prop_cycle'].by_key()['color']
+        colors = [cycle[t % len(cycle)] for t in range(n_times)]
+
+    collection = LineCollection(segments, colors=colors, linestyles='-', linewidths=1)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+
+    if clipped is not None and np.any(clipped):
+        t, n = np.nonzero(clipped)
+        ax.scatter(
+            number[n], intensity[t, n],
+            color='red', marker='.', s=4,
+        )
+
+    return collection
+
+
+def plot_image(
+    ax: Axes,
+    number: Array[int],
+    intensity: Array[U],
+    clipped: Array[bool] | None = None,
+    n_bins: int | None = None,
+    n_rows: int | None = None,
+) -> AxesImage:
+    """Отрисовать кадры `intensity` изображением время x отсчет (кадры и отсчеты усредняются до разрешения экрана)."""
+    n_times = intensity.shape[0]
+    width, height = screen_size(ax)
+
+    value = bin_mean(intensity, n_bins=n_rows or height, axis=0)
+    value = bin_mean(value, n_bins=n_bins or width, axis=1)
+
+    image = ax.imshow(
+        value,
+        aspect='auto',
+        origin='lower',
+        interpolation='nearest',
+        extent=(number[0] - .5, number[-1] + .5, 0, n_times),
+    )
+    plt.colorbar(image, ax=ax)
+
+    if clipped is not None and np.any(clipped):
+        t, n = np.nonzero(clipped)
+        ax.scatter(
+            number[n], t + .5,
+            color='red', marker='.', s=4,
+        )
+
+    return image
+
+
+def plot_data(
+    ax: Axes,
+    number: Array[int],
+    intensity: Array[U],
+    clipped: Array[bool] | None = None,
+    kind: Literal['auto', 'lines', 'image'] = 'auto',
+) -> Literal['lines', 'image']:
+    """Отрисовать кадры линиями (не более `MAX_LINES` кадров в режиме `auto`) или изображением."""
+
+    if kind == 'auto':
+        kind = 'lines' if intensity.shape[0] <= MAX_LINES else 'image'
+
+    if kind == 'lines':
+        plot_lines(ax, number, intensity, clipped=clipped)
+    else:
+        plot_image(ax, number, intensity, clipped=clipped)
+
+    return kind
+
+
+def screen_size(ax: Axes) -> tuple[int, int]:
+    """Размер `ax` в пикселях экрана."""
+    bbox = ax.get_window_extent()
+
+    return max(int(bbox.width), 1), max(int(bbox.height), 1)
@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from functools import lru_cache
 from typing import overload
 
 import numpy as np
@@ -28,7 +29,47 @@ def crop(__value, index):
         return None
 
     time, number = index
-    return __value[time, number]
+    return __value[as_slice(time), as_slice(number)]
+
+
+def as_slice(__key: int | Array[int] | slice) -> int | Array[int] | slice:
+    """Привести `key` к срезу, если выбор возможен без копирования (номер или равномерно возрастающие номера)."""
+
+    if isinstance(__key, slice):
+        return __key
+    if isinstance(__key, (int, np.integer)):
+        return slice(__key, (__key + 1) or None)
+
+    key = np.asarray(__key)
+    if key.ndim != 1 or len(key) == 0 or key.dtype.kind not in 'iu' or key[0] < 0:
+        return __key
+    if len(key) == 1:
+        return slice(int(key[0]), int(key[0]) + 1)
+
+    step = int(key[1] - key[0])
+    if step <= 0 or np.any(np.diff(key) != step):
+        return __key
+    return slice(int(key[0]), int(key[-1]) + 1, step)
+
+
+def is_view(index: tuple[int | Array[int] | slice, int | Array[int] | slice]) -> bool:
+    """Выбирается ли `index` без копирования."""
+
+    return all(
+        isinstance(as_slice(key), slice)
+        for key in index
+    )
+
+
+def output(__value: Array | None, *others: Array | float, shared: bool) -> Array | None:
+    """Буфер `value` для записи результата операции с `others` (`None`, если буфер общий, только для чтения или другого типа)."""
+
+    if __value is None or shared or not __value.flags.writeable:
+        return None
+    if np.result_type(__value, *others) != __value.dtype:
+        return None
+
+    return __value
 
 
 @overload
@@ -70,3 +111,25 @@ def join(__values):
         return None
 
     return np.concatenate(__values)
+
+
+@lru_cache(maxsize=16)
+def arange(__n_numbers: int) -> Array[int]:
+    """Номера отсчетов `0..n_numbers-1` (общий массив только для чтения)."""
+    number = np.arange(__n_numbers)
+    number.setflags(write=False)
+
+    return number
+
+
+@overload
+def crop_number(__value: Array[int], index: tuple[int | Array[int] | slice, int | Array[int] | slice]) -> Array[int]: ...
+@overload
+def crop_number(__value: None, index: tuple[int | Array[int] | slice, int | Array[int] | slice]) -> None: ...
+def crop_number(__value, index):
+
+    if __value is None:
+        return None
+
+    time, number = index
+    return np.atleast_1d(__value[as_slice(number)])
@@ -1,2 +1,4 @@
 from .device import Device
-from .device_config import DeviceConfig, DeviceConfigAuto, DeviceConfigManual
+from .device_config import DeviceConfig, DeviceConfigAuto, DeviceConfigManual, DeviceConfigReplay
+from .replay import ReplayDeviceManager
+from .watchdog import CallbackWatchdog
@@ -1,16 +1,22 @@
 from collections.abc import Sequence
+from contextlib import nullcontext
 import logging
 import time
-from typing import Callable, Mapping, overload
+from typing import Any, Callable, Mapping, overload
 
 import numpy as np
 import pyspectrum3 as ps3
 
-from vmk_spectrum3_wrapper.data import Data, Meta
-from vmk_spectrum3_wrapper.device.device_config import DeviceConfig, DeviceConfigAuto, DeviceConfigManual
+from vmk_spectrum3_wrapper.data import Data, Datum, Meta
+from vmk_spectrum3_wrapper.device.device_config import DeviceConfig, DeviceConfigAuto, DeviceConfigManual, DeviceConfigReplay
+from vmk_spectrum3_wrapper.device.replay import ReplayDeviceManager
+from vmk_spectrum3_wrapper.device.telemetry import Telemetry
+from vmk_spectrum3_wrapper.device.watchdog import CallbackWatchdog
 from vmk_spectrum3_wrapper.exception import WrapperConnectionError, WrapperError, WrapperSetupError, WrapperStatusError, eprint
 from vmk_spectrum3_wrapper.measurement_manager import MeasurementManager
 from vmk_spectrum3_wrapper.measurement_manager.filters import F
+from vmk_spectrum3_wrapper.recorder import RawFrameRecorder
+from vmk_spectrum3_wrapper.tracer import Tracer
 from vmk_spectrum3_wrapper.types import Array, Digit, IP, MilliSecond
 
 
@@ -46,6 +52,12 @@ class DeviceManagerFactory:
 
     def _create(self, config: DeviceConfig) -> ps3.DeviceManager:  # pragma: no cover
 
+        if isinstance(config, DeviceConfigReplay):
+            return ReplayDeviceManager(
+                filepath=config.filepath,
+                speed=config.speed,
+            )
+
         device_manager = ps3.DeviceManager()
 
         if isinstance(config, DeviceConfigAuto):
@@ -69,6 +81,9 @@ class Device:
         self,
         config: DeviceConfig | None = None,
         verbose: bool = False,
+        recorder: RawFrameRecorder | None = None,
+        tracer: Tracer | None = None,
+        watchdog: CallbackWatchdog | None = None,
     ) -> None:
 
         self._config = config or DeviceConfigAuto()
@@ -84,6 +99,11 @@ class Device:
         self._is_connected = False
 
         self.verbose = verbose
+        self.recorder = recorder
+        self.tracer = tracer
+        self.watchdog = watchdog
+        self._subscribers = []
+        self._telemetry = Telemetry()
 
     @property
     def config(self) -> DeviceConfig:
@@ -97,6 +117,37 @@ class Device:
     def status(self) -> Mapping[IP, ps3.AssemblyStatus] | None:
         return self._status
 
+    @property
+    def filter_report(self) -> Mapping[str, Mapping[str, Any]] | None:
+        """Отчет профилирования фильтров текущего измерения (если профилирование включено при `setup`)."""
+        if self._measurement_manager is None:
+            return None
+
+        return self._measurement_manager.storage.filter_report
+
+    @property
+    def telemetry(self) -> Telemetry:
+        """Телеметрия регистрации кадров текущего измерения (см. `Telemetry.dumps`)."""
+        return self._telemetry
+
+    def subscribe(self, callback: Callable[[Datum], None]) -> 'Device':
+        """Подписать `callback` на обработанные `datum` измерений (например, `viewer.LiveViewer`)."""
+        self._subscribers.append(callback)
+
+        if self._measurement_manager is not None:
+            self._measurement_manager.storage.subscribe(callback)
+
+        return self
+
+    def unsubscribe(self, callback: Callable[[Datum], None]) -> 'Device':
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+        if self._measurement_manager is not None:
+            self._measurement_manager.storage.unsubscribe(callback)
+
+        return self
+
     def connect(self) -> 'Device':
         """Connect to device."""
 
@@ -163,6 +214,7 @@ class Device:
         exposure: MilliSecond,  # базовое время экспозиции
         capacity: int = 1,  # количество накоплений
         filter: F | None = None,
+        profile: bool = False,  # профилирование фильтров
     ) -> 'Device': ...
     @overload
     def setup(
@@ -171,16 +223,38 @@ class Device:
         exposure: tuple[MilliSecond, MilliSecond],  # базовое время экспозиции в расширенном режиме измерений
         capacity: tuple[int, int] = ...,  # количество накоплений в расширенном режиме измерений
         filter: F | None = None,
+        profile: bool = False,  # профилирование фильтров
     ) -> 'Device': ...
-    def setup(self, n_times, exposure, capacity=1, filter=None):
+    def setup(self, n_times, exposure, capacity=1, filter=None, profile=False):
         """Setup device to read a measurement."""
 
+        with self._span('Device.setup'):
+            return self._setup(n_times, exposure, capacity=capacity, filter=filter, profile=profile)
+
+    def _setup(self, n_times, exposure, capacity, filter, profile):
+
+        if self._measurement_manager is not None:
+            self._measurement_manager.storage.close()
+
         self._measurement_manager = MeasurementManager.create(
             n_times=n_times,
             exposure=exposure,
             capacity=capacity,
             filter=filter,
+            profile=profile,
+            tracer=self.tracer,
+        )
+        for callback in self._subscribers:
+            self._measurement_manager.storage.subscribe(callback)
+        self._telemetry.reset(
+            period=max(exposure) if isinstance(exposure, Sequence) else exposure,
+            n_rejected=0 if self.recorder is None else self.recorder.n_dropped,
         )
+        if self.watchdog is not None:
+            self.watchdog.reset(
+                period=exposure,
+                capacity=capacity,
+            )
 
         try:
             self._check_connection(state=True)
@@ -201,9 +275,10 @@ class Device:
             )
             return self
         else:
-            self._wait(
-                timeout=self.config.change_exposure_timeout,  # TODO: ждем пока Сергей реализует get_current_mode и get_current_exposure для двойного времени экспозиции
-            )
+            with self._span('Device.setup.wait'):
+                self._wait(
+                    timeout=self.config.change_exposure_timeout,  # TODO: ждем пока Сергей реализует get_current_mode и get_current_exposure для двойного времени экспозиции
+                )
             LOGGER.info(
                 'Device is setup: %s',
                 self._measurement_manager,
@@ -218,6 +293,11 @@ class Device:
     ) -> Data | None:
         """Прочитать и вернуть данные (blocking), или прочитать в `storage` (non blocking)."""
 
+        with self._span('Device.read'):
+            return self._read(blocking=blocking, timeout=timeout)
+
+    def _read(self, blocking: bool, timeout: MilliSecond) -> Data | None:
+
         try:
             self._check_connection()
             # self._check_status(ps3.AssemblyStatus.ALIVE)  # TODO: по какой-то причине иногда не приходит статус ps3.AssemblyStatus.ALIVE
@@ -230,11 +310,13 @@ class Device:
             return None
 
         self.device_manager.read()
-        self._wait(timeout)
+        with self._span('Device.read.wait'):
+            self._wait(timeout)
 
         if blocking:
             while self._measurement_manager.progress < 1:
-                self._wait(timeout)
+                with self._span('Device.read.wait'):
+                    self._wait(timeout)
                 LOGGER.debug(
                     'Reading data: %d%s',
                     self._measurement_manager.progress*100,
@@ -284,13 +366,51 @@ class Device:
             context.assembly_params.id,
             context.frame_state.frame_number,
         )
+        received_at = time.perf_counter()
+        frame = np.array(context.result)
+
+        self._telemetry.on_frame(
+            assembly_id=context.assembly_params.id,
+            frame_number=context.frame_state.frame_number,
+            n_bytes=frame.nbytes,
+            received_at=received_at,
+        )
+
+        if self.recorder is not None:
+            self.recorder.put(
+                frame,
+                frame_number=context.frame_state.frame_number,
+                assembly_id=context.assembly_params.id,
+            )
+            self._telemetry.on_queue(self.recorder.queue_depth, n_rejected=self.recorder.n_dropped)
+
         self._on_frame(
-            frame=np.array(context.result),
+            frame=frame,
         )
+        if self._measurement_manager.storage.deferred:
+            self._telemetry.on_storage(self._measurement_manager.storage.queue_depth)
+        finished_at = time.perf_counter()
+        self._telemetry.on_callback(finished_at - received_at)
+
+        if self.watchdog is not None and self.watchdog.update(finished_at - received_at):
+            self._measurement_manager.storage.defer()
+            LOGGER.warning(
+                'Storage is switched to deferred processing: %s',
+                self.watchdog,
+            )
+
+        if self.tracer is not None:
+            self.tracer.add('Device.on_context', received_at, finished_at, category='driver')
 
     def _on_frame(self, frame: Array[Digit]) -> None:
+        n_data = len(self._measurement_manager.storage)
+        started_at = time.perf_counter()
+
         self._measurement_manager.put(frame)
 
+        if not self._measurement_manager.storage.deferred and len(self._measurement_manager.storage) > n_data:  # схема измерения завершена и обработана фильтром
+            self._telemetry.on_filter(time.perf_counter() - started_at)
+
     def _on_status(self, status: Mapping[IP, ps3.AssemblyStatus]) -> None:
         LOGGER.info(
             'Status is updated: %s.',
@@ -332,6 +452,11 @@ class Device:
         if self._measurement_manager is None:
             raise WrapperSetupError('Setup a device before!')
 
+    def _span(self, name: str):
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.span(name, category='device')
+
     @staticmethod
     def _wait(timeout: MilliSecond) -> None:
         time.sleep(1e-3*timeout)
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from typing import TypeAlias
 
 from vmk_spectrum3_wrapper.config import CHANGE_EXPOSURE_TIMEOUT
-from vmk_spectrum3_wrapper.types import IP, MilliSecond
+from vmk_spectrum3_wrapper.types import IP, MilliSecond, Path
 
 
 @dataclass
@@ -17,4 +17,11 @@ class DeviceConfigManual:
     change_exposure_timeout: MilliSecond = field(default=CHANGE_EXPOSURE_TIMEOUT)
 
 
-DeviceConfig: TypeAlias = DeviceConfigAuto | DeviceConfigManual
+@dataclass
+class DeviceConfigReplay:
+    filepath: Path  # путь к записи сырых кадров (см. `recorder.RawFrameRecorder`)
+    speed: float | None = field(default=1)  # скорость воспроизведения относительно реального времени (`None` - с максимальной скоростью)
+    change_exposure_timeout: MilliSecond = field(default=0)
+
+
+DeviceConfig: TypeAlias = DeviceConfigAuto | DeviceConfigManual | DeviceConfigReplay
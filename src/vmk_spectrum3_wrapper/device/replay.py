@@ -0,0 +1,207 @@
+"""Воспроизведение записи сырых кадров (см. `recorder.RawFrameRecorder`) через `Device` вместо драйвера.
+
+Кадры выдаются из фонового потока с номерами кадров и идентификаторами сборок записи в реальном времени (по времени получения кадров записи), ускоренно или с максимальной скоростью.
+Запись отображается в память (сжатая запись распаковывается поблочно), поэтому кадры выдаются без чтения файла на каждый кадр.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Mapping
+
+import numpy as np
+import pyspectrum3 as ps3
+
+from vmk_spectrum3_wrapper.recorder import Recording
+from vmk_spectrum3_wrapper.types import Array, Digit, IP, Path, Second
+
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024  # количество записей, читаемых за один раз
+
+
+class ReplayContext:
+    """Контекст кадра записи (повторяет используемые атрибуты `ps3.AssemblyContext`)."""
+
+    class AssemblyParams:
+        __slots__ = ('id', )
+
+        def __init__(self, id: str):
+            self.id = id
+
+    class FrameState:
+        __slots__ = ('frame_number', )
+
+        def __init__(self, frame_number: int):
+            self.frame_number = frame_number
+
+    __slots__ = ('assembly_params', 'frame_state', 'result')
+
+    def __init__(self, id: str, frame_number: int, result: Array[Digit]):
+        self.assembly_params = self.AssemblyParams(id)
+        self.frame_state = self.FrameState(frame_number)
+        self.result = result
+
+
+class ReplayDeviceManager:
+    """Менеджер устройства, воспроизводящий запись сырых кадров (заменяет `ps3.DeviceManager`).
+
+    Каждый вызов `read` выдает следующие `read_frames_num` кадров записи (см. `rewind`).
+    Параметры:
+        `filepath` - путь к файлу записи;
+        `speed` - скорость воспроизведения относительно реального времени (`None` - с максимальной скоростью).
+    """
+
+    def __init__(self, filepath: Path, speed: float | None = 1):
+        self._recording = Recording(filepath)
+        self._speed = speed
+
+        self._on_context = None
+        self._on_status = None
+        self._on_error = None
+        self._measurement = None
+
+        self._position = 0
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def recording(self) -> Recording:
+        return self._recording
+
+    @property
+    def speed(self) -> float | None:
+        return self._speed
+
+    @property
+    def position(self) -> int:
+        """Номер следующей воспроизводимой записи."""
+        return self._position
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def assembly_ids(self) -> list[IP]:
+        return [
+            assembly_id.decode()
+            for assembly_id in np.unique(np.asarray(self._recording.assembly_id))
+        ]
+
+    def initialize(self, *args, **kwargs) -> None:
+        pass
+
+    def set_context_callback(self, callback: Callable[[ps3.AssemblyContext], None]) -> None:
+        self._on_context = callback
+
+    def set_status_callback(self, callback: Callable[[Mapping[IP, ps3.AssemblyStatus]], None]) -> None:
+        self._on_status = callback
+
+    def set_error_callback(self, callback: Callable[[ps3.AsyncDriverException], None]) -> None:
+        self._on_error = callback
+
+    def set_pipe_filter(self, *args, **kwargs) -> None:
+        pass
+
+    def set_measurement(self, measurement: ps3.Measurement) -> None:
+        self._measurement = measurement
+
+    def connect(self) -> None:
+        self._notify_status(ps3.AssemblyStatus.ALIVE)
+
+    def disconnect(self) -> None:
+        self.stop()
+        self._notify_status(ps3.AssemblyStatus.DISCONNECTED)
+
+    def read(self) -> None:
+        """Запустить воспроизведение следующих `read_frames_num` кадров записи в фоновом потоке (не блокирует)."""
+        self.join()
+
+        start = self._position
+        stop = min(start + self._measurement.read_frames_num, len(self._recording))
+        if stop - start < self._measurement.read_frames_num:
+            LOGGER.warning(
+                'Recording %s is exhausted: %d frames are replayed instead of %d!',
+                self._recording.filepath,
+                stop - start,
+                self._measurement.read_frames_num,
+            )
+        self._position = stop
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._replay,
+            args=(start, stop),
+            name=f'{self.__class__.__name__}({self._recording.filepath})',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def join(self, timeout: Second | None = None) -> bool:
+        """Дождаться окончания воспроизведения; возвращает `True`, если воспроизведение окончено."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+        return not self.is_running
+
+    def stop(self) -> None:
+        """Прервать воспроизведение."""
+        self._stopped.set()
+        self.join()
+
+    def rewind(self, position: int = 0) -> None:
+        """Перейти к записи `position`."""
+        self.stop()
+        self._position = position
+
+    def _replay(self, start: int, stop: int) -> None:
+        started_at = time.perf_counter()
+        timestamp = None
+
+        for lo in range(start, stop, CHUNK_SIZE):
+            records = self._recording.records[lo:min(lo + CHUNK_SIZE, stop)]
+
+            frames = records['frame']
+            frame_numbers = np.asarray(records['frame_number']).tolist()
+            timestamps = np.asarray(records['timestamp']).tolist()
+            ids, index = np.unique(np.asarray(records['assembly_id']), return_inverse=True)
+            ids = [assembly_id.decode() for assembly_id in ids]
+
+            if timestamp is None:
+                timestamp = timestamps[0]
+
+            for i, frame_number in enumerate(frame_numbers):
+                if self._speed is not None:
+                    delay = started_at + (timestamps[i] - timestamp) / self._speed - time.perf_counter()
+                    if delay > 0:
+                        self._stopped.wait(delay)
+                if self._stopped.is_set():
+                    return
+
+                try:
+                    self._on_context(ReplayContext(
+                        id=ids[index[i]],
+                        frame_number=frame_number,
+                        result=frames[i],
+                    ))
+                except Exception as error:
+                    LOGGER.error(
+                        'An error was happend while replaying frame %d!',
+                        frame_number,
+                        exc_info=error,
+                    )
+
+    def _notify_status(self, status: ps3.AssemblyStatus) -> None:
+        if self._on_status is None:
+            return
+
+        self._on_status({
+            assembly_id: status
+            for assembly_id in self.assembly_ids
+        })
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self._recording.filepath}, speed={self.speed}, position={self.position}/{len(self._recording)})'
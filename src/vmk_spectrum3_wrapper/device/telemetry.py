@@ -0,0 +1,193 @@
+"""Телеметрия регистрации кадров.
+
+Счетчики обновляются только в потоке драйвера (единственный писатель), поэтому обновляются без блокировок;
+`dumps` читает текущие значения из любого потока (значения разных счетчиков могут отличаться на один кадр).
+"""
+import time
+from typing import Any, Mapping
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.types import MilliSecond, Second
+
+
+class Durations:
+    """Распределение длительностей.
+
+    Длительности последних `maxsize` событий хранятся в заранее выделенном кольцевом буфере (для расчета перцентилей).
+    """
+
+    __slots__ = ('n_calls', 'total', 'max', '_durations')
+
+    def __init__(self, maxsize: int = 10_000):
+        self.n_calls = 0
+        self.total = 0.
+        self.max = 0.
+
+        self._durations = np.zeros(maxsize)
+
+    def update(self, duration: Second) -> None:
+        self._durations[self.n_calls % len(self._durations)] = duration
+        self.n_calls += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def dumps(self) -> Mapping[str, Any]:
+        durations = self._durations[:min(self.n_calls, len(self._durations))]
+        p50, p90, p99 = np.percentile(durations, [50, 90, 99]) if self.n_calls else (np.nan, np.nan, np.nan)
+
+        return {
+            'n_calls': self.n_calls,
+            'mean': self.total / self.n_calls if self.n_calls else np.nan,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99,
+            'max': self.max if self.n_calls else np.nan,
+        }
+
+
+class Telemetry:
+    """Телеметрия регистрации кадров устройства (сбрасывается при каждом `setup`).
+
+    Параметры:
+        `period` - ожидаемый интервал между кадрами (кадр, полученный позже `tolerance` периодов после предыдущего кадра сборки, считается опоздавшим);
+        `tolerance` - допустимое отношение интервала между кадрами к `period`;
+        `maxsize` - количество длительностей, хранимых для расчета перцентилей.
+    """
+
+    def __init__(
+        self,
+        period: MilliSecond | None = None,
+        tolerance: float = 2,
+        maxsize: int = 10_000,
+    ):
+        self._tolerance = tolerance
+        self._maxsize = maxsize
+
+        self.reset(period=period)
+
+    @property
+    def period(self) -> MilliSecond | None:
+        return self._period
+
+    @property
+    def n_frames(self) -> int:
+        """Количество полученных кадров."""
+        return self._n_frames
+
+    @property
+    def n_dropped(self) -> int:
+        """Количество потерянных кадров (пропуски номеров кадров сборок и отброшенные регистратором кадры)."""
+        return self._n_lost + self._n_rejected
+
+    @property
+    def n_late(self) -> int:
+        """Количество опоздавших кадров."""
+        return self._n_late
+
+    @property
+    def n_bytes(self) -> int:
+        """Объем полученных кадров, байт."""
+        return self._n_bytes
+
+    @property
+    def fps(self) -> float:
+        """Частота получения кадров (от первого до последнего кадра), кадр/с."""
+        if self._n_frames < 2 or self._finished_at == self._started_at:
+            return np.nan
+
+        return (self._n_frames - 1) / (self._finished_at - self._started_at)
+
+    def reset(self, period: MilliSecond | None = None, n_rejected: int = 0) -> None:
+        """Сбросить счетчики (перед новым измерением); `n_rejected` - количество отброшенных регистратором кадров к началу измерения."""
+
+        self._period = period
+
+        self._started_at = None
+        self._finished_at = None
+        self._n_frames = 0
+        self._n_bytes = 0
+        self._n_lost = 0
+        self._n_rejected = 0
+        self._n_rejected_origin = n_rejected  # счетчик регистратора сбрасывается только при его открытии
+        self._n_late = 0
+        self._queue_depth = 0
+        self._queue_depth_max = 0
+        self._storage_depth = 0
+        self._storage_depth_max = 0
+
+        self._assemblies = {}  # количество кадров и (номер, время) последнего кадра каждой сборки
+        self._callback = Durations(maxsize=self._maxsize)
+        self._filter = Durations(maxsize=self._maxsize)
+
+    def on_frame(self, assembly_id: str, frame_number: int, n_bytes: int, received_at: Second | None = None) -> None:
+        """Учесть кадр `frame_number` сборки `assembly_id`, полученный в момент `received_at` (`time.perf_counter`)."""
+        received_at = time.perf_counter() if received_at is None else received_at
+
+        if self._started_at is None:
+            self._started_at = received_at
+        self._finished_at = received_at
+        self._n_frames += 1
+        self._n_bytes += n_bytes
+
+        n_frames, last_number, last_at = self._assemblies.get(assembly_id, (0, None, None))
+        if last_number is not None:
+            if frame_number > last_number + 1:
+                self._n_lost += frame_number - last_number - 1
+            if self._period is not None and (received_at - last_at) > 1e-3*self._tolerance*self._period:
+                self._n_late += 1
+
+        self._assemblies[assembly_id] = (n_frames + 1, frame_number, received_at)
+
+    def on_callback(self, duration: Second) -> None:
+        """Учесть длительность обработки кадра callback'ом драйвера."""
+        self._callback.update(duration)
+
+    def on_filter(self, duration: Second) -> None:
+        """Учесть длительность обработки схемы измерения фильтром."""
+        self._filter.update(duration)
+
+    def on_queue(self, depth: int, n_rejected: int) -> None:
+        """Учесть глубину очереди записи и количество отброшенных регистратором кадров (с момента его открытия)."""
+
+        self._queue_depth = depth
+        if depth > self._queue_depth_max:
+            self._queue_depth_max = depth
+
+        if n_rejected < self._n_rejected_origin:  # регистратор открыт заново после `reset`
+            self._n_rejected_origin = 0
+        self._n_rejected = n_rejected - self._n_rejected_origin
+
+    def on_storage(self, depth: int) -> None:
+        """Учесть количество буферов, ожидающих обработки в рабочем потоке хранилища (см. `Storage.defer`)."""
+
+        self._storage_depth = depth
+        if depth > self._storage_depth_max:
+            self._storage_depth_max = depth
+
+    def dumps(self) -> Mapping[str, Any]:
+        """Телеметрия в виде словаря; длительности в секундах, объем в байтах."""
+
+        return {
+            'n_frames': self.n_frames,
+            'frames': {
+                assembly_id: n_frames
+                for assembly_id, (n_frames, _, _) in list(self._assemblies.items())
+            },
+            'fps': self.fps,
+            'n_dropped': self.n_dropped,
+            'n_late': self.n_late,
+            'n_bytes': self.n_bytes,
+            'queue_depth': self._queue_depth,
+            'queue_depth_max': self._queue_depth_max,
+            'storage_depth': self._storage_depth,
+            'storage_depth_max': self._storage_depth_max,
+            'callback': self._callback.dumps(),
+            'filter': self._filter.dumps(),
+        }
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.n_frames} frames, fps={self.fps:.1f}, dropped={self.n_dropped}, late={self.n_late})'
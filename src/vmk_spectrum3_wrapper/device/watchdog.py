@@ -0,0 +1,139 @@
+"""Контроль длительности обработки кадров callback'ом драйвера.
+
+Драйвер выдает кадр каждый период экспозиции; если обработка кадра (вместе с синхронной обработкой буфера фильтром) длится дольше, кадры накапливаются в драйвере или теряются.
+"""
+import logging
+from collections.abc import Sequence
+from typing import Any, Mapping
+
+from vmk_spectrum3_wrapper.types import MilliSecond, Second
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CallbackWatchdog:
+    """Сторож длительности обработки кадров.
+
+    Обработка кадра, длящаяся дольше `threshold` периодов экспозиции, считается переполнением.
+    О переполнениях предупреждается не чаще одного раза на `window` кадров (в `extra` записи журнала передается статистика `dumps`).
+    Схема измерения считается переполненной, если суммарная обработка ее кадров (вместе с обработкой буфера фильтром) длится дольше
+    `threshold` длительностей схемы: короткие переполнения отдельных кадров драйвер компенсирует на последующих кадрах.
+    Параметры:
+        `threshold` - допустимое отношение длительности обработки кадра (схемы измерения) к периоду экспозиции (длительности схемы);
+        `window` - минимальное количество кадров между предупреждениями;
+        `defer` - переходить к отложенной обработке буферов (см. `Storage.defer`) после `patience` переполненных схем измерения подряд;
+        `patience` - количество переполненных схем измерения подряд, после которого выполняется переход к отложенной обработке.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1,
+        window: int = 100,
+        defer: bool = False,
+        patience: int = 3,
+    ):
+        self._threshold = threshold
+        self._window = window
+        self._defer = defer
+        self._patience = patience
+
+        self.reset()
+
+    @property
+    def period(self) -> MilliSecond | None:
+        return self._period
+
+    @property
+    def n_overruns(self) -> int:
+        """Количество переполнений."""
+        return self._n_overruns
+
+    @property
+    def is_deferred(self) -> bool:
+        """Выполнен ли переход к отложенной обработке."""
+        return self._is_deferred
+
+    def reset(
+        self,
+        period: MilliSecond | tuple[MilliSecond, MilliSecond] | None = None,
+        capacity: int | tuple[int, int] = 1,
+    ) -> None:
+        """Сбросить статистику (перед новым измерением с периодом экспозиции `period` и количеством накоплений `capacity`)."""
+        periods = tuple(period) if isinstance(period, Sequence) else (period, )
+        capacities = tuple(capacity) if isinstance(capacity, Sequence) else (capacity, )*len(periods)
+
+        self._period = None if period is None else min(periods)
+        self._capacity = sum(capacities)  # количество кадров схемы измерения
+        self._duration = None if period is None else sum(p*c for p, c in zip(periods, capacities))  # длительность схемы измерения
+        self._n_calls = 0
+        self._n_overruns = 0
+        self._n_consecutive = 0
+        self._schema_total = 0.
+        self._total = 0.
+        self._max = 0.
+        self._warned_at = None  # номер кадра последнего предупреждения
+        self._is_deferred = False
+
+    def update(self, duration: Second) -> bool:
+        """Учесть длительность обработки кадра; возвращает `True`, если требуется переход к отложенной обработке."""
+
+        self._n_calls += 1
+        self._total += duration
+        if duration > self._max:
+            self._max = duration
+        self._schema_total += duration
+
+        if self._period is not None and duration > 1e-3*self._threshold*self._period:
+            self._n_overruns += 1
+
+            if self._warned_at is None or self._n_calls - self._warned_at >= self._window:
+                self._warned_at = self._n_calls
+                self._warn()
+
+        if self._n_calls % self._capacity:  # схема измерения не завершена
+            return False
+
+        schema_total, self._schema_total = self._schema_total, 0.
+        if self._duration is None or schema_total <= 1e-3*self._threshold*self._duration:
+            self._n_consecutive = 0
+            return False
+
+        self._n_consecutive += 1
+
+        if self._defer and not self._is_deferred and self._n_consecutive >= self._patience:
+            self._is_deferred = True
+            return True
+
+        return False
+
+    def dumps(self) -> Mapping[str, Any]:
+        """Статистика обработки кадров; длительности в секундах."""
+
+        return {
+            'period': None if self._period is None else 1e-3*self._period,
+            'threshold': self._threshold,
+            'n_calls': self._n_calls,
+            'n_overruns': self._n_overruns,
+            'n_consecutive': self._n_consecutive,
+            'mean': self._total / self._n_calls if self._n_calls else None,
+            'max': self._max if self._n_calls else None,
+            'deferred': self._is_deferred,
+        }
+
+    def _warn(self) -> None:
+        stats = self.dumps()
+
+        LOGGER.warning(
+            'Callback overrun: %d of %d frames are processed longer than exposure %s ms (max: %.3f ms)!',
+            stats['n_overruns'],
+            stats['n_calls'],
+            self._period,
+            1e+3*stats['max'],
+            extra={'watchdog': stats},
+        )
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}(threshold={self._threshold}, overruns={self.n_overruns}/{self._n_calls}, deferred={self.is_deferred})'
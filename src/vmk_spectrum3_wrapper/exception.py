@@ -33,6 +33,16 @@ class SetupStorageError(StorageError):
     pass
 
 
+# --------        shuffle        --------
+class ShuffleError(Exception):
+    pass
+
+
+# --------        codec        --------
+class CodecError(Exception):
+    pass
+
+
 # --------        handler        --------
 def eprint(message: str, error: Exception, file: TextIO | Path = sys.stdout) -> None:
     print(f'{message} {error}', file=file, flush=True)
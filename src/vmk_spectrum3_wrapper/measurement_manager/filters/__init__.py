@@ -1,8 +1,9 @@
 from typing import TypeAlias
 
-from .core_filters import ClipFilter, DeviationFilter, EyeFilter, OffsetFilter, ScaleFilter, ShuffleFilter
-from .integration_filters import IntegrationFilterABC, StandardIntegrationFilter, HighDynamicRangeIntegrationFilter
+from .core_filters import BinningFilter, ClipFilter, DeviationFilter, EyeFilter, OffsetFilter, RegionFilter, ScaleFilter, ShuffleFilter
+from .integration_filters import IntegrationFilterABC, HighDynamicRangeIntegrationFilter, MedianIntegrationFilter, SigmaClippedIntegrationFilter, StandardIntegrationFilter
 from .pipe_filter import PipeFilter
+from .profiler import FilterProfiler
 from .presets import CorePreset, StandardIntegrationPreset, HighDynamicRangeIntegrationPreset
 from .switch_filters import SwitchFilter
 from .typing import F
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
+from vmk_spectrum3_wrapper.data import Batch
 from vmk_spectrum3_wrapper.types import Array, U
 
+if TYPE_CHECKING:
+    from vmk_spectrum3_wrapper.measurement_manager.filters.profiler import FilterProfiler
+
 
 class FilterABC(ABC):
     """Абстрактный базовый класс фильтров обработки данных."""
@@ -12,3 +18,39 @@ class FilterABC(ABC):
     @abstractmethod
     def __call__(self, datum: Array[U], *args, **kwargs) -> Array[U]:
         raise NotImplementedError
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        """Обработать стек `batch` схем измерения.
+
+        По умолчанию каждая схема измерения обрабатывается отдельно; фильтры, допускающие векторизацию, переопределяют данный метод.
+        """
+
+        return Batch.stack([
+            self(datum, *args, **kwargs)
+            for datum in batch
+        ])
+
+
+class CompositeFilterABC(FilterABC):
+    """Абстрактный базовый класс фильтров, составленных из вложенных фильтров (конвейеры, разветвления)."""
+
+    def __init__(self, filters: Sequence[FilterABC]):
+        self._filters = filters
+        self._stats = None  # статистика вызовов вложенных фильтров (при профилировании)
+
+    @property
+    def filters(self) -> Sequence[FilterABC]:
+        return self._filters
+
+    def profile(self, profiler: 'FilterProfiler | None', name: str = '') -> None:
+        """Включить (`profiler`) или выключить (`None`) профилирование вложенных фильтров."""
+        name = name or self.__class__.__name__
+
+        self._stats = None if profiler is None else []
+        for i, handler in enumerate(self.filters):
+            handler_name = f'{name}/{i}:{handler.__class__.__name__}'
+
+            if profiler is not None:
+                self._stats.append(profiler.get(handler_name))
+            if isinstance(handler, CompositeFilterABC):
+                handler.profile(profiler, handler_name)
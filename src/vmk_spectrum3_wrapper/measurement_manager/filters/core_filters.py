@@ -1,11 +1,13 @@
 from abc import abstractmethod
+from collections.abc import Sequence
 from typing import Any, Literal, overload
 
 import numpy as np
 
 from vmk_spectrum3_wrapper.adc import ADC
 from vmk_spectrum3_wrapper.config import DEFAULT_ADC, DEFAULT_DETECTOR
-from vmk_spectrum3_wrapper.data import Data, Datum
+from vmk_spectrum3_wrapper.data import Batch, Data, Datum
+from vmk_spectrum3_wrapper.data.utils import output
 from vmk_spectrum3_wrapper.measurement_manager.filters.base_filter import FilterABC
 from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import DatumFilterError, FilterError
 from vmk_spectrum3_wrapper.noise import Noise
@@ -29,16 +31,30 @@ class EyeFilter(CoreFilterABC):
         return value
 
     def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
-        return Datum(
+        return Datum._create(
             units=datum.units,
             intensity=datum.intensity,
             clipped=self.kernel(datum.clipped),
             deviation=datum.deviation,
+            number=datum._number,
+            shared=datum.shared,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        return Batch(
+            units=batch.units,
+            intensity=batch.intensity,
+            clipped=self.kernel(batch.clipped),
+            deviation=batch.deviation,
+            number=batch._number,
         )
 
 
 class ShuffleFilter(CoreFilterABC):
-    """Смещения и перестановок фильтр."""
+    """Смещения и перестановок фильтр.
+
+    Номера отсчетов после перестановки соответствуют отсчетам детектора (а не кадра).
+    """
 
     def __new__(cls, shuffle: Shuffle | None):
         if shuffle is None:
@@ -72,11 +88,23 @@ class ShuffleFilter(CoreFilterABC):
         if not (datum.units == Units.digit):
             raise DatumFilterError(f'{datum.units} is not valid! Only `digit` is supported!')
 
-        return Datum(
+        return Datum._create(
             units=datum.units,
             intensity=self.kernel(datum.intensity),
             clipped=self.kernel(datum.clipped),
             deviation=self.kernel(datum.deviation),
+            shared=False,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        if not (batch.units == Units.digit):
+            raise DatumFilterError(f'{batch.units} is not valid! Only `digit` is supported!')
+
+        return Batch(
+            units=batch.units,
+            intensity=self.kernel(batch.intensity),
+            clipped=self.kernel(batch.clipped),
+            deviation=self.kernel(batch.deviation),
         )
 
     def __eq__(self, other: 'ShuffleFilter') -> None:
@@ -88,6 +116,114 @@ class ShuffleFilter(CoreFilterABC):
         ])
 
 
+class RegionFilter(CoreFilterABC):
+    """Области интереса (выбор отсчетов `index`) фильтр.
+
+    Индекс отсчетов рассчитывается однократно при создании фильтра; если отсчеты образуют непрерывный диапазон, выбор выполняется без копирования.
+    """
+
+    def __new__(cls, index: Array[int] | None, *args, **kwargs):
+        if index is None:
+            return None
+
+        return super().__new__(cls)
+
+    def __init__(self, index: Array[int]):
+        index = np.unique(np.asarray(index, dtype=int))
+        if not (index.ndim == 1 and len(index) > 0 and index[0] >= 0):
+            raise FilterError(f'{self.__class__.__name__} is not support index: {index}!')
+
+        index.setflags(write=False)  # используется как `number` выбранных отсчетов
+
+        self._index = index
+        self._key = slice(index[0], index[-1] + 1) if index[-1] - index[0] + 1 == len(index) else index
+
+    @classmethod
+    def from_windows(cls, windows: Sequence[tuple[int, int]]) -> 'RegionFilter':
+        """Создать фильтр по окнам `(start, stop)` аналитических линий."""
+
+        return cls(np.concatenate([
+            np.arange(start, stop)
+            for start, stop in windows
+        ]))
+
+    @property
+    def index(self) -> Array[int]:
+        return self._index
+
+    @property
+    def lengths(self) -> Array[int]:
+        """Длины непрерывных окон выбранных отсчетов."""
+        bounds = np.flatnonzero(np.diff(self._index) != 1) + 1
+
+        return np.diff([0, *bounds, len(self._index)])
+
+    @overload
+    def kernel(self, value: Array[U]) -> Array[U]: ...
+    @overload
+    def kernel(self, value: Array[bool]) -> Array[bool]: ...
+    @overload
+    def kernel(self, value: None) -> None: ...
+    def kernel(self, value):
+        if value is None:
+            return None
+
+        return value[..., self._key]
+
+    def crop(self, data: Data) -> Data:
+        """Выбрать отсчеты `data` (например, `offset` для последующих фильтров)."""
+        self._validate(data.n_numbers)
+
+        return Data(
+            units=data.units,
+            intensity=self.kernel(data.intensity),
+            clipped=self.kernel(data.clipped),
+            deviation=self.kernel(data.deviation),
+            meta=data.meta,
+            number=self._crop_number(data._number),
+        )
+
+    def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
+        self._validate(datum.n_numbers)
+
+        return Datum._create(
+            units=datum.units,
+            intensity=self.kernel(datum.intensity),
+            clipped=self.kernel(datum.clipped),
+            deviation=self.kernel(datum.deviation),
+            number=self._crop_number(datum._number),
+            shared=datum.shared,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        self._validate(batch.n_numbers)
+
+        return Batch(
+            units=batch.units,
+            intensity=self.kernel(batch.intensity),
+            clipped=self.kernel(batch.clipped),
+            deviation=self.kernel(batch.deviation),
+            number=self._crop_number(batch._number),
+        )
+
+    def _crop_number(self, number: Array[int] | None) -> Array[int]:
+        if number is None:  # номера отсчетов кадра совпадают с индексом (без создания `arange`)
+            return self.index
+        return number[self._key]
+
+    def _validate(self, n_numbers: int) -> None:
+        if self.index[-1] >= n_numbers:
+            raise DatumFilterError(f'Region {self.index[0]}..{self.index[-1]} is out of {n_numbers} numbers!')
+
+    def __eq__(self, other: 'RegionFilter') -> None:
+        if not isinstance(other, self.__class__):
+            return False
+
+        return all([
+            np.array_equal(self.index, other.index),
+        ])
+
+
 class ClipFilter(CoreFilterABC):
     """Маскирование зашкаленных отсчетов фильтр."""
 
@@ -112,11 +248,25 @@ class ClipFilter(CoreFilterABC):
         if not (datum.units == Units.digit):
             raise DatumFilterError(f'{datum.units} is not valid! Only `digit` is supported!')
 
-        return Datum(
+        return Datum._create(
             units=datum.units,
             intensity=datum.intensity,
             clipped=self.kernel(datum.intensity),
             deviation=datum.deviation,
+            number=datum._number,
+            shared=datum.shared,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        if not (batch.units == Units.digit):
+            raise DatumFilterError(f'{batch.units} is not valid! Only `digit` is supported!')
+
+        return Batch(
+            units=batch.units,
+            intensity=batch.intensity,
+            clipped=self.kernel(batch.intensity),
+            deviation=batch.deviation,
+            number=batch._number,
         )
 
     def __eq__(self, other: 'ClipFilter') -> None:
@@ -128,6 +278,103 @@ class ClipFilter(CoreFilterABC):
         ])
 
 
+class BinningFilter(CoreFilterABC):
+    """Биннинг (объединение `factor` соседних отсчетов) фильтр.
+
+    Зашкаленность объединяется по ИЛИ, стандартное отклонение - как корень из суммы квадратов; номером бина считается номер его первого отсчета.
+    """
+
+    def __new__(cls, factor: int | None, *args, **kwargs):
+        if factor is None:
+            return None
+
+        return super().__new__(cls)
+
+    def __init__(self, factor: int, is_averaging: bool = True):
+        if not (isinstance(factor, int) and factor > 0):
+            raise FilterError(f'{self.__class__.__name__} is not support factor: {factor}!')
+
+        self._factor = factor
+        self._is_averaging = is_averaging
+
+    @property
+    def factor(self) -> int:
+        return self._factor
+
+    @property
+    def is_averaging(self) -> bool:
+        return self._is_averaging
+
+    @overload
+    def kernel(self, value: Array[U], kind: Literal['intensity', 'clipped', 'deviation']) -> Array[U]: ...
+    @overload
+    def kernel(self, value: Array[bool], kind: Literal['intensity', 'clipped', 'deviation']) -> Array[bool]: ...
+    @overload
+    def kernel(self, value: None, kind: Literal['intensity', 'clipped', 'deviation']) -> None: ...
+    def kernel(self, value, kind):
+        if value is None:
+            return None
+
+        value = value.reshape(*value.shape[:-1], -1, self.factor)
+        factor = self.factor if self.is_averaging else 1
+
+        if kind == 'intensity':
+            return np.sum(value, axis=-1) / factor
+        if kind == 'clipped':
+            return np.any(value, axis=-1)
+        if kind == 'deviation':
+            return np.sqrt(np.sum(value**2, axis=-1)) / factor
+
+    def bin_data(self, data: Data) -> Data:
+        """Объединить отсчеты `data` (например, `offset` для последующих фильтров)."""
+        self._validate(data.n_numbers)
+
+        return Data(
+            units=data.units,
+            intensity=self.kernel(data.intensity, kind='intensity'),
+            clipped=self.kernel(data.clipped, kind='clipped'),
+            deviation=self.kernel(data.deviation, kind='deviation'),
+            meta=data.meta,
+            number=data.number[::self.factor],
+        )
+
+    def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
+        self._validate(datum.n_numbers)
+
+        return Datum._create(
+            units=datum.units,
+            intensity=self.kernel(datum.intensity, kind='intensity'),
+            clipped=self.kernel(datum.clipped, kind='clipped'),
+            deviation=self.kernel(datum.deviation, kind='deviation'),
+            number=datum.number[::self.factor],
+            shared=False,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        self._validate(batch.n_numbers)
+
+        return Batch(
+            units=batch.units,
+            intensity=self.kernel(batch.intensity, kind='intensity'),
+            clipped=self.kernel(batch.clipped, kind='clipped'),
+            deviation=self.kernel(batch.deviation, kind='deviation'),
+            number=batch.number[::self.factor],
+        )
+
+    def _validate(self, n_numbers: int) -> None:
+        if n_numbers % self.factor:
+            raise DatumFilterError(f'{n_numbers} numbers could not be binned by {self.factor}!')
+
+    def __eq__(self, other: 'BinningFilter') -> None:
+        if not isinstance(other, self.__class__):
+            return False
+
+        return all([
+            self.factor == other.factor,
+            self.is_averaging == other.is_averaging,
+        ])
+
+
 class ScaleFilter(CoreFilterABC):
     """Масштабирования фильтр. Перевод из `Units.digit` в `units`."""
 
@@ -156,11 +403,25 @@ class ScaleFilter(CoreFilterABC):
         if not (datum.units == Units.digit):
             raise DatumFilterError(f'{datum.units} is not valid! Only `digit` is supported!')
 
-        return Datum(
+        return Datum._create(
             units=self.units,
             intensity=self.kernel(datum.intensity),
             clipped=datum.clipped,
             deviation=self.kernel(datum.deviation),
+            number=datum._number,
+            shared=datum.shared,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        if not (batch.units == Units.digit):
+            raise DatumFilterError(f'{batch.units} is not valid! Only `digit` is supported!')
+
+        return Batch(
+            units=self.units,
+            intensity=self.kernel(batch.intensity),
+            clipped=batch.clipped,
+            deviation=self.kernel(batch.deviation),
+            number=batch._number,
         )
 
     def __eq__(self, other: 'ScaleFilter') -> None:
@@ -195,21 +456,25 @@ class OffsetFilter(CoreFilterABC):
         return self._offset
 
     @overload
-    def kernel(self, value: Array[U], kind: Literal['intensity', 'clipped', 'deviation']) -> Array[U]: ...
+    def kernel(self, value: Array[U], kind: Literal['intensity', 'clipped', 'deviation'], shared: bool = True) -> Array[U]: ...
     @overload
-    def kernel(self, value: Array[bool], kind: Literal['intensity', 'clipped', 'deviation']) -> Array[bool]: ...
+    def kernel(self, value: Array[bool], kind: Literal['intensity', 'clipped', 'deviation'], shared: bool = True) -> Array[bool]: ...
     @overload
-    def kernel(self, value: None, kind: Literal['intensity', 'clipped', 'deviation']) -> None: ...
-    def kernel(self, value, kind):
+    def kernel(self, value: None, kind: Literal['intensity', 'clipped', 'deviation'], shared: bool = True) -> None: ...
+    def kernel(self, value, kind, shared=True):
+        """Сместить `value` (массив необщих данных перезаписывается, см. `Datum.shared`)."""
         if value is None:
             return None
 
         if kind == 'intensity':
-            return value - self.offset.intensity.flatten()
+            offset = self.offset.intensity.flatten()
+            return np.subtract(value, offset, out=output(value, offset, shared=shared))
         if kind == 'clipped':
-            return value | self.offset.clipped.flatten()
+            offset = self.offset.clipped.flatten()
+            return np.logical_or(value, offset, out=output(value, offset, shared=shared))
         if kind == 'deviation':
-            return np.sqrt(value**2 + self.offset.deviation.flatten()**2)
+            offset = self.offset.deviation.flatten()
+            return np.hypot(value, offset, out=output(value, offset, shared=shared))
 
     def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
         if not (datum.units == self.offset.units):
@@ -217,11 +482,27 @@ class OffsetFilter(CoreFilterABC):
         if not (datum.n_numbers == self.offset.n_numbers):
             raise DatumFilterError(f'{datum.units} is not valid!')
 
-        return Datum(
+        return Datum._create(
             units=datum.units,
-            intensity=self.kernel(datum.intensity, kind='intensity'),
-            clipped=self.kernel(datum.clipped, kind='clipped'),
-            deviation=self.kernel(datum.deviation, kind='deviation'),
+            intensity=self.kernel(datum.intensity, kind='intensity', shared=datum.shared),
+            clipped=self.kernel(datum.clipped, kind='clipped', shared=datum.shared),
+            deviation=self.kernel(datum.deviation, kind='deviation', shared=datum.shared),
+            number=datum._number,
+            shared=False,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        if not (batch.units == self.offset.units):
+            raise DatumFilterError(f'{batch.units} is not valid!')
+        if not (batch.n_numbers == self.offset.n_numbers):
+            raise DatumFilterError(f'{batch.units} is not valid!')
+
+        return Batch(
+            units=batch.units,
+            intensity=self.kernel(batch.intensity, kind='intensity'),
+            clipped=self.kernel(batch.clipped, kind='clipped'),
+            deviation=self.kernel(batch.deviation, kind='deviation'),
+            number=batch._number,
         )
 
     def __eq__(self, other: 'OffsetFilter') -> None:
@@ -246,13 +527,14 @@ class DeviationFilter(CoreFilterABC):
         self,
         offset: Data,  # `offset` is necessary to calculate a deviation correctly!
         units: Units,
+        binning: int = 1,  # количество усредненных отсчетов (см. `BinningFilter`)
     ):
         self._units = units
         self._noise = Noise(
             adc=DEFAULT_ADC,
             detector=DEFAULT_DETECTOR,
             units=self.units,
-            n_frames=1,
+            n_frames=binning,
         )
 
     @property
@@ -269,11 +551,24 @@ class DeviationFilter(CoreFilterABC):
     def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
         assert datum.units == self.units
 
-        return Datum(
+        return Datum._create(
             intensity=datum.intensity,
             units=datum.units,
             clipped=datum.clipped,
             deviation=self.kernel(datum.intensity),
+            number=datum._number,
+            shared=datum.shared,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        assert batch.units == self.units
+
+        return Batch(
+            units=batch.units,
+            intensity=batch.intensity,
+            clipped=batch.clipped,
+            deviation=self.kernel(batch.intensity),
+            number=batch._number,
         )
 
     def __eq__(self, other: 'DeviationFilter') -> None:
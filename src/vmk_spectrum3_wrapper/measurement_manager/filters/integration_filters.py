@@ -2,8 +2,9 @@ import pickle
 
 import numpy as np
 
-from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.data import Batch, Datum
 from vmk_spectrum3_wrapper.measurement_manager.filters.base_filter import FilterABC
+from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import DatumFilterError
 from vmk_spectrum3_wrapper.measurement_manager.filters.switch_filters import split_shots
 from vmk_spectrum3_wrapper.types import MilliSecond
 
@@ -23,7 +24,7 @@ class StandardIntegrationFilter(IntegrationFilterABC):
         return self._is_averaging
 
     def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
-        factor = datum.n_times if self.is_averaging else 0
+        factor = datum.n_times if self.is_averaging else 1
 
         intensity = np.sum(datum.intensity, axis=0)/factor
         clipped = np.max(datum.clipped, axis=0) if isinstance(datum.clipped, np.ndarray) else None
@@ -34,6 +35,22 @@ class StandardIntegrationFilter(IntegrationFilterABC):
             intensity=intensity,
             clipped=clipped,
             deviation=deviation,
+            number=datum._number,
+        )
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        factor = batch.n_times if self.is_averaging else 1
+
+        intensity = np.sum(batch.intensity, axis=1, keepdims=True)/factor
+        clipped = np.max(batch.clipped, axis=1, keepdims=True) if isinstance(batch.clipped, np.ndarray) else None
+        deviation = np.sqrt(np.sum(batch.deviation**2, axis=1, keepdims=True)/factor) if isinstance(batch.deviation, np.ndarray) else None
+
+        return Batch(
+            units=batch.units,
+            intensity=intensity,
+            clipped=clipped,
+            deviation=deviation,
+            number=batch._number,
         )
 
     def __eq__(self, other: 'StandardIntegrationFilter') -> None:
@@ -45,6 +62,133 @@ class StandardIntegrationFilter(IntegrationFilterABC):
         ])
 
 
+class MedianIntegrationFilter(IntegrationFilterABC):
+    """Интегральный по медиане фильтр (устойчивый к выбросам).
+
+    Медиана находится частичной сортировкой (`np.partition`) `intensity`:
+    необщий буфер (см. `Datum.shared`) сортируется на месте, общий - копируется.
+    Количество кадров, отклоняющихся от медианы более чем на `threshold` стандартных отклонений,
+    возвращается вместе с результатом (`Datum.rejected`; при наличии `deviation`).
+    """
+
+    def __init__(self, threshold: float = 5):
+        self._threshold = threshold
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
+        n_times = datum.n_times
+        value = datum.intensity.copy() if datum.shared else datum.intensity
+
+        # статистики, не зависящие от порядка кадров, рассчитываются до частичной сортировки
+        clipped = np.count_nonzero(datum.clipped, axis=0) >= n_times - n_times//2 if isinstance(datum.clipped, np.ndarray) else None
+        deviation = np.sqrt(np.sum(datum.deviation**2, axis=0)/n_times) if isinstance(datum.deviation, np.ndarray) else None
+
+        kth = [n_times//2] if n_times % 2 else [n_times//2 - 1, n_times//2]
+        value.partition(kth, axis=0)
+        intensity = np.mean(value[kth], axis=0)
+
+        rejected = None
+        if deviation is not None:
+            rejected = np.count_nonzero(value > intensity + self.threshold*deviation, axis=0) + np.count_nonzero(value < intensity - self.threshold*deviation, axis=0)
+            deviation = np.sqrt(np.pi/2) * deviation/np.sqrt(n_times)
+
+        return Datum(
+            units=datum.units,
+            intensity=intensity,
+            clipped=clipped,
+            deviation=deviation,
+            number=datum._number,
+            rejected=rejected,
+        )
+
+    def __eq__(self, other: 'MedianIntegrationFilter') -> None:
+        if not isinstance(other, self.__class__):
+            return False
+
+        return all([
+            self.threshold == other.threshold,
+        ])
+
+
+class SigmaClippedIntegrationFilter(IntegrationFilterABC):
+    """Интегральный по среднему с итеративным отбраковыванием выбросов фильтр.
+
+    Кадры, отклоняющиеся от среднего (на первой итерации - от медианы) более чем на `threshold` стандартных отклонений
+    (`deviation`, см. `DeviationFilter`), и зашкаленные кадры исключаются из среднего; отбраковывание повторяется до `n_iterations` раз.
+    Количество исключенных кадров возвращается вместе с результатом (`Datum.rejected`).
+    """
+
+    def __init__(self, threshold: float = 3, n_iterations: int = 5):
+        self._threshold = threshold
+        self._n_iterations = n_iterations
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @property
+    def n_iterations(self) -> int:
+        return self._n_iterations
+
+    def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
+        if not isinstance(datum.deviation, np.ndarray):
+            raise DatumFilterError(f'{self.__class__.__name__} requires a deviation! Use `DeviationFilter` before.')
+
+        value = datum.intensity
+        valid = np.ones(value.shape, dtype=bool) if datum.clipped is None else ~datum.clipped
+
+        # начальное приближение - медиана (рассчитывается в рабочем буфере `residual`)
+        residual = np.array(value, dtype=float)
+        kth = [datum.n_times//2] if datum.n_times % 2 else [datum.n_times//2 - 1, datum.n_times//2]
+        residual.partition(kth, axis=0)
+        mean = np.mean(residual[kth], axis=0)
+
+        mask, updated = valid.copy(), np.empty_like(valid)
+        for _ in range(self.n_iterations):
+            np.subtract(value, mean, out=residual)
+            np.abs(residual, out=residual)
+            np.divide(residual, datum.deviation, out=residual)
+
+            np.less_equal(residual, self.threshold, out=updated)
+            updated &= valid
+            if np.array_equal(updated, mask):
+                break
+            mask, updated = updated, mask
+
+            n_kept = np.count_nonzero(mask, axis=0)
+            mean = np.sum(value, axis=0, where=mask) / np.maximum(n_kept, 1)
+
+        n_kept = np.count_nonzero(mask, axis=0)
+        intensity = np.sum(value, axis=0, where=mask) / np.maximum(n_kept, 1)
+        deviation = np.sqrt(np.sum(np.square(datum.deviation, out=residual), axis=0, where=mask)) / np.maximum(n_kept, 1)
+
+        clipped = n_kept == 0  # все кадры зашкалены или отклонены: используется простое среднее
+        if np.any(clipped):
+            intensity[clipped] = np.mean(value[:, clipped], axis=0)
+            deviation[clipped] = np.sqrt(np.sum(residual[:, clipped], axis=0)) / datum.n_times
+
+        return Datum(
+            units=datum.units,
+            intensity=intensity,
+            clipped=clipped,
+            deviation=deviation,
+            number=datum._number,
+            rejected=datum.n_times - n_kept,
+        )
+
+    def __eq__(self, other: 'SigmaClippedIntegrationFilter') -> None:
+        if not isinstance(other, self.__class__):
+            return False
+
+        return all([
+            self.threshold == other.threshold,
+            self.n_iterations == other.n_iterations,
+        ])
+
+
 class HighDynamicRangeIntegrationFilter(IntegrationFilterABC):
     """Интегральный в расширенном динамическом диапазоне фильтр."""
 
@@ -56,6 +200,7 @@ class HighDynamicRangeIntegrationFilter(IntegrationFilterABC):
                 pickle.dump(datum, file)
 
         shots = split_shots(datum, capacity=(1, 1))
+        has_deviation = all(shot.deviation is not None for shot in shots)  # без `deviation` (без `bias`) кадры усредняются с равными весами
 
         intensity = np.zeros((datum.n_times, datum.n_numbers))
         deviation = np.zeros((datum.n_times, datum.n_numbers))
@@ -65,7 +210,7 @@ class HighDynamicRangeIntegrationFilter(IntegrationFilterABC):
             factor[i] = (max(exposure)/exposure[i])
 
             intensity[i] = shot.intensity * factor[i]
-            deviation[i] = shot.deviation * factor[i]
+            deviation[i] = shot.deviation * factor[i] if has_deviation else 1
             deviation[i, shot.clipped.flatten()] = np.infty
             weight[i] = (1 / deviation[i]) ** 2
 
@@ -74,12 +219,14 @@ class HighDynamicRangeIntegrationFilter(IntegrationFilterABC):
         clipped = np.min([shot.clipped for shot in shots], axis=0).flatten()
 
         if any(clipped):
-            intensity[clipped] = [shot.intensity * factor[i] for i, shot in shots][-1][clipped]
-            deviation[clipped] = [shot.deviation * factor[i] for i, shot in shots][-1][clipped]
+            intensity[clipped] = (shots[-1].intensity * factor[-1]).flatten()[clipped]
+            if has_deviation:
+                deviation[clipped] = (shots[-1].deviation * factor[-1]).flatten()[clipped]
 
         return Datum(
             units=datum.units,
             intensity=intensity,
             clipped=clipped,
-            deviation=deviation,
+            deviation=deviation if has_deviation else None,
+            number=datum._number,
         )
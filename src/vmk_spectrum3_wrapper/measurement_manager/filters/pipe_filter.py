@@ -1,32 +1,28 @@
 from collections.abc import Sequence
 import logging
+import time
 
-from vmk_spectrum3_wrapper.data import Datum
-from vmk_spectrum3_wrapper.measurement_manager.filters.base_filter import FilterABC
+from vmk_spectrum3_wrapper.data import Batch, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters.base_filter import CompositeFilterABC
+from vmk_spectrum3_wrapper.measurement_manager.filters.profiler import calculate_allocated
 from vmk_spectrum3_wrapper.measurement_manager.filters.typing import F
 
 
 LOGGER = logging.getLogger(__name__)
 
 
-class PipeFilter(FilterABC):
+class PipeFilter(CompositeFilterABC):
     """Конвейер фильтров."""
 
-    def __init__(self, filters: Sequence[F]):
-        self._filters = filters
-
     @property
     def filters(self) -> Sequence[F]:
         return self._filters
 
     def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
+        if self._stats is not None:
+            return self._profiled_call(datum, *args, **kwargs)
 
         for handler in self.filters:
-            # LOGGER.debug(
-            #     '%s is processing...',
-            #     handler.__class__.__name__,
-            # )
-
             try:
                 datum = handler(datum, *args, **kwargs)
 
@@ -36,10 +32,44 @@ class PipeFilter(FilterABC):
                     handler,
                     exc_info=error,
                 )
-                print(error)
 
         return datum
 
+    def _profiled_call(self, datum: Datum, *args, **kwargs) -> Datum:
+
+        for handler, stats in zip(self.filters, self._stats):
+            try:
+                started_at = time.perf_counter()
+                result = handler(datum, *args, **kwargs)
+                stats.update(time.perf_counter() - started_at, calculate_allocated(datum, result))
+
+                datum = result
+
+            except Exception as error:
+                LOGGER.error(
+                    'An error was happend while processing datum by filter %s',
+                    handler,
+                    exc_info=error,
+                )
+
+        return datum
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+
+        for handler in self.filters:
+            try:
+                batch = handler.batch(batch, *args, **kwargs)
+
+            except Exception as error:
+                LOGGER.error(
+                    'An error was happend while processing batch by filter %s',
+                    handler,
+                    exc_info=error,
+                )
+                raise
+
+        return batch
+
     def __eq__(self, other: 'PipeFilter') -> bool:
         if not isinstance(other, self.__class__):
             return False
@@ -1,11 +1,20 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
 from vmk_spectrum3_wrapper.data import Data
-from vmk_spectrum3_wrapper.measurement_manager.filters.core_filters import ClipFilter, DeviationFilter, OffsetFilter, ScaleFilter, ShuffleFilter
+from vmk_spectrum3_wrapper.measurement_manager.filters.core_filters import BinningFilter, ClipFilter, DeviationFilter, OffsetFilter, RegionFilter, ScaleFilter, ShuffleFilter
+from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import FilterError
 from vmk_spectrum3_wrapper.measurement_manager.filters.integration_filters import HighDynamicRangeIntegrationFilter, StandardIntegrationFilter
 from vmk_spectrum3_wrapper.measurement_manager.filters.pipe_filter import PipeFilter
 from vmk_spectrum3_wrapper.measurement_manager.filters.switch_filters import SwitchFilter
 from vmk_spectrum3_wrapper.shuffle import Shuffle
+from vmk_spectrum3_wrapper.types import Array, MilliSecond
 from vmk_spectrum3_wrapper.units import Units
 
+if TYPE_CHECKING:
+    from vmk_spectrum3_wrapper.calibration import CalibrationStore
+
 
 class CorePreset(PipeFilter):
 
@@ -15,15 +24,32 @@ class CorePreset(PipeFilter):
         units: Units | None = None,
         bias: Data | None = None,
         dark: Data | None = None,
+        binning: int | None = None,
+        region: Array[int] | None = None,
     ):
         units = units or Units.percent
 
+        region_filter = RegionFilter(region)
+        if region_filter is not None:  # `offset` выбираются однократно при создании конвейера
+            bias = None if bias is None else region_filter.crop(bias)
+            dark = None if dark is None else region_filter.crop(dark)
+
+        binning_filter = BinningFilter(binning)
+        if region_filter is not None and binning_filter is not None:  # бины не должны объединять отсчеты соседних окон
+            if np.any(region_filter.lengths % binning_filter.factor):
+                raise FilterError(f'Region windows {region_filter.lengths.tolist()} could not be binned by {binning_filter.factor}!')
+        if binning_filter is not None:  # `offset` объединяются однократно при создании конвейера
+            bias = None if bias is None else binning_filter.bin_data(bias)
+            dark = None if dark is None else binning_filter.bin_data(dark)
+
         filters = [
             ShuffleFilter(shuffle),
+            region_filter,
             ClipFilter(),
+            binning_filter,
             ScaleFilter(units=units),
             OffsetFilter(offset=bias),
-            DeviationFilter(offset=bias, units=units),
+            DeviationFilter(offset=bias, units=units, binning=binning or 1),
             OffsetFilter(offset=dark),
         ]
 
@@ -41,12 +67,30 @@ class StandardIntegrationPreset(PipeFilter):
         bias: Data | None = None,
         dark: Data | None = None,
         is_averaging: bool = True,
+        binning: int | None = None,
+        region: Array[int] | None = None,
     ):
         super().__init__(filters=[
-            CorePreset(shuffle=shuffle, units=units, bias=bias, dark=dark),
+            CorePreset(shuffle=shuffle, units=units, bias=bias, dark=dark, binning=binning, region=region),
             StandardIntegrationFilter(is_averaging=is_averaging),
         ])
 
+    @classmethod
+    def from_store(
+        cls,
+        store: 'CalibrationStore',
+        exposure: MilliSecond,
+        capacity: int,
+        units: Units | None = None,
+        *,
+        assembly_ids: tuple[str, ...],
+        **kwargs,
+    ) -> 'StandardIntegrationPreset':
+        """Создать конвейер с действительными `bias` и `dark` из хранилища калибровок `store` (без повторного измерения)."""
+        bias, dark = find_calibrations(store, exposure=exposure, capacity=capacity, units=units, assembly_ids=assembly_ids)
+
+        return cls(units=units, bias=bias, dark=dark, **kwargs)
+
 
 class HighDynamicRangeIntegrationPreset(PipeFilter):
 
@@ -56,11 +100,48 @@ class HighDynamicRangeIntegrationPreset(PipeFilter):
         units: Units | None = None,
         bias: Data | None = None,
         dark: Data | None = None,
+        binning: int | None = None,
+        region: Array[int] | None = None,
     ):
         super().__init__(filters=[
             SwitchFilter([
-                StandardIntegrationPreset(shuffle=shuffle, units=units, bias=bias, dark=dark[0, :]),
-                StandardIntegrationPreset(shuffle=shuffle, units=units, bias=bias, dark=dark[1, :]),
+                StandardIntegrationPreset(shuffle=shuffle, units=units, bias=bias, dark=None if dark is None else dark[0, :], binning=binning, region=region),
+                StandardIntegrationPreset(shuffle=shuffle, units=units, bias=bias, dark=None if dark is None else dark[1, :], binning=binning, region=region),
             ]),
             HighDynamicRangeIntegrationFilter(),
         ])
+
+    @classmethod
+    def from_store(
+        cls,
+        store: 'CalibrationStore',
+        exposure: tuple[MilliSecond, MilliSecond],
+        capacity: tuple[int, int],
+        units: Units | None = None,
+        *,
+        assembly_ids: tuple[str, ...],
+        **kwargs,
+    ) -> 'HighDynamicRangeIntegrationPreset':
+        """Создать конвейер с действительными `bias` и `dark` из хранилища калибровок `store` (без повторного измерения)."""
+        bias, dark = find_calibrations(store, exposure=exposure, capacity=capacity, units=units, assembly_ids=assembly_ids)
+
+        return cls(units=units, bias=bias, dark=dark, **kwargs)
+
+
+def find_calibrations(
+    store: 'CalibrationStore',
+    exposure: MilliSecond | tuple[MilliSecond, MilliSecond],
+    capacity: int | tuple[int, int],
+    units: Units | None = None,
+    *,
+    assembly_ids: tuple[str, ...],
+) -> tuple[Data | None, Data | None]:
+    """Найти действительные `bias` и `dark` (измеренный за вычетом найденного `bias`) в хранилище калибровок `store`.
+
+    Идентификаторы сборок `assembly_ids` задаются так же, как при калибровке (см. `calibration.get_assembly_ids`).
+    """
+
+    bias = store.find('bias', units=units, assembly_ids=assembly_ids)
+    dark = store.find('dark', exposure=exposure, capacity=capacity, units=units, assembly_ids=assembly_ids, bias=bias)
+
+    return bias, dark
@@ -0,0 +1,100 @@
+import time
+from typing import TYPE_CHECKING, Any, Mapping
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.types import Second
+
+if TYPE_CHECKING:
+    from vmk_spectrum3_wrapper.tracer import Tracer
+
+
+class FilterStats:
+    """Статистика вызовов фильтра.
+
+    Длительности последних `maxsize` вызовов хранятся в заранее выделенном кольцевом буфере (для расчета перцентилей); при наличии `tracer` каждый вызов записывается интервалом трассировки.
+    """
+
+    __slots__ = ('name', 'n_calls', 'total', 'n_bytes', 'tracer', '_durations')
+
+    def __init__(self, name: str, maxsize: int = 10_000, tracer: 'Tracer | None' = None):
+        self.name = name
+        self.n_calls = 0
+        self.total = 0.
+        self.n_bytes = 0
+        self.tracer = tracer
+
+        self._durations = np.zeros(maxsize)
+
+    def update(self, duration: Second, n_bytes: int) -> None:
+        self._durations[self.n_calls % len(self._durations)] = duration
+        self.n_calls += 1
+        self.total += duration
+        self.n_bytes += n_bytes
+
+        if self.tracer is not None:
+            finished_at = time.perf_counter()
+            self.tracer.add(self.name, finished_at - duration, finished_at, category='filter')
+
+    def dumps(self) -> Mapping[str, Any]:
+        durations = self._durations[:min(self.n_calls, len(self._durations))]
+        p50, p90, p99 = np.percentile(durations, [50, 90, 99]) if self.n_calls else (np.nan, np.nan, np.nan)
+
+        return {
+            'n_calls': self.n_calls,
+            'total': self.total,
+            'mean': self.total / self.n_calls if self.n_calls else np.nan,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99,
+            'max': np.max(durations) if self.n_calls else np.nan,
+            'n_bytes': self.n_bytes,
+        }
+
+
+class FilterProfiler:
+    """Профилировщик дерева фильтров (время и объем выделенной памяти каждого фильтра; вызовы фильтров записываются в `tracer`)."""
+
+    def __init__(self, maxsize: int = 10_000, tracer: 'Tracer | None' = None):
+        self._maxsize = maxsize
+        self._tracer = tracer
+        self._stats = {}
+
+    def get(self, name: str) -> FilterStats:
+        """Получить (создать) статистику фильтра с именем `name`."""
+
+        if name not in self._stats:
+            self._stats[name] = FilterStats(name, maxsize=self._maxsize, tracer=self._tracer)
+        return self._stats[name]
+
+    def report(self) -> Mapping[str, Mapping[str, Any]]:
+        """Отчет по всем фильтрам (в порядке их первого вызова); длительности в секундах, объем в байтах."""
+
+        return {
+            name: stats.dumps()
+            for name, stats in self._stats.items()
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({len(self._stats)} filters)'
+
+
+def calculate_allocated(before: Datum, after: Datum) -> int:
+    """Объем памяти, выделенной фильтром (массивы `after`, не совпадающие с массивами `before`)."""
+    reused = {
+        id(value)
+        for value in (before.intensity, before.clipped, before.deviation)
+        if value is not None
+    }
+
+    return sum(
+        value.nbytes
+        for value in (after.intensity, after.clipped, after.deviation)
+        if value is not None and id(value) not in reused and id(value.base) not in reused
+    )
@@ -1,18 +1,21 @@
 from collections.abc import Sequence
+import logging
+import time
 
 import numpy as np
 
 from vmk_spectrum3_wrapper.config import LOGGING_LEVEL
-from vmk_spectrum3_wrapper.data import Datum
-from vmk_spectrum3_wrapper.measurement_manager.filters.base_filter import FilterABC
+from vmk_spectrum3_wrapper.data import Batch, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters.base_filter import CompositeFilterABC
 from vmk_spectrum3_wrapper.measurement_manager.filters.pipe_filter import PipeFilter
+from vmk_spectrum3_wrapper.measurement_manager.filters.profiler import calculate_allocated
 
 
-class SwitchFilter(FilterABC):
-    """Фильтр, разделяющий конвееры обработки данных на несколько (два)."""
+LOGGER = logging.getLogger(__name__)
+
 
-    def __init__(self, filters: Sequence[PipeFilter]):
-        self._filters = filters
+class SwitchFilter(CompositeFilterABC):
+    """Фильтр, разделяющий конвееры обработки данных на несколько (два)."""
 
     @property
     def filters(self) -> Sequence[PipeFilter]:
@@ -32,31 +35,71 @@ class SwitchFilter(FilterABC):
                 print(type(handler), handler)
 
             try:
-                shots[i] = handler(shots[i])
+                if self._stats is None:
+                    shots[i] = handler(shots[i])
+                else:
+                    started_at = time.perf_counter()
+                    shot = handler(shots[i])
+                    self._stats[i].update(time.perf_counter() - started_at, calculate_allocated(shots[i], shot))
+
+                    shots[i] = shot
 
             except Exception as error:
                 print(error)
 
         return merge_shots(shots)
 
+    def batch(
+        self,
+        batch: Batch,
+        *args,
+        capacity: tuple[int, int],
+        **kwargs,
+    ) -> Batch:
+        shots = split_batch(batch, capacity)
+
+        for i, handler in enumerate(self.filters):
+            try:
+                shots[i] = handler.batch(shots[i])
+
+            except Exception as error:
+                LOGGER.error(
+                    'An error was happend while processing batch by filter %s',
+                    handler,
+                    exc_info=error,
+                )
+                raise
+
+        return merge_batch(shots)
+
 
 def split_shots(
     datum: Datum,
     capacity: tuple[int, int],
 ) -> list[Datum]:
-    """Разделить `datum` по `capacity` на несколько (два)."""
+    """Разделить `datum` по `capacity` на несколько (два).
 
-    def inner(capacity: tuple[int, int]) -> slice:
-        t0 = 0
+    Части - представления (без копирования) непересекающихся кадров `datum`, поэтому наследуют его `shared`.
+    """
+    bounds = np.cumsum([0, *capacity])
 
-        for dt in capacity:
-            yield slice(t0, t0+dt)
+    def inner(value, index):
+        if value is None:
+            return None
 
-            t0 += dt
+        return value[index]
 
     return [
-        datum[index, :]
-        for index in inner(capacity)
+        Datum._create(
+            units=datum.units,
+            intensity=inner(datum.intensity, slice(t0, t1)),
+            clipped=inner(datum.clipped, slice(t0, t1)),
+            deviation=inner(datum.deviation, slice(t0, t1)),
+            number=datum._number,
+            shared=datum.shared,
+            rejected=inner(datum.rejected, slice(t0, t1)),
+        )
+        for t0, t1 in zip(bounds[:-1], bounds[1:])
     ]
 
 
@@ -83,4 +126,53 @@ def merge_shots(
         intensity=inner([shot.intensity for shot in shots]),
         clipped=inner([shot.clipped for shot in shots]),
         deviation=inner([shot.deviation for shot in shots]),
+        number=shots[0]._number,
+        rejected=None if any(shot.rejected is None for shot in shots) else np.concatenate([shot.rejected for shot in shots], axis=0),
+    )
+
+
+def split_batch(
+    batch: Batch,
+    capacity: tuple[int, int],
+) -> list[Batch]:
+    """Разделить `batch` по `capacity` вдоль времени на несколько (два)."""
+    bounds = np.cumsum([0, *capacity])
+
+    def inner(value, index):
+        if value is None:
+            return None
+
+        return value[:, index, :]
+
+    return [
+        Batch(
+            units=batch.units,
+            intensity=inner(batch.intensity, slice(t0, t1)),
+            clipped=inner(batch.clipped, slice(t0, t1)),
+            deviation=inner(batch.deviation, slice(t0, t1)),
+            number=batch._number,
+            rejected=inner(batch.rejected, slice(t0, t1)),
+        )
+        for t0, t1 in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def merge_batch(
+    shots: Sequence[Batch],
+) -> Batch:
+    """Слить несколько `shots` в один `batch` вдоль времени."""
+
+    def inner(values):
+        if values[0] is None:
+            return None
+
+        return np.concatenate(values, axis=1)
+
+    return Batch(
+        units=shots[0].units,
+        intensity=inner([shot.intensity for shot in shots]),
+        clipped=inner([shot.clipped for shot in shots]),
+        deviation=inner([shot.deviation for shot in shots]),
+        number=shots[0]._number,
+        rejected=None if any(shot.rejected is None for shot in shots) else inner([shot.rejected for shot in shots]),
     )
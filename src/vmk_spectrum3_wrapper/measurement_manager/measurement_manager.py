@@ -3,21 +3,23 @@ from typing import Iterator, overload
 
 import pyspectrum3 as ps3
 
+from vmk_spectrum3_wrapper.config import DEFAULT_SHUFFLE
 from vmk_spectrum3_wrapper.data import Data
 from vmk_spectrum3_wrapper.exception import WrapperSetupError
 from vmk_spectrum3_wrapper.measurement_manager.exceptions import SchemaError
 from vmk_spectrum3_wrapper.measurement_manager.filters import F, HighDynamicRangeIntegrationPreset, PipeFilter, StandardIntegrationPreset
 from vmk_spectrum3_wrapper.measurement_manager.schemas import ExtendedSchema, Schema, StandardSchema, schema_factory
 from vmk_spectrum3_wrapper.measurement_manager.storage import Storage
+from vmk_spectrum3_wrapper.tracer import Tracer
 from vmk_spectrum3_wrapper.types import Array, MilliSecond
 
 
 def default_filter_factory(schema: Schema) -> PipeFilter:
 
     if isinstance(schema, StandardSchema):
-        return StandardIntegrationPreset()
+        return StandardIntegrationPreset(shuffle=DEFAULT_SHUFFLE)
     if isinstance(schema, ExtendedSchema):
-        return HighDynamicRangeIntegrationPreset()
+        return HighDynamicRangeIntegrationPreset(shuffle=DEFAULT_SHUFFLE)
 
     raise SchemaError(f'Schema is not supported: {schema}')
 
@@ -28,6 +30,8 @@ def measurement_manager_factory(
     exposure: MilliSecond,
     capacity: int,
     filter: F | None = None,
+    profile: bool = False,
+    tracer: Tracer | None = None,
 ) -> 'MeasurementManager': ...
 @overload
 def measurement_manager_factory(
@@ -35,8 +39,10 @@ def measurement_manager_factory(
     exposure: tuple[MilliSecond, MilliSecond],
     capacity: tuple[int, int],
     filter: F | None = None,
+    profile: bool = False,
+    tracer: Tracer | None = None,
 ) -> 'MeasurementManager': ...
-def measurement_manager_factory(n_times, exposure, capacity, filter):
+def measurement_manager_factory(n_times, exposure, capacity, filter, profile=False, tracer=None):
 
     try:
         schema = schema_factory(exposure, capacity)
@@ -51,7 +57,7 @@ def measurement_manager_factory(n_times, exposure, capacity, filter):
     return MeasurementManager(
         n_times=n_times,
         schema=schema,
-        storage=Storage(exposure, capacity, filter),
+        storage=Storage(exposure, capacity, filter, profile=profile, tracer=tracer),
     )
 
 
@@ -111,7 +117,7 @@ class MeasurementManager:
 
     def put(self, frame: Array[int]) -> None:
         """Добавить новый `frame` в `storage`."""
-        time_at = time.perf_counter()
+        time_at = time.time()
 
         if self._started_at is None:
             self._started_at = time_at
@@ -1,21 +1,37 @@
+import logging
+import queue
+import threading
 import time
 from collections.abc import Sequence
+from typing import Any, Callable, Mapping
 
 import numpy as np
 
 from vmk_spectrum3_wrapper.data import Datum
-from vmk_spectrum3_wrapper.measurement_manager.filters import PipeFilter, StandardIntegrationPreset
+from vmk_spectrum3_wrapper.measurement_manager.filters import FilterProfiler, PipeFilter, StandardIntegrationPreset
+from vmk_spectrum3_wrapper.tracer import Tracer
 from vmk_spectrum3_wrapper.types import Array, MilliSecond, Second
 from vmk_spectrum3_wrapper.units import Units
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 class Storage:
+    """Хранилище кадров и обработанных `data` измерения.
+
+    Заполненный буфер кадров обрабатывается фильтром синхронно (в потоке драйвера) или,
+    в отложенном режиме (`deferred`, см. `defer`), в рабочем потоке хранилища; `len` хранилища учитывает только обработанные `data`.
+    """
 
     def __init__(
         self,
         exposure: MilliSecond | tuple[MilliSecond, MilliSecond],
         capacity: int | tuple[int, int],
         filter: PipeFilter | None = None,
+        profile: bool = False,
+        tracer: Tracer | None = None,
+        deferred: bool = False,
     ):
         if not isinstance(filter, PipeFilter):
             if filter is not None:
@@ -24,11 +40,21 @@ class Storage:
         self._exposure = exposure
         self._capacity = capacity
         self._filter = filter or StandardIntegrationPreset()
+        self._tracer = tracer
+        self._profiler = FilterProfiler(tracer=tracer) if (profile or tracer is not None) else None  # вызовы фильтров трассируются профилировщиком
+        self._filter.profile(self._profiler)
 
         self._started_at = None  # время окончания измерения первого кадра
         self._finished_at = None  # время окончания измерения последнего кадра
         self._data = []
         self._buffer = []
+        self._subscribers = []
+
+        self._deferred = False
+        self._queue = queue.Queue()
+        self._thread = None
+        if deferred:
+            self.defer()
 
     @property
     def exposure(self) -> MilliSecond | tuple[MilliSecond, MilliSecond]:
@@ -44,14 +70,30 @@ class Storage:
     def filter(self) -> PipeFilter:
         return self._filter
 
+    @property
+    def profiler(self) -> FilterProfiler | None:
+        return self._profiler
+
+    @property
+    def tracer(self) -> Tracer | None:
+        return self._tracer
+
+    @property
+    def filter_report(self) -> Mapping[str, Mapping[str, Any]] | None:
+        """Отчет профилирования фильтров (если профилирование включено)."""
+        if self._profiler is None:
+            return None
+
+        return self._profiler.report()
+
     @property
     def started_at(self) -> float:
-        """"Время окончания первого измерения."""
+        """"Время окончания первого измерения (`time.time`)."""
         return self._started_at
 
     @property
     def finished_at(self) -> float:
-        """"Время окончания последнего измерения."""
+        """"Время окончания последнего измерения (`time.time`)."""
         return self._finished_at
 
     @property
@@ -69,6 +111,16 @@ class Storage:
     def data(self) -> list[Datum]:
         return self._data
 
+    @property
+    def deferred(self) -> bool:
+        """Обрабатываются ли буферы в рабочем потоке хранилища."""
+        return self._deferred
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество буферов, ожидающих обработки в рабочем потоке."""
+        return self._queue.unfinished_tasks
+
     @property
     def duration(self) -> Second:
         """Время измерения (от окончания измерения первого до окончания измерения последнего кадра!)."""
@@ -77,8 +129,47 @@ class Storage:
 
         return self._finished_at - self._started_at
 
+    def subscribe(self, callback: Callable[[Datum], None]) -> None:
+        """Подписать `callback` на обработанные `datum`.
+
+        Подписчики вызываются в потоке драйвера, поэтому не должны блокировать (см. `viewer.LiveViewer`).
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Datum], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def defer(self) -> None:
+        """Перейти к отложенной обработке буферов в рабочем потоке (может вызываться во время измерения)."""
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._work,
+                name=f'{self.__class__.__name__}.worker',
+                daemon=True,
+            )
+            self._thread.start()
+        self._deferred = True
+
+    def join(self) -> None:
+        """Дождаться обработки буферов, ожидающих обработки в рабочем потоке."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Дождаться обработки буферов и остановить рабочий поток."""
+
+        if self._thread is None:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._deferred = False
+
     def pull(self, clear: bool = True) -> tuple[list[Datum], float, float]:
         """Pull data from storage."""
+        self.join()
 
         try:
             return (
@@ -95,7 +186,7 @@ class Storage:
 
     def put(self, frame: Array[int]) -> None:
         """Добавить новый кадр `frame` в буфер."""
-        time_at = time.perf_counter()
+        time_at = time.time()  # время `meta` - по системным часам (сравнимо между процессами и с временем записи кадров)
 
         if self._started_at is None:
             self._started_at = time_at
@@ -106,15 +197,58 @@ class Storage:
         if len(self.buffer) == self.buffer_size:  # если буфер заполнен, то ранные обрабатываются `handler`, передаются в `data` и буфер очищается
             buffer = np.array(self.buffer)
 
-            datum = Datum(
-                units=Units.digit,
-                intensity=buffer,
-            )
-            datum = self.filter(datum, exposure=self.exposure, capacity=self.capacity)
-            self.data.append(datum)
+            if self._deferred:
+                self._queue.put(buffer)
+            else:
+                self._flush(buffer)
 
             self.buffer.clear()
 
+    def _flush(self, buffer: Array[int]) -> None:
+        flushed_at = time.perf_counter()
+
+        datum = Datum(
+            units=Units.digit,
+            intensity=buffer,
+            shared=False,  # буфер не используется после обработки
+        )
+        datum = self.filter(datum, exposure=self.exposure, capacity=self.capacity)
+        self.data.append(datum)
+        self._notify(datum)
+
+        if self._tracer is not None:
+            self._tracer.add('Storage.flush', flushed_at, time.perf_counter(), category='storage')
+
+    def _work(self) -> None:
+
+        while True:
+            buffer = self._queue.get()
+            try:
+                if buffer is None:
+                    break
+                self._flush(buffer)
+
+            except Exception as error:
+                LOGGER.error(
+                    'An error was happend while processing buffer in worker thread',
+                    exc_info=error,
+                )
+            finally:
+                self._queue.task_done()
+
+    def _notify(self, datum: Datum) -> None:
+
+        for callback in self._subscribers:
+            try:
+                callback(datum)
+
+            except Exception as error:
+                LOGGER.error(
+                    'An error was happend while notifying subscriber %s',
+                    callback,
+                    exc_info=error,
+                )
+
     def __bool__(self) -> bool:
         return True
 
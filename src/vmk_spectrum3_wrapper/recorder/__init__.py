@@ -0,0 +1,2 @@
+from .recorder import RawFrameRecorder
+from .recording import Recording, record_dtype
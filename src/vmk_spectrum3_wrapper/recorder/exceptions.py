@@ -0,0 +1,7 @@
+
+class RecorderError(Exception):
+    pass
+
+
+class RecordingError(Exception):
+    pass
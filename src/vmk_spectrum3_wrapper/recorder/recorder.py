@@ -0,0 +1,216 @@
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.codec import BlockWriter, Codec
+from vmk_spectrum3_wrapper.recorder.exceptions import RecorderError
+from vmk_spectrum3_wrapper.recorder.recording import ASSEMBLY_ID_SIZE, record_dtype
+from vmk_spectrum3_wrapper.types import Array, Digit, Path, Second
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RawFrameRecorder:
+    """Регистратор сырых кадров.
+
+    Кадры записываются в заранее выделенный memory-mapped `.npy` файл фоновым потоком; вызов `put` только помещает кадр в очередь и никогда не блокирует callback драйвера.
+    Кадры, поставленные в очередь закрытого регистратора, кадры с недопустимым идентификатором сборки и кадры, запись которых завершилась ошибкой, отбрасываются (и учитываются в `n_dropped`).
+    Параметры:
+        `filepath` - путь к файлу записи;
+        `n_numbers` - количество отсчетов кадра;
+        `capacity` - максимальное количество кадров в записи;
+        `queue_size` - максимальная глубина очереди записи (при переполнении кадры отбрасываются);
+        `flush_interval` - период сброса записанных кадров на диск;
+        `codec` - кодек сжатия (кадры записываются сжатыми блоками в файл сжатых блоков, см. `codec.BlockWriter`).
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        n_numbers: int,
+        capacity: int,
+        dtype: np.dtype | None = None,
+        queue_size: int = 10_000,
+        flush_interval: Second = 1,
+        codec: Codec | None = None,
+    ):
+        self._filepath = filepath
+        self._dtype = record_dtype(n_numbers, dtype=dtype)
+        self._capacity = capacity
+        self._queue_size = queue_size
+        self._flush_interval = flush_interval
+        self._codec = codec
+
+        self._records = None
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()  # состояние регистратора и счетчик отброшенных кадров изменяются разными потоками
+        self._is_open = False
+        self._n_written = 0
+        self._n_dropped = 0
+
+    @property
+    def filepath(self) -> Path:
+        return self._filepath
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def n_written(self) -> int:
+        """Количество записанных кадров."""
+        return self._n_written
+
+    @property
+    def n_dropped(self) -> int:
+        """Количество отброшенных кадров (переполнение очереди или файла записи, закрытый регистратор, ошибки записи)."""
+        return self._n_dropped
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество кадров, ожидающих записи."""
+        return self._queue.qsize()
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+    def open(self) -> 'RawFrameRecorder':
+        """Выделить файл записи и запустить поток записи."""
+
+        if self._thread is not None:
+            raise RecorderError(f'Recorder {self.filepath} is opened before!')
+
+        if self._codec is None:
+            self._records = np.lib.format.open_memmap(
+                self.filepath,
+                mode='w+',
+                dtype=self._dtype,
+                shape=(self.capacity, ),
+            )
+        else:
+            self._records = BlockWriter(self.filepath, dtype=self._dtype, codec=self._codec)
+        self._n_written = 0
+
+        self._thread = threading.Thread(
+            target=self._write,
+            name=f'{self.__class__.__name__}({self.filepath})',
+            daemon=True,
+        )
+        self._thread.start()
+
+        with self._lock:
+            self._n_dropped = 0
+            self._is_open = True
+
+        return self
+
+    def close(self) -> None:
+        """Дописать кадры из очереди, сбросить файл записи на диск и остановить поток записи."""
+
+        if self._thread is None:
+            return
+
+        with self._lock:  # после маркера окончания записи кадры в очередь не ставятся
+            self._is_open = False
+            self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        if self._codec is None:
+            self._records.flush()
+        else:
+            self._records.close()
+        self._records = None
+
+        if self.n_dropped:
+            LOGGER.warning(
+                'Recorder %s is closed: %d frames are dropped!',
+                self.filepath,
+                self.n_dropped,
+            )
+
+    def put(self, frame: Array[Digit], frame_number: int, assembly_id: str) -> bool:
+        """Поставить кадр `frame` в очередь записи (не блокирует); возвращает `False`, если кадр отброшен."""
+
+        try:
+            assembly_id = assembly_id.encode()
+        except UnicodeEncodeError:
+            assembly_id = None
+        if assembly_id is None or len(assembly_id) > ASSEMBLY_ID_SIZE:
+            LOGGER.error(
+                'Assembly id is not valid (%d bytes at most): frame %d is dropped!',
+                ASSEMBLY_ID_SIZE,
+                frame_number,
+            )
+            with self._lock:
+                self._n_dropped += 1
+            return False
+
+        with self._lock:
+            if not self._is_open or self._queue.qsize() >= self._queue_size:
+                self._n_dropped += 1
+                return False
+
+            self._queue.put((frame, frame_number, assembly_id, time.time()))
+            return True
+
+    def _write(self) -> None:
+        flushed_at = time.perf_counter()
+        record = np.zeros((), dtype=self._dtype)
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            if self._n_written == self.capacity:
+                with self._lock:
+                    self._n_dropped += 1
+                continue
+
+            frame, frame_number, assembly_id, timestamp = item
+
+            try:
+                if self._codec is None:
+                    n = self._n_written
+                    self._records['frame'][n] = frame
+                    self._records['frame_number'][n] = frame_number
+                    self._records['assembly_id'][n] = assembly_id
+                    self._records['timestamp'][n] = timestamp  # время получения записывается последним, так как отмечает кадр записанным
+                else:
+                    record['frame'] = frame
+                    record['frame_number'] = frame_number
+                    record['assembly_id'] = assembly_id
+                    record['timestamp'] = timestamp
+                    self._records.write(record)
+            except Exception as error:  # поток записи не останавливается из-за ошибки записи одного кадра
+                LOGGER.error(
+                    'An error was happend while writing frame %d!',
+                    frame_number,
+                    exc_info=error,
+                )
+                with self._lock:
+                    self._n_dropped += 1
+                continue
+            self._n_written += 1
+
+            if time.perf_counter() - flushed_at > self._flush_interval:
+                self._records.flush()
+                flushed_at = time.perf_counter()
+
+    def __enter__(self) -> 'RawFrameRecorder':
+        return self.open()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.filepath}, {self.n_written}/{self.capacity})'
@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.codec import MAGIC, BlockReader
+from vmk_spectrum3_wrapper.config import DEFAULT_ADC
+from vmk_spectrum3_wrapper.recorder.exceptions import RecordingError
+from vmk_spectrum3_wrapper.types import Array, Digit, Path
+
+
+ASSEMBLY_ID_SIZE = 32
+
+
+def frame_dtype() -> np.dtype:
+    """Тип отсчетов кадра, достаточный для разрядности `DEFAULT_ADC`."""
+
+    if DEFAULT_ADC.config.resolution <= 16:
+        return np.dtype('<u2')
+    return np.dtype('<u4')
+
+
+def record_dtype(n_numbers: int, dtype: np.dtype | None = None) -> np.dtype:
+    """Тип записи кадра: номер кадра, идентификатор сборки, время получения и отсчеты кадра."""
+    dtype = np.dtype(dtype or frame_dtype())
+
+    return np.dtype([
+        ('frame_number', '<u8'),
+        ('assembly_id', f'S{ASSEMBLY_ID_SIZE}'),
+        ('timestamp', '<f8'),
+        ('frame', dtype, (n_numbers, )),
+    ], align=True)
+
+
+class Recording:
+    """Запись сырых кадров, открытая только для чтения (memory-mapped).
+
+    Файл записи является `.npy` файлом со структурированным типом `record_dtype` и может быть открыт напрямую: `np.load(filepath, mmap_mode='r')`.
+    Сжатая запись (файл сжатых блоков) читается `BlockReader`: распаковываются только блоки выбранных кадров.
+    """
+
+    def __init__(self, filepath: Path):
+        if not os.path.exists(filepath):
+            raise RecordingError(f'Recording {filepath} is not found!')
+
+        with open(filepath, 'br') as file:
+            is_compressed = file.read(len(MAGIC)) == MAGIC
+
+        records = BlockReader(filepath) if is_compressed else np.load(filepath, mmap_mode='r')
+        if records.dtype.names is None or 'frame' not in records.dtype.names:
+            raise RecordingError(f'File {filepath} is not a raw frames recording!')
+
+        self._filepath = filepath
+        self._records = records if is_compressed else records[:count_records(records)]
+
+    @property
+    def filepath(self) -> Path:
+        return self._filepath
+
+    @property
+    def records(self) -> Array:
+        return self._records
+
+    @property
+    def frames(self) -> Array[Digit]:
+        return self._records['frame']
+
+    @property
+    def frame_number(self) -> Array[int]:
+        return self._records['frame_number']
+
+    @property
+    def assembly_id(self) -> Array[str]:
+        return self._records['assembly_id']
+
+    @property
+    def timestamp(self) -> Array[float]:
+        return self._records['timestamp']
+
+    @property
+    def n_numbers(self) -> int:
+        return self._records.dtype['frame'].shape[0]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.filepath}, {len(self)}x{self.n_numbers})'
+
+
+def count_records(__records: Array) -> int:
+    """Количество записанных кадров.
+
+    Записанные кадры образуют непрерывное начало файла (время получения незаписанных кадров равно нулю), поэтому граница находится бинарным поиском без чтения всего файла.
+    """
+    lo, hi = 0, len(__records)
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+
+        if __records[mid]['timestamp'] > 0:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
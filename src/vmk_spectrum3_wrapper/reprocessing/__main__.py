@@ -0,0 +1,76 @@
+import argparse
+import pickle
+import time
+
+from vmk_spectrum3_wrapper.data import Data
+from vmk_spectrum3_wrapper.measurement_manager.filters import HighDynamicRangeIntegrationPreset, PipeFilter, StandardIntegrationPreset
+from vmk_spectrum3_wrapper.reprocessing.engine import Reprocessor
+from vmk_spectrum3_wrapper.units import Units
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='vmk-reprocess',
+        description='Reprocess recorded raw frames by a filter pipeline.',
+    )
+    parser.add_argument('recording', help='path to a raw frames recording')
+    parser.add_argument('--exposure', type=float, nargs='+', required=True, help='exposure of the schema, ms (two values for extended schema)')
+    parser.add_argument('--capacity', type=int, nargs='+', required=True, help='capacity of the schema (two values for extended schema)')
+    parser.add_argument('--output', required=True, help='path to an output data file')
+    parser.add_argument('--filter', default=None, help='path to a pickled filter pipeline (overrides `--units`, `--bias` and `--dark`)')
+    parser.add_argument('--units', default=Units.percent.name, choices=[units.name for units in Units], help='output units')
+    parser.add_argument('--bias', default=None, help='path to a bias data file')
+    parser.add_argument('--dark', default=None, help='path to a dark data file')
+    parser.add_argument('--assembly-id', default=None, help='process frames of the assembly only')
+    parser.add_argument('--chunk-size', type=int, default=100, help='number of schemas in a chunk')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+
+    return parser.parse_args(args)
+
+
+def load_filter(args: argparse.Namespace) -> PipeFilter:
+
+    if args.filter:
+        with open(args.filter, 'br') as file:
+            return pickle.load(file)
+
+    units = Units[args.units]
+    bias = Data.load(args.bias) if args.bias else None
+    dark = Data.load(args.dark) if args.dark else None
+
+    if len(args.exposure) == 1:
+        return StandardIntegrationPreset(units=units, bias=bias, dark=dark)
+    return HighDynamicRangeIntegrationPreset(units=units, bias=bias, dark=dark)
+
+
+def main(args: list[str] | None = None) -> None:
+    args = parse_args(args)
+
+    reprocessor = Reprocessor(
+        filepath=args.recording,
+        exposure=args.exposure[0] if len(args.exposure) == 1 else tuple(args.exposure),
+        capacity=args.capacity[0] if len(args.capacity) == 1 else tuple(args.capacity),
+        filter=load_filter(args),
+        chunk_size=args.chunk_size,
+        n_workers=args.workers,
+        assembly_id=args.assembly_id,
+    )
+
+    from tqdm import tqdm  # не импортируется процессами обработки, повторно импортирующими главный модуль
+
+    started_at = time.perf_counter()
+    with tqdm(total=reprocessor.n_schemas*reprocessor.schema.capacity_total, unit='frame', unit_scale=True) as progress:
+        reprocessor.run(callback=progress.update, output=args.output)
+    seconds = time.perf_counter() - started_at
+
+    print('Reprocessing is completed! Total: {n_frames} frames ({n_bytes:.1f} MB) in {seconds:.3f}s: {fps:.0f} frames/s, {mbps:.1f} MB/s.'.format(
+        n_frames=reprocessor.n_frames,
+        n_bytes=reprocessor.n_bytes / 2**20,
+        seconds=seconds,
+        fps=reprocessor.n_schemas*reprocessor.schema.capacity_total / seconds,
+        mbps=reprocessor.n_bytes / 2**20 / seconds,
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+from typing import Callable
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.data import Batch, Data, Meta
+from vmk_spectrum3_wrapper.data.io import create_data
+from vmk_spectrum3_wrapper.measurement_manager.filters import PipeFilter
+from vmk_spectrum3_wrapper.measurement_manager.measurement_manager import default_filter_factory
+from vmk_spectrum3_wrapper.measurement_manager.schemas import Schema, schema_factory
+from vmk_spectrum3_wrapper.recorder import Recording
+from vmk_spectrum3_wrapper.reprocessing.exceptions import ReprocessingError
+from vmk_spectrum3_wrapper.types import Array, MilliSecond, Path
+from vmk_spectrum3_wrapper.units import Units
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Reprocessor:
+    """Повторная обработка записанных сырых кадров.
+
+    Запись читается частями (`chunk_size` схем измерения), каждая часть разбивается на схемы измерения и обрабатывается конвейером фильтров `filter` в пуле процессов.
+    Процессы открывают запись самостоятельно (memory-mapped), поэтому между процессами передаются только границы частей и результаты обработки.
+    Параметры:
+        `filepath` - путь к записи сырых кадров;
+        `exposure` - время экспозиции схемы измерения;
+        `capacity` - количество накоплений схемы измерения;
+        `filter` - конвейер фильтров (по умолчанию - по типу схемы измерения);
+        `chunk_size` - количество схем измерения в одной части;
+        `n_workers` - количество процессов (`1` - обработка в текущем процессе);
+        `assembly_id` - идентификатор сборки (по умолчанию обрабатываются все кадры записи).
+
+    Время `meta` - время получения первого и последнего обрабатываемых кадров записи по системным часам (`time.time`, как у `meta` измерения).
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        exposure: MilliSecond | tuple[MilliSecond, MilliSecond],
+        capacity: int | tuple[int, int],
+        filter: PipeFilter | None = None,
+        chunk_size: int = 100,
+        n_workers: int | None = None,
+        assembly_id: str | None = None,
+    ):
+        self._filepath = filepath
+        self._exposure = exposure
+        self._capacity = capacity
+        self._schema = schema_factory(exposure, capacity)
+        self._filter = filter or default_filter_factory(self._schema)
+        self._chunk_size = chunk_size
+        self._n_workers = n_workers or os.cpu_count()
+        self._assembly_id = assembly_id
+
+        recording = Recording(filepath)
+        self._index = None if assembly_id is None else np.flatnonzero(recording.assembly_id == assembly_id.encode())
+        self._n_frames = len(recording) if self._index is None else len(self._index)
+        self._frame_size = recording.frames.itemsize * recording.n_numbers
+
+        n_frames = self.n_schemas * self.schema.capacity_total
+        frames = range(n_frames) if self._index is None else self._index[:n_frames]  # обрабатываемые кадры выбранной сборки
+        self._started_at = float(recording.timestamp[frames[0]]) if len(frames) else None
+        self._finished_at = float(recording.timestamp[frames[-1]]) if len(frames) else None
+
+        if self.n_frames % self.schema.capacity_total:
+            LOGGER.warning(
+                'Recording %s is not completed: last %d frames are skipped!',
+                filepath,
+                self.n_frames % self.schema.capacity_total,
+            )
+
+    @property
+    def filepath(self) -> Path:
+        return self._filepath
+
+    @property
+    def schema(self) -> Schema:
+        return self._schema
+
+    @property
+    def filter(self) -> PipeFilter:
+        return self._filter
+
+    @property
+    def n_frames(self) -> int:
+        """Количество кадров записи."""
+        return self._n_frames
+
+    @property
+    def n_schemas(self) -> int:
+        """Количество полных схем измерения записи."""
+        return self.n_frames // self.schema.capacity_total
+
+    @property
+    def n_bytes(self) -> int:
+        """Объем обрабатываемых кадров."""
+        return self.n_schemas * self.schema.capacity_total * self._frame_size
+
+    @property
+    def chunks(self) -> list[tuple[int, int]]:
+        """Границы частей записи (в схемах измерения)."""
+
+        return [
+            (start, min(start + self._chunk_size, self.n_schemas))
+            for start in range(0, self.n_schemas, self._chunk_size)
+        ]
+
+    @property
+    def meta(self) -> Meta:
+        return Meta(
+            exposure=self._exposure,
+            capacity=self._capacity,
+            started_at=self._started_at,
+            finished_at=self._finished_at,
+        )
+
+    def iterate(self) -> Iterator[Batch]:
+        """Обработать запись и вернуть результаты частей по порядку (по мере готовности)."""
+        initargs = (self.filepath, self.filter, self._exposure, self._capacity, self._index)
+
+        try:
+            if self._n_workers == 1:
+                _init_worker(*initargs)
+                yield from map(_process_chunk, self.chunks)
+                return
+
+            with ProcessPoolExecutor(max_workers=self._n_workers, initializer=_init_worker, initargs=initargs) as executor:
+                yield from executor.map(_process_chunk, self.chunks)
+
+        except Exception as error:
+            raise ReprocessingError(f'Recording {self.filepath} is not reprocessed: {error!r}') from error
+
+    def run(
+        self,
+        callback: Callable[[int], None] | None = None,
+        output: Path | None = None,
+    ) -> Data:
+        """Обработать запись и собрать результаты в `data`.
+
+        Если задан `output`, результаты частей записываются в файл `output` (см. `data.io`) по мере готовности и не накапливаются в памяти; возвращаются `data` файла (memory-mapped).
+        Функция `callback` вызывается с количеством обработанных кадров после обработки каждой части.
+        """
+
+        if self.n_schemas == 0:
+            raise ReprocessingError(f'Recording {self.filepath} has not a completed schema!')
+
+        if output is None:
+            return self._collect(callback)
+        return self._stream(output, callback)
+
+    def _collect(self, callback: Callable[[int], None] | None) -> Data:
+        units, values = None, {name: [] for name in FIELDS}
+
+        for batch in self.iterate():
+            units = batch.units
+            for name in FIELDS:
+                values[name].append(_flatten(getattr(batch, name)))
+
+            if callback:
+                callback(batch.n_schemas * self.schema.capacity_total)
+
+        return Data(
+            units=units,
+            **{
+                name: None if value[0] is None else np.concatenate(value)
+                for name, value in values.items()
+            },
+            meta=self.meta,
+        )
+
+    def _stream(self, output: Path, callback: Callable[[int], None] | None) -> Data:
+        sections, position = None, 0
+
+        for batch in self.iterate():
+            values = {
+                name: _flatten(getattr(batch, name))
+                for name in FIELDS
+            }
+            n_rows = len(values['intensity'])
+
+            if sections is None:  # количество строк схемы измерения известно после обработки первой части
+                n_total = self.n_schemas * n_rows // batch.n_schemas
+                sections = create_data(
+                    output,
+                    units=batch.units,
+                    fields={
+                        name: (value.dtype, (n_total, value.shape[-1]))
+                        for name, value in values.items()
+                        if value is not None
+                    },
+                    meta=self.meta,
+                )
+
+            for name, section in sections.items():
+                section[position:position + n_rows] = values[name]
+            position += n_rows
+
+            if callback:
+                callback(batch.n_schemas * self.schema.capacity_total)
+
+        for section in sections.values():
+            section.flush()
+        del sections
+
+        return Data.load(output)
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.filepath}, schema={repr(self.schema)}, n_schemas={self.n_schemas})'
+
+
+FIELDS = ('intensity', 'clipped', 'deviation', 'rejected')
+
+
+def _flatten(__value: Array | None) -> Array | None:
+    if __value is None:
+        return None
+
+    return __value.reshape(-1, __value.shape[-1])
+
+
+# --------        worker        --------
+_WORKER = {}
+
+
+def _init_worker(
+    filepath: Path,
+    filter: PipeFilter,
+    exposure: MilliSecond | tuple[MilliSecond, MilliSecond],
+    capacity: int | tuple[int, int],
+    index: Array[int] | None,
+) -> None:
+    _WORKER.update(
+        recording=Recording(filepath),
+        filter=filter,
+        exposure=exposure,
+        capacity=capacity,
+        n_times=schema_factory(exposure, capacity).capacity_total,
+        index=index,
+    )
+
+
+def _process_chunk(chunk: tuple[int, int]) -> Batch:
+    recording, filter, index, n_times = _WORKER['recording'], _WORKER['filter'], _WORKER['index'], _WORKER['n_times']
+    start, stop = chunk
+
+    if index is None:
+        frames = np.asarray(recording.frames[start*n_times:stop*n_times])
+    else:
+        frames = recording.frames[index[start*n_times:stop*n_times]]
+
+    return filter.batch(
+        Batch.create(frames, n_times=n_times, units=Units.digit),
+        exposure=_WORKER['exposure'],
+        capacity=_WORKER['capacity'],
+        save=False,  # `HighDynamicRangeIntegrationFilter` не сохраняет промежуточные данные
+    )
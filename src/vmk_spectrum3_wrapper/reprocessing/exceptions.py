@@ -0,0 +1,3 @@
+
+class ReprocessingError(Exception):
+    pass
@@ -1,17 +1,93 @@
+from collections.abc import Sequence
+import json
+import os
 from typing import overload
 
-from vmk_spectrum3_wrapper.types import Array, Digit
+import numpy as np
+
+from vmk_spectrum3_wrapper.exception import ShuffleError
+from vmk_spectrum3_wrapper.types import Array, Digit, Path
 
 
 class Shuffle:
-    """Смещения и перестановок объект."""
+    """Смещения и перестановок объект.
+
+    Отсчеты кадра выбираются по заранее рассчитанному индексу: `value[..., i] = frame[..., index[i]]`.
+    Индекс учитывает смещение (служебные отсчеты в начале кадра) и перестановку отсчетов детекторов сборки.
+    """
+
+    def __init__(self, index: Array[int]):
+        index = np.array(index, dtype=np.intp)
+        if not (index.ndim == 1 and len(index) > 0 and np.min(index) >= 0):
+            raise ShuffleError(f'Index with shape: {index.shape} is not supported!')
+        index.setflags(write=False)
+
+        self._index = index
+        self._n_frame_numbers = int(np.max(index)) + 1
+
+    @property
+    def index(self) -> Array[int]:
+        return self._index
+
+    @property
+    def n_numbers(self) -> int:
+        """Количество отсчетов после перестановки."""
+        return len(self._index)
+
+    @classmethod
+    def create(
+        cls,
+        n_pixels: int,
+        offset: int = 0,
+        permutation: Sequence[int] | None = None,
+    ) -> 'Shuffle':
+        """Создать перестановку `n_pixels` отсчетов кадра, начинающихся с `offset` отсчета, в порядке `permutation`."""
+
+        if permutation is None:
+            permutation = np.arange(n_pixels)
+
+        permutation = np.asarray(permutation)
+        if not np.array_equal(np.sort(permutation), np.arange(n_pixels)):
+            raise ShuffleError(f'Permutation is not a permutation of {n_pixels} pixels!')
+
+        return cls(offset + permutation)
 
-    def __init__(self):
-        pass
+    @classmethod
+    def load(cls, filepath: Path) -> 'Shuffle':
+        """Загрузить перестановку из файла конфигурации (JSON с ключами `n_pixels`, `offset` и `permutation`)."""
+
+        if not os.path.exists(filepath):
+            raise ShuffleError(f'Shuffle file {filepath} is not found!')
+
+        with open(filepath, 'r') as file:
+            config = json.load(file)
+
+        return cls.create(
+            n_pixels=config['n_pixels'],
+            offset=config.get('offset', 0),
+            permutation=config.get('permutation'),
+        )
 
     @overload
-    def __call__(self, value: Array[Digit]) -> Array[Digit]: ...
+    def __call__(self, value: Array[Digit], out: Array[Digit] | None = None) -> Array[Digit]: ...
     @overload
-    def __call__(self, value: Array[bool]) -> Array[bool]: ...
-    def __call__(self, value):
-        raise NotImplementedError
+    def __call__(self, value: Array[bool], out: Array[bool] | None = None) -> Array[bool]: ...
+    def __call__(self, value, out=None):
+        if value.shape[-1] < self._n_frame_numbers:
+            raise ShuffleError(f'Frame with shape: {value.shape} is too short for shuffle!')
+
+        if out is None:
+            out = np.empty((*value.shape[:-1], self.n_numbers), dtype=value.dtype)
+
+        return np.take(value, self.index, axis=-1, out=out, mode='clip')  # индекс проверен заранее, `mode='clip'` позволяет писать в `out` без буферизации
+
+    def __eq__(self, other: 'Shuffle') -> bool:
+        if not isinstance(other, self.__class__):
+            return False
+
+        return np.array_equal(self.index, other.index)
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.n_numbers} numbers)'
@@ -0,0 +1,144 @@
+"""Трассировка регистрации и обработки кадров с экспортом в формат Chrome Trace (открывается в `chrome://tracing` или https://ui.perfetto.dev).
+
+Интервалы (`span`) записываются в заранее выделенный буфер событий: номер события выдается атомарным счетчиком,
+поэтому потоки записывают события без блокировок; события сверх емкости буфера отбрасываются.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.types import Path, Second
+
+
+EVENT_DTYPE = np.dtype([
+    ('name', '<u4'),
+    ('category', '<u4'),
+    ('tid', '<u8'),
+    ('started_at', '<f8'),
+    ('finished_at', '<f8'),  # отмечает событие записанным (записывается последним)
+])
+
+
+class Tracer:
+    """Трассировщик интервалов выполнения (`Device.setup`, `Device.read`, callback драйвера, обработка буфера `storage` и вызовы фильтров).
+
+    Параметры:
+        `capacity` - емкость буфера событий.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        self._events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._lock = threading.Lock()  # только для регистрации новых имен
+
+        self.reset()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._events)
+
+    @property
+    def n_events(self) -> int:
+        """Количество записанных событий."""
+        return int(np.count_nonzero(self._events['finished_at']))
+
+    @property
+    def n_dropped(self) -> int:
+        """Количество отброшенных (не поместившихся в буфер) событий."""
+        return self._n_dropped
+
+    def add(self, name: str, started_at: Second, finished_at: Second, category: str = 'wrapper') -> None:
+        """Записать интервал `name` от `started_at` до `finished_at` (`time.perf_counter`) текущего потока."""
+
+        n = next(self._counter)
+        if n >= len(self._events):
+            self._n_dropped += 1
+            return
+
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+
+        self._events[n] = (self._intern(name), self._intern(category), tid, started_at, max(finished_at, started_at + 1e-9))
+
+    @contextmanager
+    def span(self, name: str, category: str = 'wrapper') -> Iterator[None]:
+        """Записать интервал выполнения блока `with`."""
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.add(name, started_at, time.perf_counter(), category=category)
+
+    def reset(self) -> None:
+        """Очистить буфер событий."""
+
+        self._events[:] = 0
+        self._counter = itertools.count()
+        self._n_dropped = 0
+
+        self._names = []
+        self._index = {}
+        self._threads = {}
+        self._origin = time.perf_counter()
+
+    def dumps(self) -> Mapping[str, Any]:
+        """События в формате Chrome Trace (JSON Object Format); время в микросекундах от создания (сброса) трассировщика."""
+        pid = os.getpid()
+
+        events = self._events[self._events['finished_at'] > 0]
+        events = events[np.argsort(events['started_at'], kind='stable')]
+
+        return {
+            'traceEvents': [
+                *[
+                    {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in list(self._threads.items())
+                ],
+                *[
+                    {
+                        'name': self._names[name],
+                        'cat': self._names[category],
+                        'ph': 'X',
+                        'ts': 1e+6*(started_at - self._origin),
+                        'dur': 1e+6*(finished_at - started_at),
+                        'pid': pid,
+                        'tid': tid,
+                    }
+                    for name, category, tid, started_at, finished_at in events.tolist()
+                ],
+            ],
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'n_dropped': self.n_dropped,
+            },
+        }
+
+    def save(self, filepath: Path) -> None:
+        """Сохранить события в файл `filepath` формата Chrome Trace."""
+
+        with open(filepath, 'w') as file:
+            json.dump(self.dumps(), file)
+
+    def _intern(self, name: str) -> int:
+        index = self._index.get(name)
+
+        if index is None:
+            with self._lock:
+                index = self._index.get(name)
+                if index is None:
+                    self._names.append(name)
+                    index = self._index[name] = len(self._names) - 1
+
+        return index
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}({self.n_events}/{self.capacity} events, dropped={self.n_dropped})'
@@ -1,7 +1,7 @@
 from enum import Enum
 
 from vmk_spectrum3_wrapper.config import DEFAULT_ADC, DEFAULT_DETECTOR
-from vmk_spectrum3_wrapper.types import Electron, U
+from vmk_spectrum3_wrapper.types import Digit, Electron, U
 
 
 class Units(Enum):
@@ -88,3 +88,12 @@ def to_electron(value: U, units: Units, capacity: Electron) -> Electron:
         return value
 
     raise TypeError(f'Units {units} is not supported yet!')
+
+
+def to_digit(value: U, units: Units) -> Digit:
+    """Convert value to digit units."""
+
+    if units in (Units.digit, Units.percent, Units.electron):
+        return Units.digit.value_max * (value/units.value_max)
+
+    raise TypeError(f'Units {units} is not supported yet!')
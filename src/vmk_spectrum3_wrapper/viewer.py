@@ -0,0 +1,174 @@
+import threading
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+import numpy as np
+
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.data.plotting import decimate, screen_size
+
+
+class LiveViewer:
+    """Отображение спектров в процессе измерения.
+
+    Подписчик `storage` (см. `Device.subscribe`): вызов только сохраняет последний `datum` и никогда не блокирует измерение; промежуточные `datum`, не успевшие отобразиться, пропускаются.
+    Отображение обновляется таймером окна не чаще `max_fps` раз в секунду (обновлением линий и `blit` без перерисовки осей).
+    Параметры:
+        `max_fps` - максимальная частота обновления;
+        `n_bins` - количество отображаемых бинов отсчетов (по умолчанию - ширина осей в пикселях экрана).
+    """
+
+    def __init__(
+        self,
+        max_fps: float = 10,
+        n_bins: int | None = None,
+    ):
+        self._max_fps = max_fps
+        self._n_bins = n_bins
+
+        self._lock = threading.Lock()
+        self._datum = None
+        self._n_received = 0
+        self._n_drawn = 0
+        self._drawn = 0  # номер последнего отображенного `datum`
+
+        self._figure = None
+        self._lines = None
+        self._markers = None
+        self._background = None
+        self._timer = None
+
+    @property
+    def max_fps(self) -> float:
+        return self._max_fps
+
+    @property
+    def figure(self) -> Figure | None:
+        return self._figure
+
+    @property
+    def n_received(self) -> int:
+        """Количество полученных `datum`."""
+        return self._n_received
+
+    @property
+    def n_drawn(self) -> int:
+        """Количество отображенных `datum`."""
+        return self._n_drawn
+
+    @property
+    def n_skipped(self) -> int:
+        """Количество пропущенных (не отображенных) `datum`."""
+        return self._drawn - self._n_drawn
+
+    def __call__(self, datum: Datum) -> None:
+        """Получить `datum` (вызывается в потоке драйвера)."""
+
+        with self._lock:
+            self._datum = datum
+            self._n_received += 1
+
+    def start(self) -> 'LiveViewer':
+        """Создать окно и запустить таймер обновления."""
+
+        self._figure, ax = plt.subplots(figsize=(6, 4), tight_layout=True)
+        self._lines = LineCollection([], colors='black', linestyles='-', linewidths=1, animated=True)
+        ax.add_collection(self._lines)
+        self._markers = ax.scatter([], [], color='red', marker='.', s=4, animated=True)
+
+        ax.set_xlabel('Номер отсчета')
+        ax.set_ylabel('Интенсивность')
+
+        self._figure.canvas.mpl_connect('draw_event', self._on_draw)
+        self._timer = self._figure.canvas.new_timer(interval=int(1000 / self.max_fps))
+        self._timer.add_callback(self.update)
+        self._timer.start()
+
+        return self
+
+    def show(self) -> None:
+        """Открыть окно (блокирует поток до закрытия окна; вызывается в главном потоке)."""
+
+        if self._figure is None:
+            self.start()
+        plt.show()
+
+    def stop(self) -> None:
+        """Остановить таймер обновления и закрыть окно."""
+
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if self._figure is not None:
+            plt.close(self._figure)
+            self._figure = None
+
+    def update(self) -> bool:
+        """Отобразить последний полученный `datum` (если он не отображен ранее)."""
+
+        with self._lock:
+            datum, n_received = self._datum, self._n_received
+        if datum is None or n_received == self._drawn or self._figure is None:
+            return False
+
+        ax = self._figure.axes[0]
+        xs, ys = decimate(datum.number, datum.intensity, n_bins=self._n_bins or screen_size(ax)[0])
+
+        segments = np.empty((datum.n_times, len(xs), 2))
+        segments[:, :, 0] = xs
+        segments[:, :, 1] = ys
+        self._lines.set_segments(segments)
+
+        if datum.clipped is not None and np.any(datum.clipped):
+            t, n = np.nonzero(datum.clipped)
+            self._markers.set_offsets(np.column_stack([datum.number[n], datum.intensity[t, n]]))
+        else:
+            self._markers.set_offsets(np.empty((0, 2)))
+
+        self._drawn = n_received
+        self._n_drawn += 1
+
+        if self._rescale(ax, xs, ys) or self._background is None:
+            self._figure.canvas.draw_idle()  # фон перерисовывается (см. `_on_draw`)
+        else:
+            self._blit(ax)
+
+        return True
+
+    def _rescale(self, ax, xs, ys) -> bool:
+        x_min, x_max = np.min(xs), np.max(xs)
+        y_min, y_max = np.nanmin(ys), np.nanmax(ys)
+
+        (x_lo, x_hi), (y_lo, y_hi) = ax.get_xlim(), ax.get_ylim()
+        if x_lo <= x_min and x_max <= x_hi and y_lo <= y_min and y_max <= y_hi:
+            return False
+
+        margin = .05*(y_max - y_min) or 1
+        ax.set_xlim(x_min, x_max)
+        ax.set_ylim(y_min - margin, y_max + margin)
+
+        return True
+
+    def _on_draw(self, event) -> None:
+        canvas = self._figure.canvas
+        ax = self._figure.axes[0]
+
+        if canvas.supports_blit:
+            self._background = canvas.copy_from_bbox(ax.bbox)
+        ax.draw_artist(self._lines)
+        ax.draw_artist(self._markers)
+
+    def _blit(self, ax) -> None:
+        canvas = self._figure.canvas
+
+        canvas.restore_region(self._background)
+        ax.draw_artist(self._lines)
+        ax.draw_artist(self._markers)
+        canvas.blit(ax.bbox)
+        canvas.flush_events()
+
+    def __repr__(self) -> str:
+        cls = self.__class__
+
+        return f'{cls.__name__}(max_fps={self.max_fps}, received={self.n_received}, drawn={self.n_drawn})'
@@ -0,0 +1,48 @@
+"""Запуск набора бенчмарков: `python -m tests.benchmarks --output results.json [--compare baseline.json]`."""
+import argparse
+import json
+
+from tests.benchmarks.suite import CAPACITIES, DETECTORS, DTYPES, compare, run
+from vmk_spectrum3_wrapper.detector import Detector
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m tests.benchmarks',
+        description='Run benchmarks of acquisition and filter hot paths without hardware.',
+    )
+    parser.add_argument('--output', default='benchmarks.json', help='path to the JSON results')
+    parser.add_argument('--compare', default=None, help='path to the JSON results of a previous version')
+    parser.add_argument('--detector', nargs='+', default=[detector.name for detector in DETECTORS], choices=[detector.name for detector in Detector])
+    parser.add_argument('--capacity', nargs='+', type=int, default=list(CAPACITIES))
+    parser.add_argument('--dtype', nargs='+', default=list(DTYPES))
+    parser.add_argument('--quick', action='store_true', help='run each benchmark once (smoke check)')
+
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> None:
+    args = parse_args(args)
+
+    suite = run(
+        detectors=[Detector[name] for name in args.detector],
+        capacities=args.capacity,
+        dtypes=args.dtype,
+        quick=args.quick,
+    )
+    suite.save(args.output)
+
+    for result in suite.results:
+        dump = result.dumps()
+        print(f'{result.key:<80}{1e6*dump["min"]:12.1f} us{dump["fps"]:14.0f} frames/s')
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            before = json.load(file)
+
+        for key, ratio in sorted(compare(before, suite.dumps()).items(), key=lambda item: item[1]):
+            print(f'{key:<80}{ratio:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Микробенчмарк создания `Datum`: проверяемый конструктор, быстрый конструктор фильтров и конвейер основных фильтров.
+
+Запуск: `python -m tests.benchmarks.bench_datum`.
+"""
+import timeit
+
+import numpy as np
+
+from vmk_spectrum3_wrapper.config import DEFAULT_DETECTOR
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters import ClipFilter, EyeFilter, PipeFilter, ScaleFilter
+from vmk_spectrum3_wrapper.units import Units
+
+
+N_NUMBERS = DEFAULT_DETECTOR.config.n_pixels
+N_TIMES = 10
+
+
+def main(number: int = 100_000, repeat: int = 5) -> None:
+    intensity = np.zeros((N_TIMES, N_NUMBERS))
+    clipped = np.zeros((N_TIMES, N_NUMBERS), dtype=bool)
+    deviation = np.ones((N_TIMES, N_NUMBERS))
+
+    datum = Datum(Units.digit, intensity=intensity, clipped=clipped, deviation=deviation)
+    pipe = PipeFilter([EyeFilter(), ClipFilter(), ScaleFilter()])
+
+    cases = {
+        'Datum(...)': lambda: Datum(Units.digit, intensity=intensity, clipped=clipped, deviation=deviation),
+        'Datum._create(...)': lambda: Datum._create(Units.digit, intensity=intensity, clipped=clipped, deviation=deviation),
+        'EyeFilter': lambda: pipe[0](datum),
+    }
+    for name, case in cases.items():
+        duration = min(timeit.repeat(case, number=number, repeat=repeat)) / number
+        print(f'{name:<24}{1e9*duration:8.0f} ns')
+
+    duration = min(timeit.repeat(lambda: pipe(datum), number=number // 100, repeat=repeat)) / (number // 100)
+    print(f'{"PipeFilter (3 filters)":<24}{1e6*duration:8.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""Набор бенчмарков горячих путей регистрации и обработки (без оборудования).
+
+Кадры генерируются `SpectrumEmulator`, устройство заменяется `FakeDeviceManager`. Матрица параметров: детекторы, количество накоплений и тип кадров.
+Результаты записываются в JSON для сравнения версий (см. `compare`).
+"""
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+import itertools
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import timeit
+from typing import Any, Mapping
+
+import numpy as np
+
+from tests.fakes.device import device_manager_factory
+from tests.fakes.experiment.emulator import SpectrumEmulator, create_spectrum_kernel
+from vmk_spectrum3_wrapper.codec import Codec
+from vmk_spectrum3_wrapper.data import Data, Datum, Meta
+from vmk_spectrum3_wrapper.detector import Detector
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceConfigReplay, DeviceManagerFactory
+from vmk_spectrum3_wrapper.measurement_manager.filters import (
+    BinningFilter,
+    ClipFilter,
+    CorePreset,
+    DeviationFilter,
+    EyeFilter,
+    HighDynamicRangeIntegrationFilter,
+    HighDynamicRangeIntegrationPreset,
+    OffsetFilter,
+    RegionFilter,
+    ScaleFilter,
+    ShuffleFilter,
+    StandardIntegrationPreset,
+)
+from vmk_spectrum3_wrapper.measurement_manager.storage import Storage
+from vmk_spectrum3_wrapper.recorder import RawFrameRecorder
+from vmk_spectrum3_wrapper.shuffle import Shuffle
+from vmk_spectrum3_wrapper.types import MilliSecond, Path
+from vmk_spectrum3_wrapper.units import Units
+
+
+DETECTORS = (Detector.BLPP2000, Detector.BLPP4000, Detector.BLPP4100)
+CAPACITIES = (1, 10, 100)
+DTYPES = ('uint16', 'float64')
+
+EXPOSURE: MilliSecond = 1
+EXPOSURE_EXTENDED: tuple[MilliSecond, MilliSecond] = (1, 10)
+
+
+@dataclass
+class Result:
+    name: str
+    params: Mapping[str, Any]
+    n_frames: int
+    durations: list[float] = field(default_factory=list)  # длительность одного вызова, с
+
+    @property
+    def key(self) -> str:
+        return '{name}[{params}]'.format(
+            name=self.name,
+            params=','.join(f'{key}={value}' for key, value in self.params.items()),
+        )
+
+    def dumps(self) -> Mapping[str, Any]:
+        duration = min(self.durations)
+
+        return {
+            'name': self.name,
+            'params': dict(self.params),
+            'n_frames': self.n_frames,
+            'min': duration,
+            'median': statistics.median(self.durations),
+            'mean': statistics.mean(self.durations),
+            'fps': self.n_frames / duration if duration > 0 else None,
+        }
+
+
+class Suite:
+    """Набор бенчмарков.
+
+    Параметры:
+        `repeat` - количество повторений каждого бенчмарка;
+        `min_time` - минимальная длительность одного повторения (количество вызовов подбирается), с;
+        `quick` - один вызов в каждом повторении (проверка работоспособности набора).
+    """
+
+    def __init__(self, repeat: int = 5, min_time: float = .05, quick: bool = False):
+        self._repeat = 1 if quick else repeat
+        self._min_time = min_time
+        self._quick = quick
+
+        self.results = []
+
+    def run(self, name: str, func: Callable[[], Any], n_frames: int = 1, **params) -> Result:
+        """Измерить длительность вызова `func` (обработки `n_frames` кадров)."""
+        timer = timeit.Timer(func)
+
+        if self._quick:
+            number = 1
+        else:
+            number, duration = timer.autorange()
+            number = max(1, int(number * self._min_time / max(duration, 1e-9)))
+
+        result = Result(name=name, params=params, n_frames=n_frames)
+        result.durations = [
+            duration / number
+            for duration in timer.repeat(repeat=self._repeat, number=number)
+        ]
+
+        self.results.append(result)
+        return result
+
+    def dumps(self) -> Mapping[str, Any]:
+        import vmk_spectrum3_wrapper
+
+        return {
+            'version': vmk_spectrum3_wrapper.__version__,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'created_at': time.time(),
+            'results': {
+                result.key: result.dumps()
+                for result in self.results
+            },
+        }
+
+    def save(self, filepath: Path) -> None:
+        with open(filepath, 'w') as file:
+            json.dump(self.dumps(), file, indent=4)
+
+
+# --------        cases        --------
+def create_offset(n_numbers: int, n_times: int = 1) -> Data:
+    return Data(
+        units=Units.percent,
+        intensity=np.full((n_times, n_numbers), 5.),
+        clipped=np.zeros((n_times, n_numbers), dtype=bool),
+        deviation=np.full((n_times, n_numbers), .01),
+    )
+
+
+@contextmanager
+def fake_device(emulator: SpectrumEmulator) -> Iterator[Device]:
+    create = DeviceManagerFactory._create
+
+    DeviceManagerFactory._create = partial(device_manager_factory, emulator=emulator)
+    try:
+        yield Device(config=DeviceConfigAuto(change_exposure_timeout=0)).connect()
+    finally:
+        DeviceManagerFactory._create = create
+
+
+def run_cases(suite: Suite, detector: Detector, capacity: int, dtype: str) -> None:
+    params = dict(detector=detector.name, capacity=capacity, dtype=dtype)
+    n_numbers = detector.config.n_pixels
+
+    emulator = SpectrumEmulator(create_spectrum_kernel(detector, light=5), detector=detector)
+    frames = emulator.emulate(2*capacity, exposure=EXPOSURE, dtype=np.uint16).astype(dtype)
+    offset = create_offset(n_numbers)
+
+    digit = Datum(units=Units.digit, intensity=frames[:capacity])
+    percent = ScaleFilter()(ClipFilter()(digit))
+
+    # storage
+    storage = Storage(EXPOSURE, capacity, filter=StandardIntegrationPreset(bias=offset))
+
+    def put():
+        for frame in frames[:capacity]:
+            storage.put(frame)
+        storage.data.clear()
+    suite.run('storage.put', put, n_frames=capacity, **params)
+
+    # core filters
+    for filter, datum in [
+        (EyeFilter(), digit),
+        (ShuffleFilter(Shuffle.create(n_numbers)), digit),
+        (RegionFilter(np.arange(n_numbers // 4, n_numbers // 2)), digit),
+        (ClipFilter(), digit),
+        (BinningFilter(2), percent),
+        (ScaleFilter(), digit),
+        (OffsetFilter(offset), percent),
+        (DeviationFilter(offset, units=Units.percent), percent),
+    ]:
+        suite.run(f'filter.{filter.__class__.__name__}', partial(filter, datum), n_frames=capacity, **params)
+
+    # presets
+    for preset in [
+        CorePreset(bias=offset, dark=offset),
+        StandardIntegrationPreset(bias=offset, dark=offset),
+    ]:
+        suite.run(f'preset.{preset.__class__.__name__}', partial(preset, digit, exposure=EXPOSURE, capacity=capacity), n_frames=capacity, **params)
+
+    preset = HighDynamicRangeIntegrationPreset(bias=offset, dark=create_offset(n_numbers, n_times=2))
+    extended = Datum(units=Units.digit, intensity=frames)
+    suite.run(
+        f'preset.{preset.__class__.__name__}',
+        partial(preset, extended, exposure=EXPOSURE_EXTENDED, capacity=(capacity, capacity), save=False),
+        n_frames=2*capacity,
+        **params,
+    )
+
+    # hdr
+    merged = DeviationFilter(offset, units=Units.percent)(ScaleFilter()(ClipFilter()(Datum(units=Units.digit, intensity=frames[:2]))))
+    suite.run('filter.HighDynamicRangeIntegrationFilter', partial(HighDynamicRangeIntegrationFilter(), merged, exposure=EXPOSURE_EXTENDED, capacity=(1, 1), save=False), n_frames=2, **params)
+
+    # data
+    data = [percent[t, :] for t in range(capacity)]
+    meta = Meta(exposure=EXPOSURE, capacity=capacity, started_at=0, finished_at=1)
+    suite.run('data.squeeze', partial(Data.squeeze, data, meta), n_frames=capacity, **params)
+
+    squeezed = Data.squeeze(data, meta)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, codec in [('raw', None), ('zlib', Codec())]:
+            filepath = os.path.join(directory, f'{name}.dat')
+
+            suite.run(f'data.save.{name}', partial(squeezed.save, filepath, codec=codec), n_frames=capacity, **params)
+            suite.run(f'data.load.{name}', lambda filepath=filepath: np.asarray(Data.load(filepath).intensity).sum(), n_frames=capacity, **params)
+
+    # device
+    with fake_device(emulator) as device:
+
+        def read():
+            device.setup(n_times=capacity, exposure=EXPOSURE)
+            return device.read(timeout=0)
+        suite.run('device.read', read, n_frames=capacity, **params)
+
+    # replay
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, 'raw.npy')
+        with RawFrameRecorder(filepath, n_numbers=n_numbers, capacity=capacity) as recorder:
+            for n, frame in enumerate(frames[:capacity]):
+                recorder.put(frame, frame_number=n + 1, assembly_id='0.0.0.2')
+
+        device = Device(config=DeviceConfigReplay(filepath, speed=None)).connect()
+
+        def replay():
+            device.device_manager.rewind()
+            device.setup(n_times=capacity, exposure=EXPOSURE)
+            return device.read(timeout=0)
+        suite.run('device.replay', replay, n_frames=capacity, **params)
+
+
+def run(
+    detectors: Sequence[Detector] = DETECTORS,
+    capacities: Sequence[int] = CAPACITIES,
+    dtypes: Sequence[str] = DTYPES,
+    quick: bool = False,
+) -> Suite:
+    """Выполнить бенчмарки для всех сочетаний параметров."""
+    suite = Suite(quick=quick)
+
+    for detector, capacity, dtype in itertools.product(detectors, capacities, dtypes):
+        run_cases(suite, detector=detector, capacity=capacity, dtype=dtype)
+
+    return suite
+
+
+def compare(before: Mapping[str, Any], after: Mapping[str, Any]) -> Mapping[str, float]:
+    """Отношение минимальных длительностей `after / before` общих бенчмарков двух результатов."""
+
+    return {
+        key: after['results'][key]['min'] / before['results'][key]['min']
+        for key in before['results']
+        if key in after['results'] and before['results'][key]['min'] > 0
+    }
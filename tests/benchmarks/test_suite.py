@@ -0,0 +1,33 @@
+import json
+import os
+
+from tests.benchmarks.__main__ import main
+from tests.benchmarks.suite import compare
+
+
+def test_suite_quick(
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'benchmarks.json')
+
+    main(['--output', filepath, '--detector', 'BLPP2000', 'BLPP4100', '--capacity', '2', '--dtype', 'uint16', '--quick'])
+
+    with open(filepath, 'r') as file:
+        results = json.load(file)
+
+    names = {result['name'] for result in results['results'].values()}
+    assert {
+        'storage.put',
+        'filter.ShuffleFilter',
+        'filter.OffsetFilter',
+        'preset.CorePreset',
+        'preset.StandardIntegrationPreset',
+        'preset.HighDynamicRangeIntegrationPreset',
+        'filter.HighDynamicRangeIntegrationFilter',
+        'data.squeeze',
+        'data.save.zlib',
+        'data.load.raw',
+        'device.read',
+    } <= names
+    assert all(result['min'] > 0 for result in results['results'].values())
+    assert set(compare(results, results).values()) == {1}
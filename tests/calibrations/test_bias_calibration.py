@@ -5,7 +5,8 @@ import numpy as np
 import pytest
 
 from tests.fakes.device import device_manager_factory
-from vmk_spectrum3_wrapper.calibrations import calibrate_bias
+from vmk_spectrum3_wrapper.calibration import BiasFitter, calibrate_bias
+from vmk_spectrum3_wrapper.calibration.exceptions import CalibrationError
 from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
 
 
@@ -14,7 +15,7 @@ def test_calibrate_bias(
     monkeypatch: pytest.MonkeyPatch,
     caplog,
 ):
-    monkeypatch.setattr(Device, 'config', DeviceConfigAuto(change_exposure_delay=0))
+    monkeypatch.setattr(Device, 'config', DeviceConfigAuto(change_exposure_timeout=0))
     monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
     caplog.set_level(logging.INFO)
 
@@ -28,3 +29,64 @@ def test_calibrate_bias(
     )
 
     assert bias.n_times == 1
+    assert bias.meta.capacity == 100
+
+
+def test_bias_fitter():
+    n_numbers = 16
+    exposure = np.arange(1, 10)
+    bias_true = np.linspace(0, 1, n_numbers)
+    slope_true = np.linspace(1, 2, n_numbers)
+
+    intensity = bias_true + slope_true*exposure[:, np.newaxis] + np.random.randn(len(exposure), n_numbers)
+    clipped = np.zeros_like(intensity, dtype=bool)
+    clipped[-2:, 0] = True
+    clipped[:-1, 1] = True
+
+    fitter = BiasFitter(n_numbers)
+    for x, y, mask in zip(exposure, intensity, clipped):
+        fitter.update(exposure=x, intensity=y, clipped=mask)
+    bias, slope, deviation, clipped_fit = fitter.fit()
+
+    for n in range(n_numbers):
+        mask = ~clipped[:, n]
+        if mask.sum() < 2:
+            assert clipped_fit[n]
+            continue
+
+        expected = np.polyfit(exposure[mask], intensity[mask, n], deg=1)
+        assert np.isclose(slope[n], expected[0])
+        assert np.isclose(bias[n], expected[1])
+        assert deviation[n] > 0
+
+
+def test_bias_fitter_two_exposures():
+    n_numbers = 16
+    exposure = np.array([1, 2, 5])
+
+    intensity = 1 + 2*exposure[:, np.newaxis] + np.random.randn(len(exposure), n_numbers)
+    clipped = np.zeros_like(intensity, dtype=bool)
+    clipped[-1, :4] = True  # отсчеты аппроксимируются по двум экспозициям
+    clipped[1:, 4] = True  # отсчет не определен
+
+    fitter = BiasFitter(n_numbers)
+    for x, y, mask in zip(exposure, intensity, clipped):
+        fitter.update(exposure=x, intensity=y, clipped=mask)
+    bias, slope, deviation, clipped_fit = fitter.fit()
+
+    assert np.array_equal(np.flatnonzero(clipped_fit), [4])
+    assert np.all(np.isfinite(bias)) and np.all(np.isfinite(slope)) and np.all(np.isfinite(deviation))
+    assert np.all(deviation[:4] > 0)
+    assert bias[4] == np.median(bias[~clipped_fit])
+    assert all(np.all(np.isfinite(value)) for value in fitter.covariance())
+
+
+def test_bias_fitter_two_exposures_only():
+    n_numbers = 16
+
+    fitter = BiasFitter(n_numbers)
+    for x in (1, 2):
+        fitter.update(exposure=x, intensity=np.random.randn(n_numbers))
+
+    with pytest.raises(CalibrationError):
+        fitter.fit()
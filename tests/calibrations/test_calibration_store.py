@@ -0,0 +1,127 @@
+import logging
+from functools import partial
+import os
+
+import numpy as np
+import pytest
+
+from tests.fakes.device import device_manager_factory
+from vmk_spectrum3_wrapper.calibration import CalibrationKey, CalibrationStore, calibrate_dark, fingerprint, get_assembly_ids
+from vmk_spectrum3_wrapper.data import Data, Meta
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+from vmk_spectrum3_wrapper.measurement_manager.filters import StandardIntegrationPreset
+from vmk_spectrum3_wrapper.units import Units
+
+
+@pytest.fixture
+def fake_dark() -> Data:
+    n_numbers = 16
+
+    return Data(
+        units=Units.percent,
+        intensity=np.random.randn(n_numbers),
+        clipped=np.zeros(n_numbers, dtype=bool),
+        deviation=np.ones(n_numbers),
+        meta=Meta(exposure=(1, 10), capacity=(10, 1), started_at=0, finished_at=1),
+    )
+
+
+def test_calibration_store_save_load(
+    tmp_path,
+    fake_dark: Data,
+):
+    key = CalibrationKey(kind='dark', exposure=(1, 10), capacity=(10, 1), units=Units.percent)
+
+    store = CalibrationStore(tmp_path)
+    store.save(key, fake_dark)
+
+    dark = CalibrationStore(tmp_path).load(key)
+    assert isinstance(dark.intensity, np.memmap)
+    assert np.all(dark.intensity == fake_dark.intensity)
+    assert np.all(dark.deviation == fake_dark.deviation)
+    assert dark.meta == fake_dark.meta
+
+    assert CalibrationStore(tmp_path).load(CalibrationKey(kind='dark', exposure=(1, 20), capacity=(10, 1), units=Units.percent)) is None
+
+
+def test_calibration_store_overwrite(
+    tmp_path,
+    fake_dark: Data,
+):
+    key = CalibrationKey(kind='dark', exposure=(1, 10), capacity=(10, 1), units=Units.percent)
+
+    store = CalibrationStore(tmp_path)
+    store.save(key, fake_dark)
+    dark = store.load(key)
+    intensity = np.array(dark.intensity)
+
+    store.save(key, Data(units=Units.percent, intensity=fake_dark.intensity + 1, meta=fake_dark.meta))
+
+    assert np.all(dark.intensity == intensity)  # загруженная ранее калибровка не изменяется
+    assert np.all(store.load(key).intensity == fake_dark.intensity + 1)
+    assert sorted(os.listdir(tmp_path)) == sorted([CalibrationStore.INDEX, *[f'{key.name}.{name}.npy' for name in ('intensity', 'clipped', 'deviation', 'number')]])
+
+
+def test_calibration_store_expiry(
+    tmp_path,
+    fake_dark: Data,
+):
+    key = CalibrationKey(kind='dark', exposure=1., capacity=10, units=Units.percent)
+
+    store = CalibrationStore(tmp_path, expiry=60)
+    store.save(key, fake_dark)
+
+    assert key in store
+    assert store.load(key) is not None
+    assert store.load(key, timestamp=store._index[key.name]['created_at'] + 61) is None
+
+    store.remove(key)
+    assert key not in store
+    assert len(store) == 0
+
+
+def test_calibration_key():
+    assert CalibrationKey('dark', 1, 10, Units.percent).name == CalibrationKey('dark', 1., 10, Units.percent).name
+    assert CalibrationKey('dark', 1, 10, Units.percent).name != CalibrationKey('dark', 1, 10, Units.percent, assembly_ids=('0.0.0.2', )).name
+    assert CalibrationKey('dark', 1, 10, Units.percent).name != CalibrationKey('dark', 1, 10, Units.percent, bias='0123456789abcdef').name
+
+
+def test_calibration_store_find_bias(
+    tmp_path,
+    fake_dark: Data,
+):
+    bias = Data(units=Units.percent, intensity=np.random.randn(16))
+    store = CalibrationStore(tmp_path)
+    store.save(CalibrationKey(kind='bias', exposure=None, capacity=None, units=Units.percent), bias)
+    store.save(CalibrationKey(kind='dark', exposure=1, capacity=10, units=Units.percent, bias=fingerprint(bias)), fake_dark)
+
+    assert store.find('dark', exposure=1, capacity=10, assembly_ids=(), bias=bias) is not None
+    assert store.find('dark', exposure=1, capacity=10, assembly_ids=(), bias=None) is None
+
+    bias = Data(units=Units.percent, intensity=np.random.randn(16))
+    store.save(CalibrationKey(kind='bias', exposure=None, capacity=None, units=Units.percent), bias)
+    assert store.find('dark', exposure=1, capacity=10, assembly_ids=(), bias=store.find('bias', assembly_ids=())) is None  # `dark` измерен с прежним `bias`
+
+
+def test_calibrate_dark_store(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog,
+    tmp_path,
+):
+    monkeypatch.setattr(Device, 'config', DeviceConfigAuto(change_exposure_timeout=0))
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
+    caplog.set_level(logging.INFO)
+
+    device = Device()
+    device = device.connect()
+    store = CalibrationStore(tmp_path)
+
+    dark = calibrate_dark(device=device, exposure=1, capacity=10, store=store)
+
+    monkeypatch.setattr(Device, 'read', lambda *args, **kwargs: pytest.fail('dark is measured again!'))
+    dark_stored = calibrate_dark(device=device, exposure=1, capacity=10, store=store)
+    assert np.all(dark_stored.intensity == dark.intensity)
+
+    filter = StandardIntegrationPreset.from_store(store, exposure=1, capacity=10, assembly_ids=get_assembly_ids(device))
+    dark_filter = filter.filters[0].filters[-1]
+    assert np.all(dark_filter.offset.intensity == dark.intensity)
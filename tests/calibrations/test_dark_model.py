@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.calibration import DarkModel
+from vmk_spectrum3_wrapper.calibration.exceptions import CalibrationError
+from vmk_spectrum3_wrapper.data import Data
+from vmk_spectrum3_wrapper.units import Units
+
+
+N_NUMBERS = 32
+
+
+@pytest.fixture
+def fake_darks() -> tuple[list[float], list[Data]]:
+    exposure = [1, 2, 5, 10, 20]
+    bias = np.linspace(0, 1, N_NUMBERS)
+    rate = np.linspace(.01, .02, N_NUMBERS)
+
+    data = []
+    for tau in exposure:
+        clipped = np.zeros(N_NUMBERS, dtype=bool)
+        clipped[0] = True
+        data.append(Data(
+            units=Units.percent,
+            intensity=bias + rate*tau + 1e-3*np.random.randn(N_NUMBERS),
+            clipped=clipped,
+        ))
+
+    return exposure, data
+
+
+def test_dark_model_fit(
+    fake_darks: tuple[list[float], list[Data]],
+):
+    exposure, data = fake_darks
+
+    model = DarkModel.fit(exposure, data)
+
+    assert np.allclose(model.bias[1:], np.linspace(0, 1, N_NUMBERS)[1:], atol=1e-2)
+    assert np.allclose(model.rate[1:], np.linspace(.01, .02, N_NUMBERS)[1:], atol=1e-3)
+    assert np.isfinite(model.bias[0])  # неопределенный отсчет отмечается маской
+    assert model(1).clipped[0, 0]
+
+
+def test_dark_model_call(
+    fake_darks: tuple[list[float], list[Data]],
+):
+    exposure, data = fake_darks
+    model = DarkModel.fit(exposure, data)
+
+    dark = model(5)
+    assert dark.n_times == 1
+    assert dark.clipped[0, 0]
+    assert np.allclose(dark.intensity[0, 1:], data[2].intensity[0, 1:], atol=1e-2)
+    assert np.all(dark.deviation[0, 1:] > 0)
+    assert model(5) is dark
+
+    dark = model((3, 30))
+    assert dark.n_times == 2
+    assert np.allclose(dark[1, :].intensity, model(30).intensity, equal_nan=True)
+
+
+def test_dark_model_cache(
+    fake_darks: tuple[list[float], list[Data]],
+):
+    exposure, data = fake_darks
+    model = DarkModel.fit(exposure, data, maxsize=2)
+
+    dark = model(1)
+    model(2)
+    model(3)
+    assert model(1) is not dark
+
+    with pytest.raises(ValueError):
+        dark.intensity[0, 0] = 0
+
+
+def test_dark_model_inconsistent(
+    fake_darks: tuple[list[float], list[Data]],
+):
+    exposure, data = fake_darks
+
+    with pytest.raises(CalibrationError):
+        DarkModel.fit(exposure[:-1], data)
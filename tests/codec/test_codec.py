@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.codec import BlockReader, BlockWriter, Codec
+from vmk_spectrum3_wrapper.exception import CodecError
+
+
+@pytest.fixture
+def fake_frames() -> np.ndarray:
+    n_frames, n_numbers = 100, 256
+
+    signal = 1000 + 500*np.sin(np.linspace(0, 4*np.pi, n_numbers))
+    return (signal + 10*np.random.randn(n_frames, n_numbers)).clip(0, 2**16-1).astype('<u2')
+
+
+@pytest.mark.parametrize(
+    'compression', ['zlib', 'lzma'],
+)
+@pytest.mark.parametrize(
+    'filter', [None, 'shuffle', 'delta'],
+)
+def test_codec(
+    compression: str,
+    filter: str | None,
+    fake_frames: np.ndarray,
+):
+    codec = Codec(compression=compression, filter=filter, block_size=16)
+
+    blocks = codec.encode(fake_frames)
+    assert len(blocks) == 7
+    assert sum(map(len, blocks)) < fake_frames.nbytes
+
+    assert np.array_equal(codec.decode(blocks, dtype=fake_frames.dtype, shape=fake_frames.shape), fake_frames)
+    assert np.array_equal(codec.decode(blocks[2:4], dtype=fake_frames.dtype, shape=fake_frames.shape, start=2), fake_frames[32:64])
+
+    codec.close()
+
+
+def test_codec_delta_float():
+    codec = Codec(filter='delta')
+
+    with pytest.raises(CodecError):
+        codec.encode(np.random.randn(10, 10))
+
+
+@pytest.mark.parametrize(
+    ['dtype', 'expected'],
+    [(np.uint16, 'delta'), (np.int64, 'delta'), (np.float64, 'shuffle'), (np.bool_, 'shuffle')],
+)
+def test_codec_for_dtype(
+    dtype: type,
+    expected: str,
+):
+    codec = Codec(filter='delta').for_dtype(dtype)
+    value = np.arange(20).reshape(2, 10).astype(dtype)
+
+    assert codec.dumps()['filter'] == expected
+    assert np.array_equal(codec.decode(codec.encode(value), dtype=value.dtype, shape=value.shape), value)
+
+    codec.close()
+
+
+def test_block_file(
+    tmp_path,
+    fake_frames: np.ndarray,
+):
+    filepath = os.path.join(tmp_path, 'frames.bin')
+    codec = Codec(filter='delta', block_size=16)
+
+    writer = BlockWriter(filepath, dtype=(fake_frames.dtype, fake_frames.shape[1:]), codec=codec)
+    for frame in fake_frames:
+        writer.write(frame)
+    writer.close()
+
+    reader = BlockReader(filepath)
+    assert len(reader) == len(fake_frames)
+    assert reader.n_blocks == 7
+    assert np.array_equal(reader[:], fake_frames)
+    assert np.array_equal(reader[20:40], fake_frames[20:40])
+    assert np.array_equal(reader[[5, 50, 99]], fake_frames[[5, 50, 99]])
+    assert np.array_equal(reader[-1], fake_frames[-1])
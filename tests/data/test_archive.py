@@ -0,0 +1,123 @@
+from functools import partial
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from tests.fakes.device import device_manager_factory
+from vmk_spectrum3_wrapper.data import Archive, Data, Meta
+from vmk_spectrum3_wrapper.data.exceptions import ArchiveError
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+from vmk_spectrum3_wrapper.units import Units
+
+
+def fake_data_factory(started_at: float, exposure, capacity, n_numbers: int = 32) -> Data:
+    n_times = 2 if isinstance(exposure, tuple) else 1
+
+    return Data(
+        units=Units.percent,
+        intensity=np.full((n_times, n_numbers), started_at),
+        clipped=np.zeros((n_times, n_numbers), dtype=bool),
+        meta=Meta(exposure=exposure, capacity=capacity, started_at=started_at, finished_at=started_at + .5),
+    )
+
+
+@pytest.fixture
+def fake_archive(tmp_path) -> Archive:
+    archive = Archive(tmp_path)
+
+    for t in range(100):
+        if t % 10 == 0:
+            archive.append(fake_data_factory(t, exposure=(1, 100), capacity=(100, 1)))
+        else:
+            archive.append(fake_data_factory(t, exposure=10 if t % 2 else 20, capacity=10))
+
+    return archive
+
+
+def test_archive_getitem(
+    fake_archive: Archive,
+):
+    data = fake_archive[11]
+
+    assert isinstance(data.intensity, np.memmap)
+    assert np.all(data.intensity == 11)
+    assert data.clipped is not None
+    assert data.deviation is None
+    assert data.meta == Meta(exposure=10, capacity=10, started_at=11, finished_at=11.5)
+
+    data = fake_archive[20]
+    assert data.n_times == 2
+    assert data.meta.exposure == (1, 100)
+
+
+def test_archive_dtype(
+    fake_archive: Archive,
+):
+    n_numbers = 32
+
+    fake_archive.append(Data(
+        units=Units.digit,
+        intensity=np.arange(2*n_numbers, dtype=np.uint16).reshape(2, n_numbers),
+        deviation=np.ones((2, n_numbers), dtype=np.float32),
+        number=np.arange(100, 100 + n_numbers, dtype=np.int32),
+        meta=Meta(exposure=10, capacity=2, started_at=100, finished_at=100.5),
+    ))
+
+    data = fake_archive[-1]
+    assert data.units == Units.digit
+    assert data.intensity.dtype == np.uint16
+    assert np.all(data.intensity == np.arange(2*n_numbers).reshape(2, n_numbers))
+    assert data.deviation.dtype == np.float32
+    assert np.all(data.number == np.arange(100, 100 + n_numbers))
+    assert np.all(fake_archive[-2].intensity == 99)
+
+
+def test_archive_query(
+    fake_archive: Archive,
+):
+    assert list(fake_archive.query(started_after=10, started_before=20)) == list(range(10, 20))
+    assert list(fake_archive.query(started_after=10, started_before=20, exposure=10)) == [11, 13, 15, 17, 19]
+    assert list(fake_archive.query(schema='extended')) == list(range(0, 100, 10))
+    assert list(fake_archive.query(exposure=(1, 100), capacity=(100, 1))) == list(range(0, 100, 10))
+
+    data = fake_archive.select(started_after=95, capacity=10)
+    assert [datum.meta.started_at for datum in data] == [95, 96, 97, 98, 99]
+
+
+def test_archive_reopen(
+    tmp_path,
+    fake_archive: Archive,
+):
+    archive = Archive(tmp_path)
+    assert len(archive) == 100
+
+    archive.append(fake_data_factory(100, exposure=10, capacity=10))
+    assert np.all(Archive(tmp_path)[100].intensity == 100)
+
+
+def test_archive_append_unordered(
+    fake_archive: Archive,
+):
+    with pytest.raises(ArchiveError):
+        fake_archive.append(fake_data_factory(0, exposure=10, capacity=10))
+
+
+def test_archive_clock_origin(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+):
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
+    archive = Archive(tmp_path)
+
+    for origin in (1e+6, 0):  # монотонные часы начинают отсчет заново (перезапуск процесса)
+        counter = itertools.count()
+        monkeypatch.setattr(time, 'perf_counter', lambda: origin + 1e-3*next(counter))
+
+        device = Device(config=DeviceConfigAuto(change_exposure_timeout=0)).connect()
+        device.setup(n_times=2, exposure=1, capacity=2)
+        archive.append(device.read(timeout=0))
+
+    assert len(archive) == 2
+    assert list(archive.query(started_after=time.time() - 60*60)) == [0, 1]
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.data import Data, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters.switch_filters import split_shots
+from vmk_spectrum3_wrapper.units import Units
+
+
+@pytest.fixture
+def fake_datum() -> Datum:
+    intensity = np.arange(6*100, dtype=float).reshape(6, 100)
+
+    return Datum(
+        units=Units.percent,
+        intensity=intensity,
+        clipped=intensity > 500,
+        deviation=np.sqrt(intensity),
+        shared=False,
+    )
+
+
+@pytest.mark.parametrize(
+    'index',
+    [
+        (slice(1, 3), slice(10, 20)),
+        (0, slice(None)),
+        (slice(None), 5),
+        (np.array([0, 2, 4]), np.arange(10, 20)),
+        (-1, slice(None, None, 2)),
+    ],
+)
+def test_datum_getitem_view(
+    fake_datum: Datum,
+    index,
+):
+    datum = fake_datum[index]
+
+    assert datum.shared
+    assert datum.intensity.ndim == 2
+    assert np.shares_memory(datum.intensity, fake_datum.intensity)
+    assert np.shares_memory(datum.clipped, fake_datum.clipped)
+    assert np.array_equal(datum.number, np.atleast_1d(np.arange(100)[index[1]]))
+
+
+def test_datum_getitem_copy(
+    fake_datum: Datum,
+):
+    index = (np.array([0, 1, 3]), slice(None))
+    datum = fake_datum[index]
+
+    assert not datum.shared
+    assert not np.shares_memory(datum.intensity, fake_datum.intensity)
+    assert np.array_equal(datum.intensity, fake_datum.intensity[index])
+
+
+def test_data_getitem_view(
+    fake_datum: Datum,
+):
+    data = Data(
+        units=fake_datum.units,
+        intensity=fake_datum.intensity,
+    )
+
+    assert np.shares_memory(data[1:3, 10:20].intensity, data.intensity)
+    assert data[:, 5].intensity.shape == (6, 1)
+
+
+@pytest.mark.parametrize(
+    'capacity',
+    [(1, 1), (2, 4), (3, 3)],
+)
+def test_split_shots_view(
+    fake_datum: Datum,
+    capacity,
+):
+    datum = fake_datum[:sum(capacity), :]
+    shots = split_shots(datum, capacity=capacity)
+
+    assert [shot.n_times for shot in shots] == list(capacity)
+    for shot in shots:
+        assert shot.shared == datum.shared
+        assert np.shares_memory(shot.intensity, datum.intensity)
@@ -0,0 +1,158 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.codec import Codec
+from vmk_spectrum3_wrapper.data import Data, Meta
+from vmk_spectrum3_wrapper.data.exceptions import DataFormatError
+from vmk_spectrum3_wrapper.data.io import read_header
+from vmk_spectrum3_wrapper.units import Units
+
+
+@pytest.fixture
+def fake_data() -> Data:
+    n_times, n_numbers = 5, 100
+    started_at = time.time()
+
+    return Data(
+        units=Units.electron,
+        intensity=np.random.randn(n_times, n_numbers),
+        clipped=np.random.rand(n_times, n_numbers) > .9,
+        deviation=np.random.rand(n_times, n_numbers),
+        meta=Meta(exposure=(1, 10), capacity=(10, 1), started_at=started_at, finished_at=started_at + 1),
+    )
+
+
+def test_data_save_load(
+    tmp_path,
+    fake_data: Data,
+):
+    filepath = os.path.join(tmp_path, 'data.dat')
+    fake_data.save(filepath)
+
+    data = Data.load(filepath)
+    assert isinstance(data.intensity, np.memmap)
+    assert data.units == fake_data.units
+    assert data.meta == fake_data.meta
+    assert np.all(data.intensity == fake_data.intensity)
+    assert np.all(data.clipped == fake_data.clipped)
+    assert np.all(data.deviation == fake_data.deviation)
+
+    for section in read_header(filepath)['sections'].values():
+        assert section['offset'] % 64 == 0
+
+
+def test_data_save_load_rejected(
+    tmp_path,
+    fake_data: Data,
+):
+    rejected = np.random.randint(0, 10, size=fake_data.intensity.shape)
+    fake_data = Data(units=fake_data.units, intensity=fake_data.intensity, rejected=rejected, meta=fake_data.meta)
+
+    filepath = os.path.join(tmp_path, 'data.dat')
+    fake_data.save(filepath)
+
+    assert np.array_equal(Data.load(filepath).rejected, rejected)
+    assert np.array_equal(Data.load(filepath, index=(slice(1, 3), slice(10, 20))).rejected, rejected[1:3, 10:20])
+    assert Data.loads(fake_data.dumps()).rejected is not None
+
+
+def test_data_load_meta(
+    tmp_path,
+    fake_data: Data,
+):
+    filepath = os.path.join(tmp_path, 'data.dat')
+    fake_data.save(filepath)
+
+    assert Data.load_meta(filepath) == fake_data.meta
+
+
+@pytest.mark.parametrize(
+    'index',
+    [
+        (slice(1, 3), slice(10, 20)),
+        (slice(None), np.array([1, 5, 50])),
+    ],
+)
+def test_data_load_index(
+    tmp_path,
+    fake_data: Data,
+    index,
+):
+    filepath = os.path.join(tmp_path, 'data.dat')
+    fake_data.save(filepath)
+
+    data = Data.load(filepath, index=index)
+    assert np.all(data.intensity == fake_data.intensity[index])
+    assert np.all(data.number == np.arange(fake_data.n_numbers)[index[1]])
+
+
+def test_data_load_legacy(
+    tmp_path,
+    fake_data: Data,
+):
+    filepath = os.path.join(tmp_path, 'data.pkl')
+    with open(filepath, 'bw') as file:
+        pickle.dump(fake_data.dumps(), file)
+
+    data = Data.load(filepath)
+    assert np.all(data.intensity == fake_data.intensity)
+
+
+def test_data_load_short(
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'data.dat')
+    with open(filepath, 'bw') as file:
+        file.write(b'VMKDATA\x00')
+
+    with pytest.raises(DataFormatError):
+        Data.load(filepath)
+
+
+@pytest.mark.parametrize(
+    'index',
+    [
+        None,
+        (slice(1, 3), slice(10, 20)),
+        (4, slice(None)),
+        (np.array([0, 4]), slice(10, 20)),
+    ],
+)
+def test_data_save_load_codec(
+    tmp_path,
+    fake_data: Data,
+    index,
+):
+    filepath = os.path.join(tmp_path, 'data.dat')
+    fake_data.save(filepath, codec=Codec(block_size=2))
+
+    data = Data.load(filepath, index=index)
+    expected = fake_data if index is None else fake_data[index]
+    assert np.array_equal(data.intensity, expected.intensity)
+    assert np.array_equal(data.clipped, expected.clipped)
+    assert np.array_equal(data.deviation, expected.deviation)
+
+
+def test_data_save_load_codec_delta(
+    tmp_path,
+    fake_data: Data,
+):
+    rejected = np.random.randint(0, 10, size=fake_data.intensity.shape)
+    fake_data = Data(units=fake_data.units, intensity=fake_data.intensity, clipped=fake_data.clipped, deviation=fake_data.deviation, rejected=rejected, meta=fake_data.meta)
+
+    filepath = os.path.join(tmp_path, 'data.dat')
+    fake_data.save(filepath, codec=Codec(filter='delta', block_size=2))
+
+    data = Data.load(filepath)
+    assert np.array_equal(data.intensity, fake_data.intensity)
+    assert np.array_equal(data.clipped, fake_data.clipped)
+    assert np.array_equal(data.deviation, fake_data.deviation)
+    assert np.array_equal(data.rejected, fake_data.rejected)
+
+    sections = read_header(filepath)['sections']
+    assert sections['clipped']['codec']['filter'] == 'shuffle'
+    assert sections['rejected']['codec']['filter'] == 'delta'
@@ -0,0 +1,86 @@
+import time
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.data import Data
+from vmk_spectrum3_wrapper.data.plotting import decimate, plot_data, step
+from vmk_spectrum3_wrapper.units import Units
+
+
+matplotlib.use('Agg')
+
+
+def test_step():
+    number = np.arange(4)
+    intensity = np.array([[1., 2., 3., 4.]])
+
+    xs, ys = step(number, intensity)
+
+    assert np.array_equal(xs, [0, .5, .5, 1.5, 1.5, 2.5, 2.5, 3])
+    assert np.array_equal(ys, [[1, 1, 2, 2, 3, 3, 4, 4]])
+
+
+@pytest.mark.parametrize(
+    'n_bins',
+    [10, 64, 333],
+)
+def test_decimate(
+    n_bins: int,
+):
+    intensity = np.random.randn(3, 2048)
+    intensity[1, 1234] = 100
+
+    xs, ys = decimate(np.arange(2048), intensity, n_bins=n_bins)
+
+    assert len(xs) <= 2*n_bins
+    assert ys.shape == (3, len(xs))
+    assert np.array_equal(np.max(ys, axis=1), np.max(intensity, axis=1))
+    assert np.array_equal(np.min(ys, axis=1), np.min(intensity, axis=1))
+
+
+@pytest.mark.parametrize(
+    'kind, n_times',
+    [
+        ('lines', 1),
+        ('lines', 10),
+        ('image', 10),
+        ('auto', 3600),
+    ],
+)
+def test_plot_data(
+    kind: str,
+    n_times: int,
+):
+    intensity = np.random.randn(n_times, 2048)
+    clipped = np.zeros(intensity.shape, dtype=bool)
+    clipped[:, ::100] = True
+    fig, ax = plt.subplots(figsize=(6, 4))
+
+    started_at = time.perf_counter()
+    kind = plot_data(ax, np.arange(2048), intensity, clipped=clipped, kind=kind)
+    fig.canvas.draw()
+
+    assert time.perf_counter() - started_at < 10
+    assert len(ax.collections) == (2 if kind == 'lines' else 1)
+    assert len(ax.images) == (kind == 'image')
+    assert len(ax.lines) == 0
+
+    plt.close(fig)
+
+
+def test_data_show(
+    monkeypatch,
+):
+    monkeypatch.setattr(plt, 'show', lambda: None)
+    data = Data(
+        units=Units.percent,
+        intensity=np.random.randn(100, 2048),
+    )
+
+    data.show()
+
+    assert len(plt.gca().images) == 1
+    plt.close('all')
@@ -0,0 +1,72 @@
+from functools import partial
+import time
+
+import pytest
+
+from tests.fakes.experiment.emulator import SpectrumEmulator, create_spectrum_kernel
+from tests.fakes.realtime import realtime_device_manager_factory
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.detector import Detector
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+
+
+def create_device(monkeypatch: pytest.MonkeyPatch, **kwargs) -> Device:
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(realtime_device_manager_factory, **kwargs))
+
+    return Device(config=DeviceConfigAuto(change_exposure_timeout=0)).connect()
+
+
+@pytest.mark.parametrize(
+    ['exposure', 'n_times'],
+    [(1, 20), (2, 10)],
+)
+def test_device_realtime_read(exposure: float, n_times: int, monkeypatch: pytest.MonkeyPatch):
+    emulator = SpectrumEmulator(create_spectrum_kernel(Detector.BLPP2000, light=5), detector=Detector.BLPP2000)
+    device = create_device(monkeypatch, emulator=emulator)
+
+    device.setup(n_times=n_times, exposure=exposure)
+    started_at = time.perf_counter()
+    data = device.read(timeout=1)
+
+    assert data.n_times == n_times
+    assert data.n_numbers == Detector.BLPP2000.config.n_pixels
+    assert time.perf_counter() - started_at >= 1e-3*exposure*n_times
+    assert device.telemetry.n_frames == n_times
+
+
+def test_device_realtime_slow_consumer(monkeypatch: pytest.MonkeyPatch):
+    device = create_device(monkeypatch)
+
+    def callback(datum: Datum) -> None:
+        time.sleep(5e-3)
+    device.subscribe(callback)
+
+    device.setup(n_times=10, exposure=1)
+    data = device.read(timeout=1)
+
+    assert data.n_times == 10
+    assert device.telemetry.n_late > 0
+    assert device.telemetry.dumps()['callback']['max'] >= 5e-3
+
+
+def test_device_realtime_drops(monkeypatch: pytest.MonkeyPatch):
+    device = create_device(monkeypatch, drop_rate=.2, seed=0)
+
+    device.setup(n_times=100, exposure=.1)
+    device.read(blocking=False, timeout=0)
+    assert device.device_manager.join(timeout=5)
+
+    assert device.device_manager.n_dropped > 0
+    assert device.telemetry.n_frames == device.device_manager.n_emitted == 100 - device.device_manager.n_dropped
+    assert 0 < device.telemetry.n_dropped <= device.device_manager.n_dropped
+
+
+def test_device_realtime_assemblies(monkeypatch: pytest.MonkeyPatch):
+    device = create_device(monkeypatch, assembly_ids=('0.0.0.1', '0.0.0.2'), jitter=.1)
+
+    device.setup(n_times=10, exposure=.5)
+    device.read(blocking=False, timeout=0)
+    assert device.device_manager.join(timeout=5)
+
+    assert device.telemetry.dumps()['frames'] == {'0.0.0.1': 10, '0.0.0.2': 10}
+    assert device.telemetry.n_dropped == 0
@@ -0,0 +1,129 @@
+import os
+import time
+
+import numpy as np
+import pyspectrum3 as ps3
+import pytest
+
+from vmk_spectrum3_wrapper.codec import Codec
+from vmk_spectrum3_wrapper.device import Device, DeviceConfigReplay, ReplayDeviceManager
+from vmk_spectrum3_wrapper.measurement_manager.filters import EyeFilter, PipeFilter
+from vmk_spectrum3_wrapper.recorder import RawFrameRecorder, Recording, record_dtype
+from vmk_spectrum3_wrapper.types import Path, Second
+
+
+N_NUMBERS = 2048
+
+
+def create_recording(filepath: Path, n_frames: int, interval: Second = 1e-3, assembly_ids: tuple[str, ...] = ('0.0.0.2', )) -> np.ndarray:
+    records = np.lib.format.open_memmap(filepath, mode='w+', dtype=record_dtype(N_NUMBERS), shape=(n_frames, ))
+
+    records['frame'] = np.random.randint(0, 2**16-1, size=(n_frames, N_NUMBERS))
+    records['frame_number'] = np.arange(n_frames) // len(assembly_ids) + 1
+    records['assembly_id'] = [assembly_ids[n % len(assembly_ids)].encode() for n in range(n_frames)]
+    records['timestamp'] = 1_700_000_000 + interval*np.arange(n_frames)
+    records.flush()
+
+    return np.array(records)
+
+
+def create_device_manager(filepath: Path, n_frames: int, speed: float | None = None) -> tuple[ReplayDeviceManager, list]:
+    contexts = []
+
+    device_manager = ReplayDeviceManager(filepath, speed=speed)
+    device_manager.set_context_callback(lambda context: contexts.append((context.assembly_params.id, context.frame_state.frame_number, np.array(context.result))))
+    device_manager.set_measurement(ps3.Measurement(ps3.Exposure(1000), n_frames, 0))
+
+    return device_manager, contexts
+
+
+@pytest.mark.parametrize(
+    'assembly_ids', [('0.0.0.2', ), ('0.0.0.1', '0.0.0.2')],
+)
+def test_replay(assembly_ids: tuple[str, ...], tmp_path):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    records = create_recording(filepath, n_frames=20, assembly_ids=assembly_ids)
+
+    device_manager, contexts = create_device_manager(filepath, n_frames=20)
+    device_manager.read()
+
+    assert device_manager.join(timeout=5)
+    assert [assembly_id for assembly_id, _, _ in contexts] == [assembly_id.decode() for assembly_id in records['assembly_id']]
+    assert [frame_number for _, frame_number, _ in contexts] == records['frame_number'].tolist()
+    assert np.array_equal([frame for _, _, frame in contexts], records['frame'])
+
+
+def test_replay_compressed(tmp_path):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    frames = np.random.randint(0, 2**16-1, size=(50, N_NUMBERS))
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=100, codec=Codec(block_size=16)) as recorder:
+        for n, frame in enumerate(frames):
+            recorder.put(frame, frame_number=n + 1, assembly_id='0.0.0.2')
+
+    device_manager, contexts = create_device_manager(filepath, n_frames=50)
+    device_manager.read()
+
+    assert device_manager.join(timeout=5)
+    assert np.array_equal([frame for _, _, frame in contexts], frames)
+
+
+@pytest.mark.parametrize(
+    ['speed', 'duration'],
+    [(1, .1), (4, .025)],
+)
+def test_replay_speed(speed: float, duration: Second, tmp_path):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    create_recording(filepath, n_frames=11, interval=10e-3)
+
+    device_manager, contexts = create_device_manager(filepath, n_frames=11, speed=speed)
+    started_at = time.perf_counter()
+    device_manager.read()
+
+    assert device_manager.join(timeout=5)
+    assert len(contexts) == 11
+    assert duration <= time.perf_counter() - started_at < duration + 1
+
+
+def test_replay_position(tmp_path):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    create_recording(filepath, n_frames=15)
+
+    device_manager, contexts = create_device_manager(filepath, n_frames=10)
+    for _ in range(2):
+        device_manager.read()
+        device_manager.join()
+
+    assert len(contexts) == 15
+    assert device_manager.position == 15
+
+    device_manager.rewind()
+    device_manager.read()
+    device_manager.join()
+    assert len(contexts) == 25
+
+
+def test_device_read_replay(tmp_path):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    records = create_recording(filepath, n_frames=10)
+
+    device = Device(config=DeviceConfigReplay(filepath, speed=None)).connect()
+    assert device.status == {'0.0.0.2': ps3.AssemblyStatus.ALIVE}
+
+    replayed = os.path.join(tmp_path, 'replayed.npy')
+    with RawFrameRecorder(replayed, n_numbers=N_NUMBERS, capacity=10) as recorder:
+        device.recorder = recorder
+        device.setup(
+            n_times=10,
+            exposure=1,
+            filter=PipeFilter([
+                EyeFilter(),
+            ]),
+        )
+        data = device.read(timeout=0)
+
+    assert np.array_equal(data.intensity, records['frame'])
+
+    recording = Recording(replayed)
+    assert np.array_equal(recording.frame_number, records['frame_number'])
+    assert np.array_equal(recording.assembly_id, records['assembly_id'])
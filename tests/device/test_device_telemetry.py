@@ -0,0 +1,110 @@
+from functools import partial
+import time
+
+import numpy as np
+import pytest
+
+from tests.fakes.device import FakeDeviceManager, device_manager_factory
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+from vmk_spectrum3_wrapper.device.telemetry import Telemetry
+
+
+@pytest.fixture
+def device(monkeypatch: pytest.MonkeyPatch) -> Device:
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
+
+    return Device(config=DeviceConfigAuto(change_exposure_timeout=0)).connect()
+
+
+@pytest.mark.parametrize(
+    ['n_times', 'capacity'],
+    [(1, 1), (10, 1), (10, 10)],
+)
+def test_device_telemetry(n_times: int, capacity: int, device: Device):
+    device.setup(n_times=n_times, exposure=1, capacity=capacity)
+    device.read(timeout=0)
+
+    dump = device.telemetry.dumps()
+
+    assert dump['n_frames'] == n_times * capacity
+    assert dump['frames'] == {FakeDeviceManager.FAKE_IP: n_times * capacity}
+    assert dump['n_dropped'] == 0
+    assert dump['n_bytes'] > 0
+    assert dump['callback']['n_calls'] == n_times * capacity
+    assert dump['filter']['n_calls'] == n_times
+
+
+def test_device_telemetry_reset(device: Device):
+    device.setup(n_times=10, exposure=1)
+    device.read(timeout=0)
+
+    device.setup(n_times=1, exposure=1)
+
+    assert device.telemetry.n_frames == 0
+    assert device.telemetry.dumps()['frames'] == {}
+
+
+def test_telemetry_dropped():
+    telemetry = Telemetry()
+
+    for frame_number in [1, 2, 5, 6]:
+        telemetry.on_frame('0.0.0.1', frame_number=frame_number, n_bytes=4096)
+    for frame_number in [1, 2, 3]:
+        telemetry.on_frame('0.0.0.2', frame_number=frame_number, n_bytes=4096)
+    telemetry.on_queue(depth=3, n_rejected=1)
+
+    dump = telemetry.dumps()
+    assert dump['frames'] == {'0.0.0.1': 4, '0.0.0.2': 3}
+    assert dump['n_dropped'] == 2 + 1
+    assert dump['n_bytes'] == 7*4096
+    assert dump['queue_depth_max'] == 3
+
+
+def test_telemetry_rejected_origin():
+    telemetry = Telemetry()
+    telemetry.reset(n_rejected=5)  # кадры, отброшенные регистратором в предыдущих измерениях
+
+    telemetry.on_queue(depth=0, n_rejected=7)
+    assert telemetry.n_dropped == 2
+
+    telemetry.on_queue(depth=0, n_rejected=1)  # регистратор открыт заново
+    assert telemetry.n_dropped == 1
+
+
+def test_device_telemetry_storage_depth(device: Device):
+
+    def callback(datum: Datum) -> None:
+        time.sleep(1e-3)
+
+    device.subscribe(callback)
+    device.setup(n_times=10, exposure=1)
+    device._measurement_manager.storage.defer()
+    data = device.read(timeout=1)
+
+    dump = device.telemetry.dumps()
+    assert data.n_times == 10
+    assert dump['storage_depth_max'] > 0
+
+
+def test_telemetry_late():
+    telemetry = Telemetry(period=10, tolerance=2)
+
+    for frame_number, received_at in enumerate([0, .010, .020, .050, .060], start=1):
+        telemetry.on_frame('0.0.0.1', frame_number=frame_number, n_bytes=0, received_at=received_at)
+
+    assert telemetry.n_late == 1
+    assert telemetry.fps == pytest.approx(4 / .060)
+
+
+def test_telemetry_durations():
+    telemetry = Telemetry(maxsize=10)
+
+    for duration in np.linspace(0, 1, 100):
+        telemetry.on_callback(duration)
+
+    dump = telemetry.dumps()['callback']
+    assert dump['n_calls'] == 100
+    assert dump['max'] == 1
+    assert dump['p50'] == pytest.approx(np.median(np.linspace(0, 1, 100)[-10:]))
+    assert np.isnan(telemetry.dumps()['filter']['mean'])
@@ -0,0 +1,92 @@
+import logging
+import time
+from functools import partial
+
+import pytest
+
+from tests.fakes.realtime import realtime_device_manager_factory
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.device import CallbackWatchdog
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+
+
+def test_watchdog_overrun(caplog: pytest.LogCaptureFixture):
+    watchdog = CallbackWatchdog(threshold=1, window=10)
+    watchdog.reset(period=1)
+
+    with caplog.at_level(logging.WARNING):
+        for duration in [.5e-3, 2e-3, 2e-3, .5e-3, *[2e-3]*10]:
+            assert watchdog.update(duration) is False
+
+    assert watchdog.n_overruns == 12
+    assert not watchdog.is_deferred
+
+    records = [record for record in caplog.records if hasattr(record, 'watchdog')]
+    assert len(records) == 2
+    assert records[0].watchdog['n_overruns'] == 1
+    assert records[0].watchdog['period'] == 1e-3
+
+
+def test_watchdog_defer():
+    watchdog = CallbackWatchdog(defer=True, patience=3)
+    watchdog.reset(period=1)
+
+    assert [watchdog.update(duration) for duration in [2e-3, 2e-3, .5e-3, 2e-3, 2e-3, 2e-3, 2e-3]] == [False, False, False, False, False, True, False]
+    assert watchdog.is_deferred
+    assert watchdog.dumps()['deferred']
+
+    watchdog.reset(period=1)
+    assert not watchdog.is_deferred
+    assert watchdog.dumps()['n_calls'] == 0
+
+
+@pytest.mark.parametrize(
+    ['flush', 'expected'],
+    [(8e-3, True), (2e-3, False)],
+)
+def test_watchdog_defer_flush(
+    flush: float,
+    expected: bool,
+):
+    capacity = 5
+    watchdog = CallbackWatchdog(defer=True, patience=3)
+    watchdog.reset(period=1, capacity=capacity)
+
+    durations = [*[.1e-3]*(capacity - 1), flush] * 3  # переполняется только обработка буфера фильтром
+    deferred = [watchdog.update(duration) for duration in durations]
+
+    assert watchdog.n_overruns == 3
+    assert deferred[-1] == expected
+    assert not any(deferred[:-1])
+    assert watchdog.is_deferred == expected
+
+
+def test_watchdog_defer_extended():
+    watchdog = CallbackWatchdog(defer=True, patience=1)
+    watchdog.reset(period=(1, 10), capacity=(2, 1))  # длительность схемы измерения 12 мс
+
+    assert [watchdog.update(duration) for duration in [.1e-3, .1e-3, 11e-3, .1e-3, .1e-3, 13e-3]] == [False]*5 + [True]
+    assert watchdog.dumps()['period'] == 1e-3
+
+
+def test_device_watchdog_defer(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(realtime_device_manager_factory))
+
+    def callback(datum: Datum) -> None:
+        time.sleep(3e-3)
+
+    device = Device(
+        config=DeviceConfigAuto(change_exposure_timeout=0),
+        watchdog=CallbackWatchdog(defer=True, patience=2),
+    ).connect()
+    device.subscribe(callback)
+    device.setup(n_times=20, exposure=1)
+    data = device.read(timeout=1)
+
+    assert data.n_times == 20
+    assert device.watchdog.is_deferred
+    assert device._measurement_manager.storage.deferred
+
+    device.setup(n_times=1, exposure=1)
+    assert not device.watchdog.is_deferred
+    assert not device._measurement_manager.storage.deferred
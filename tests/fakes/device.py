@@ -4,6 +4,7 @@ import logging
 import numpy as np
 import pyspectrum3 as ps3
 
+from tests.fakes.experiment.emulator import SpectrumEmulator
 from vmk_spectrum3_wrapper.device.device_config import DeviceConfig
 from vmk_spectrum3_wrapper.types import Array, Digit
 
@@ -47,8 +48,10 @@ class FakeDeviceManager:
     def __init__(
         self,
         state: FakeDeviceState,
+        emulator: SpectrumEmulator | None = None,
     ):
         self.state = state
+        self.emulator = emulator
 
         self.on_context = None
         self.on_status = None
@@ -94,7 +97,12 @@ class FakeDeviceManager:
     def read(self) -> None:
         n_frames = self.measurement.read_frames_num
 
-        result = np.random.randint(0, 2**16-1, size=(n_frames, 2048))
+        if self.emulator is None:
+            result = np.random.randint(0, 2**16-1, size=(n_frames, 2048))
+        else:
+            exposure = self.measurement.exposure
+            exposure = (exposure.double.exposure[0] if exposure.is_double else exposure.single) / 1000
+            result = self.emulator.emulate(n_frames, exposure=exposure, dtype=np.uint16)
 
         for n in range(n_frames):
             self.on_context(
@@ -109,9 +117,11 @@ class FakeDeviceManager:
 def device_manager_factory(
     config: DeviceConfig,
     state: bool | None = None,
+    emulator: SpectrumEmulator | None = None,
 ) -> FakeDeviceManager:
     state = state or FakeDeviceState()
 
     return FakeDeviceManager(
         state=state,
+        emulator=emulator,
     )
@@ -6,7 +6,6 @@ from vmk_spectrum3_wrapper.detector import Detector
 from vmk_spectrum3_wrapper.noise import Noise
 from vmk_spectrum3_wrapper.types import Array, Digit, MilliSecond, Percent
 from vmk_spectrum3_wrapper.units import to_digit, Units
-from tests.fakes.experiment.config import SpectrumKernelConfig
 
 
 # class SpectrumKernelFactory:
@@ -55,21 +54,24 @@ class SpectrumKernel:
         return self.bias + exposure * (self.dark_current + self.light_current)
 
 
-ZERO_SPECTRUM_KERNEL = SpectrumKernel(
-    bias=to_digit(5, units=Units.percent),
-    durk_current=to_digit(0.01/100, units=Units.percent),
-    light_current=to_digit(
-        np.zeros(DEFAULT_DETECTOR.config.n_pixels),
-        units=Units.percent),
-)
-LINEAR_SPECTRUM_KERNEL = SpectrumKernel(
-    bias=to_digit(5, units=Units.percent),
-    durk_current=to_digit(0.01/100, units=Units.percent),
-    light_current=to_digit(
-        np.linspace(0, 100, DEFAULT_DETECTOR.config.n_pixels),
-        units=Units.percent,
-    ),
-)
+def create_spectrum_kernel(
+    detector: Detector = DEFAULT_DETECTOR,
+    light: Percent = 0,
+) -> SpectrumKernel:
+    """Ядро спектра с линейно нарастающим до `light` световым сигналом."""
+
+    return SpectrumKernel(
+        bias=to_digit(5, units=Units.percent),
+        dark_current=to_digit(0.01/100, units=Units.percent),
+        light_current=to_digit(
+            np.linspace(0, light, detector.config.n_pixels),
+            units=Units.percent,
+        ),
+    )
+
+
+ZERO_SPECTRUM_KERNEL = create_spectrum_kernel(light=0)
+LINEAR_SPECTRUM_KERNEL = create_spectrum_kernel(light=100)
 
 
 class SpectrumEmulator():
@@ -96,9 +98,13 @@ class SpectrumEmulator():
         self,
         n_frames: int,
         exposure: MilliSecond,
+        dtype: np.dtype | None = None,
     ) -> Array[Digit]:
+        """Кадры `n_frames` (если задан `dtype`, то округленные и ограниченные разрядностью АЦП)."""
 
         value = self.kernel(exposure=exposure)
-        value += np.random.randn(n_frames, len(value)) * self.noise(value)
+        value = value + np.random.randn(n_frames, len(value)) * self.noise(value)
 
+        if dtype is not None:
+            value = np.clip(np.round(value), 0, self.adc.value_max).astype(dtype)
         return value
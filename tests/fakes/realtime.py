@@ -0,0 +1,159 @@
+"""Фейковый драйвер, выдающий кадры в реальном времени (для нагрузочных тестов без оборудования).
+
+Кадры выдаются из отдельного потока драйвера с периодом, заданным временем экспозиции `ps3.Measurement`;
+callback вызывается синхронно, поэтому медленный потребитель задерживает последующие кадры (как и в драйвере).
+Кадры берутся из заранее сформированных `SpectrumEmulator` шаблонов, поэтому генерация кадров не нагружает поток драйвера.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+import pyspectrum3 as ps3
+
+from tests.fakes.device import FakeAssemblyContext, FakeDeviceManager, FakeDeviceState
+from tests.fakes.experiment.emulator import SpectrumEmulator
+from vmk_spectrum3_wrapper.device.device_config import DeviceConfig
+from vmk_spectrum3_wrapper.types import Array, Digit, MilliSecond, Second
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RealtimeDeviceManager(FakeDeviceManager):
+    """Фейковый драйвер реального времени.
+
+    Параметры:
+        `assembly_ids` - идентификаторы сборок (каждая сборка выдает свой кадр с собственной нумерацией);
+        `n_templates` - количество шаблонов кадров каждого времени экспозиции;
+        `jitter` - стандартное отклонение момента выдачи кадра;
+        `drop_rate` - вероятность потери кадра (номер потерянного кадра пропускается);
+        `seed` - начальное значение генератора случайных чисел.
+    """
+
+    def __init__(
+        self,
+        state: FakeDeviceState,
+        emulator: SpectrumEmulator | None = None,
+        assembly_ids: tuple[str, ...] = (FakeDeviceManager.FAKE_IP, ),
+        n_templates: int = 16,
+        jitter: MilliSecond = 0,
+        drop_rate: float = 0,
+        seed: int | None = None,
+    ):
+        super().__init__(state=state, emulator=emulator)
+
+        self.assembly_ids = assembly_ids
+        self.n_templates = n_templates
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+
+        self._rng = np.random.default_rng(seed)
+        self._schema = None  # времена экспозиции (с) и шаблоны кадров схемы измерения
+        self._thread = None
+        self._stopped = threading.Event()
+
+        self.n_emitted = 0
+        self.n_dropped = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_measurement(self, measurement: ps3.Measurement) -> None:
+        super().set_measurement(measurement)
+
+        exposure = measurement.exposure
+        if exposure.is_double:
+            schema = list(zip(exposure.double.exposure, exposure.double.capacity))
+        else:
+            schema = [(exposure.single, 1)]
+
+        self._schema = [
+            (1e-6*tau, n, self._create_templates(1e-3*tau))
+            for tau, n in schema
+        ]
+
+    def read(self) -> None:
+        """Запустить выдачу кадров в потоке драйвера (не блокирует)."""
+        self.stop()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Second | None = None) -> bool:
+        """Дождаться окончания выдачи кадров; возвращает `True`, если выдача окончена."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+        return not self.is_running
+
+    def stop(self) -> None:
+        """Прервать выдачу кадров."""
+        self._stopped.set()
+        self.join()
+
+    def _create_templates(self, exposure: MilliSecond) -> Array[Digit]:
+        if self.emulator is None:
+            return self._rng.integers(0, 2**16-1, size=(self.n_templates, 2048), dtype=np.uint16)
+
+        return self.emulator.emulate(self.n_templates, exposure=exposure, dtype=np.uint16)
+
+    def _iter_frames(self, n_frames: int):
+        """Время экспозиции (с) и шаблон каждого из `n_frames` кадров (схема измерения повторяется)."""
+        n = 0
+        while True:
+            for tau, capacity, templates in self._schema:
+                for _ in range(capacity):
+                    if n == n_frames:
+                        return
+                    yield tau, templates[n % len(templates)]
+                    n += 1
+
+    def _run(self) -> None:
+        n_frames = self.measurement.read_frames_num
+        jitter = 1e-3*self.jitter
+
+        time_at = time.perf_counter()
+        for frame_number, (tau, frame) in enumerate(self._iter_frames(n_frames), start=1):
+            time_at += tau
+
+            delay = time_at - time.perf_counter() + (self._rng.normal(0, jitter) if jitter else 0)
+            if delay > 0:
+                self._stopped.wait(delay)
+            if self._stopped.is_set():
+                return
+
+            for assembly_id in self.assembly_ids:
+                if self.drop_rate and self._rng.random() < self.drop_rate:
+                    self.n_dropped += 1
+                    continue
+
+                try:
+                    self.on_context(
+                        context=FakeAssemblyContext(
+                            id=assembly_id,
+                            frame_number=frame_number,
+                            result=frame,
+                        ),
+                    )
+                except Exception as error:
+                    LOGGER.error(
+                        'An error was happend in context callback!',
+                        exc_info=error,
+                    )
+                self.n_emitted += 1
+
+
+def realtime_device_manager_factory(
+    config: DeviceConfig,
+    state: FakeDeviceState | None = None,
+    **kwargs,
+) -> RealtimeDeviceManager:
+    state = state or FakeDeviceState()
+
+    return RealtimeDeviceManager(
+        state=state,
+        **kwargs,
+    )
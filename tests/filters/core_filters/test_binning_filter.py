@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from tests.utils import calculate_clipped, calculate_deviation
+from vmk_spectrum3_wrapper.config import DEFAULT_DETECTOR
+from vmk_spectrum3_wrapper.data import Batch, Data, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters.core_filters import BinningFilter
+from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import DatumFilterError
+from vmk_spectrum3_wrapper.units import Units
+
+
+def test_binning_filter_skip():
+    filter = BinningFilter(
+        factor=None,
+    )
+
+    assert filter is None
+
+
+@pytest.mark.parametrize(
+    'factor',
+    [2, 4],
+)
+@pytest.mark.parametrize(
+    'is_averaging',
+    [True, False],
+)
+def test_binning_filter_call(
+    factor: int,
+    is_averaging: bool,
+):
+    units = Units.percent
+    intensity = np.linspace(0, 100, DEFAULT_DETECTOR.config.n_pixels)
+    clipped = np.zeros(DEFAULT_DETECTOR.config.n_pixels, dtype=bool)
+    clipped[1] = True
+    datum = Datum(
+        units=units,
+        intensity=intensity,
+        clipped=clipped,
+        deviation=calculate_deviation(intensity, units=units),
+    )
+    filter = BinningFilter(
+        factor=factor,
+        is_averaging=is_averaging,
+    )
+
+    datum_filtrated = filter(
+        datum=datum,
+    )
+
+    n = factor if is_averaging else 1
+    assert datum_filtrated.units == datum.units
+    assert datum_filtrated.n_times == datum.n_times
+    assert datum_filtrated.n_numbers == datum.n_numbers // factor
+    assert np.allclose(
+        datum_filtrated.intensity,
+        datum.intensity.reshape(1, -1, factor).sum(axis=-1) / n,
+    )
+    assert datum_filtrated.clipped[0, 0]
+    assert not np.any(datum_filtrated.clipped[0, 1:])
+    assert np.allclose(
+        datum_filtrated.deviation,
+        np.sqrt((datum.deviation.reshape(1, -1, factor)**2).sum(axis=-1)) / n,
+    )
+
+
+def test_binning_filter_batch():
+    units = Units.percent
+    intensity = np.random.randn(3, 2, DEFAULT_DETECTOR.config.n_pixels)
+    batch = Batch(
+        units=units,
+        intensity=intensity,
+        clipped=calculate_clipped(intensity, units=units),
+    )
+    filter = BinningFilter(
+        factor=2,
+    )
+
+    batch_filtrated = filter.batch(batch)
+
+    for datum, datum_filtrated in zip(batch, batch_filtrated):
+        assert np.allclose(datum_filtrated.intensity, filter(datum).intensity)
+        assert np.all(datum_filtrated.clipped == filter(datum).clipped)
+    assert batch_filtrated.deviation is None
+
+
+def test_binning_filter_bin():
+    units = Units.percent
+    intensity = np.full(DEFAULT_DETECTOR.config.n_pixels, 5.)
+    offset = Data(
+        units=units,
+        intensity=intensity,
+        clipped=calculate_clipped(intensity, units=units),
+        deviation=calculate_deviation(intensity, units=units),
+    )
+    filter = BinningFilter(
+        factor=2,
+    )
+
+    offset_binned = filter.bin_data(offset)
+
+    assert offset_binned.n_numbers == offset.n_numbers // 2
+    assert np.allclose(offset_binned.intensity, 5)
+
+
+def test_binning_filter_not_divisible():
+    datum = Datum(
+        units=Units.percent,
+        intensity=np.zeros(DEFAULT_DETECTOR.config.n_pixels + 1),
+    )
+    filter = BinningFilter(
+        factor=2,
+    )
+
+    with pytest.raises(DatumFilterError):
+        filter(datum)
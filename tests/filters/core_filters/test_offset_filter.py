@@ -69,3 +69,33 @@ def test_offset_filter_call(
         datum_filtrated.deviation,
         np.sqrt(datum.deviation**2 + fake_offset.deviation**2),
     ))
+
+
+@pytest.mark.parametrize(
+    'shared',
+    [True, False],
+)
+def test_offset_filter_shared(
+    shared: bool,
+    fake_offset: Data,
+):
+    units = Units.percent
+    intensity = np.linspace(0, 100, DEFAULT_DETECTOR.config.n_pixels)
+    datum = Datum(
+        units=units,
+        intensity=intensity.copy(),
+        clipped=calculate_clipped(intensity, units=units),
+        deviation=calculate_deviation(intensity, units=units),
+        shared=shared,
+    )
+    filter = OffsetFilter(
+        offset=fake_offset,
+    )
+
+    datum_filtrated = filter(
+        datum=datum,
+    )
+
+    assert np.allclose(datum_filtrated.intensity, intensity - fake_offset.intensity)
+    assert np.shares_memory(datum_filtrated.intensity, datum.intensity) != shared
+    assert not datum_filtrated.shared
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from tests.utils import calculate_clipped, calculate_deviation
+from vmk_spectrum3_wrapper.config import DEFAULT_DETECTOR
+from vmk_spectrum3_wrapper.data import Batch, Data, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters.core_filters import RegionFilter
+from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import DatumFilterError
+from vmk_spectrum3_wrapper.units import Units
+
+
+def test_region_filter_skip():
+    filter = RegionFilter(
+        index=None,
+    )
+
+    assert filter is None
+
+
+def test_region_filter_from_windows():
+    filter = RegionFilter.from_windows([(20, 25), (10, 12)])
+
+    assert np.all(filter.index == [10, 11, 20, 21, 22, 23, 24])
+
+
+@pytest.mark.parametrize(
+    'index',
+    [
+        np.arange(100, 200),
+        np.array([1, 5, 7, 100, DEFAULT_DETECTOR.config.n_pixels - 1]),
+    ],
+)
+def test_region_filter_call(
+    index,
+):
+    units = Units.percent
+    intensity = np.random.randn(2, DEFAULT_DETECTOR.config.n_pixels)
+    datum = Datum(
+        units=units,
+        intensity=intensity,
+        clipped=calculate_clipped(intensity, units=units),
+        deviation=calculate_deviation(intensity, units=units),
+    )
+    filter = RegionFilter(
+        index=index,
+    )
+
+    datum_filtrated = filter(
+        datum=datum,
+    )
+
+    assert datum_filtrated.n_times == datum.n_times
+    assert datum_filtrated.n_numbers == len(index)
+    assert np.all(datum_filtrated.number == index)
+    assert np.all(datum_filtrated.intensity == datum.intensity[:, index])
+    assert np.all(datum_filtrated.clipped == datum.clipped[:, index])
+    assert np.all(datum_filtrated.deviation == datum.deviation[:, index])
+
+
+def test_region_filter_number():
+    datum = Datum(
+        units=Units.percent,
+        intensity=np.random.randn(2, 100),
+        number=np.arange(100, 200),
+    )
+    filter = RegionFilter(
+        index=[1, 5, 7],
+    )
+
+    assert np.all(filter(datum).number == [101, 105, 107])
+
+
+def test_region_filter_batch():
+    units = Units.percent
+    index = np.array([1, 5, 7, 100])
+    batch = Batch(
+        units=units,
+        intensity=np.random.randn(3, 2, DEFAULT_DETECTOR.config.n_pixels),
+    )
+    filter = RegionFilter(
+        index=index,
+    )
+
+    batch_filtrated = filter.batch(batch)
+
+    assert np.all(batch_filtrated.intensity == batch.intensity[:, :, index])
+    assert np.all(batch_filtrated[0].number == index)
+
+
+def test_region_filter_crop():
+    units = Units.percent
+    intensity = np.arange(DEFAULT_DETECTOR.config.n_pixels, dtype=float)
+    offset = Data(
+        units=units,
+        intensity=intensity,
+    )
+    filter = RegionFilter(
+        index=np.arange(10, 20),
+    )
+
+    offset_cropped = filter.crop(offset)
+
+    assert np.all(offset_cropped.intensity == intensity[10:20])
+    assert np.all(offset_cropped.number == np.arange(10, 20))
+
+
+def test_region_filter_out_of_range():
+    datum = Datum(
+        units=Units.percent,
+        intensity=np.zeros(10),
+    )
+    filter = RegionFilter(
+        index=[5, 10],
+    )
+
+    with pytest.raises(DatumFilterError):
+        filter(datum)
@@ -1,4 +1,15 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.config import DEFAULT_DETECTOR
+from vmk_spectrum3_wrapper.data import Batch, Datum
+from vmk_spectrum3_wrapper.exception import ShuffleError
 from vmk_spectrum3_wrapper.measurement_manager.filters.core_filters import ShuffleFilter
+from vmk_spectrum3_wrapper.shuffle import Shuffle
+from vmk_spectrum3_wrapper.units import Units
 
 
 def test_shuffle_filter_skip():
@@ -7,3 +18,83 @@ def test_shuffle_filter_skip():
     )
 
     assert filter is None
+
+
+@pytest.fixture
+def fake_shuffle() -> Shuffle:
+    n_pixels = DEFAULT_DETECTOR.config.n_pixels
+
+    return Shuffle.create(
+        n_pixels=n_pixels,
+        offset=4,
+        permutation=np.concatenate([np.arange(n_pixels//2, n_pixels), np.arange(n_pixels//2)[::-1]]),
+    )
+
+
+def test_shuffle_filter_call(
+    fake_shuffle: Shuffle,
+):
+    n_pixels = DEFAULT_DETECTOR.config.n_pixels
+    frame = np.arange(n_pixels + 4).reshape(1, -1)
+    datum = Datum(
+        units=Units.digit,
+        intensity=frame,
+    )
+    filter = ShuffleFilter(
+        shuffle=fake_shuffle,
+    )
+
+    datum_filtrated = filter(
+        datum=datum,
+    )
+
+    assert datum_filtrated.n_numbers == n_pixels
+    assert datum_filtrated.intensity[0, 0] == n_pixels//2 + 4
+    assert datum_filtrated.intensity[0, -1] == 4
+    assert np.all(np.sort(datum_filtrated.intensity) == frame[:, 4:])
+    assert datum_filtrated.clipped is None
+
+
+def test_shuffle_filter_batch(
+    fake_shuffle: Shuffle,
+):
+    n_pixels = DEFAULT_DETECTOR.config.n_pixels
+    batch = Batch(
+        units=Units.digit,
+        intensity=np.random.randint(0, 100, size=(3, 2, n_pixels + 4)),
+    )
+    filter = ShuffleFilter(
+        shuffle=fake_shuffle,
+    )
+
+    batch_filtrated = filter.batch(batch)
+
+    for datum, datum_filtrated in zip(batch, batch_filtrated):
+        assert np.all(datum_filtrated.intensity == filter(datum).intensity)
+
+
+def test_shuffle_load(
+    tmp_path,
+    fake_shuffle: Shuffle,
+):
+    filepath = os.path.join(tmp_path, 'shuffle.json')
+    with open(filepath, 'w') as file:
+        json.dump({
+            'n_pixels': DEFAULT_DETECTOR.config.n_pixels,
+            'offset': 4,
+            'permutation': (fake_shuffle.index - 4).tolist(),
+        }, file)
+
+    assert Shuffle.load(filepath) == fake_shuffle
+
+
+def test_shuffle_short_frame(
+    fake_shuffle: Shuffle,
+):
+    with pytest.raises(ShuffleError):
+        fake_shuffle(np.zeros((1, DEFAULT_DETECTOR.config.n_pixels)))
+
+
+def test_shuffle_invalid_permutation():
+    with pytest.raises(ShuffleError):
+        Shuffle.create(n_pixels=4, permutation=[0, 1, 1, 2])
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+from tests.utils import calculate_deviation
+from vmk_spectrum3_wrapper.data import Batch, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters import PipeFilter, SwitchFilter
+from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import DatumFilterError
+from vmk_spectrum3_wrapper.measurement_manager.filters.integration_filters import MedianIntegrationFilter, SigmaClippedIntegrationFilter
+from vmk_spectrum3_wrapper.types import Array, Percent
+from vmk_spectrum3_wrapper.units import Units
+
+
+N_NUMBERS = 2048
+
+
+def create_datum(n_times: int, n_spikes: int = 0, seed: int = 0) -> tuple[Datum, Array[bool]]:
+    units = Units.percent
+    rng = np.random.default_rng(seed)  # фиксированный шум (случайные отклонения за `threshold` не отбраковываются)
+
+    intensity = 10 + rng.standard_normal((n_times, N_NUMBERS)) * calculate_deviation(10, units=units)
+    spikes = np.zeros((n_times, N_NUMBERS), dtype=bool)
+    for t in range(n_spikes):
+        spikes[t, ::7] = True
+    intensity[spikes] += 50
+
+    datum = Datum(
+        units=units,
+        intensity=intensity,
+        clipped=np.zeros((n_times, N_NUMBERS), dtype=bool),
+        deviation=calculate_deviation(intensity, units=units),
+    )
+    return datum, spikes
+
+
+@pytest.mark.parametrize(
+    'n_times', [1, 2, 5, 10],
+)
+def test_median_integration_filter(
+    n_times: int,
+):
+    datum, _ = create_datum(n_times)
+    expected = np.median(datum.intensity, axis=0)
+
+    filter = MedianIntegrationFilter()
+    datum_filtrated = filter(datum)
+
+    assert datum_filtrated.n_times == 1
+    assert np.allclose(datum_filtrated.intensity.flatten(), expected)
+    assert not np.any(datum_filtrated.clipped)
+
+
+def test_median_integration_filter_rejected():
+    n_times, n_spikes = 11, 3
+    datum, spikes = create_datum(n_times, n_spikes=n_spikes)
+
+    filter = MedianIntegrationFilter()
+    datum_filtrated = filter(datum)
+
+    assert np.all(datum_filtrated.rejected.flatten()[::7] == n_spikes)
+    assert np.all(np.abs(datum_filtrated.intensity.flatten() - 10) < 1)
+    assert np.any(datum.intensity[spikes] > 50)
+
+
+def test_median_integration_filter_rejected_switch():
+    capacity = (11, 9)
+    datum, _ = create_datum(sum(capacity), n_spikes=3)  # выбросы только в первой схеме измерения
+    datum.clipped[:] = False
+
+    filter = SwitchFilter([
+        PipeFilter([MedianIntegrationFilter()]),
+        PipeFilter([MedianIntegrationFilter()]),
+    ])
+    datum_filtrated = filter(datum, capacity=capacity)
+    batch_filtrated = filter.batch(Batch.stack([datum, datum]), capacity=capacity)
+
+    for rejected in [datum_filtrated.rejected, *batch_filtrated.rejected]:
+        assert rejected.shape == (2, N_NUMBERS)
+        assert np.all(rejected[0, ::7] == 3)
+        assert np.all(rejected[1, ::7] == 0)
+
+
+@pytest.mark.parametrize(
+    'shared', [True, False],
+)
+def test_median_integration_filter_shared(
+    shared: bool,
+):
+    datum, _ = create_datum(5)
+    datum = Datum(units=datum.units, intensity=datum.intensity, clipped=datum.clipped, deviation=datum.deviation, shared=shared)
+    intensity = datum.intensity.copy()
+
+    datum_filtrated = MedianIntegrationFilter()(datum)
+
+    assert np.allclose(datum_filtrated.intensity.flatten(), np.median(intensity, axis=0))
+    assert np.array_equal(datum.intensity, intensity) == shared  # общий буфер не изменяется, необщий - сортируется на месте
+
+
+@pytest.mark.parametrize(
+    ['n_clipped', 'expected'],
+    [(0, False), (2, False), (3, True), (5, True)],
+)
+def test_median_integration_filter_clipped(
+    n_clipped: int,
+    expected: bool,
+):
+    datum, _ = create_datum(5)
+    datum.clipped[:n_clipped] = True
+
+    datum_filtrated = MedianIntegrationFilter()(datum)
+
+    assert np.all(datum_filtrated.clipped == expected)
+
+
+def test_sigma_clipped_integration_filter():
+    n_times, n_spikes = 20, 2
+    datum, spikes = create_datum(n_times, n_spikes=n_spikes)
+
+    filter = SigmaClippedIntegrationFilter(threshold=5)
+    datum_filtrated = filter(datum)
+
+    expected = np.sum(np.where(spikes, 0, datum.intensity), axis=0) / np.sum(~spikes, axis=0)
+    assert np.allclose(datum_filtrated.intensity.flatten(), expected)
+    assert np.all(datum_filtrated.rejected.flatten() == np.sum(spikes, axis=0))
+    assert not np.any(datum_filtrated.clipped)
+
+
+def test_sigma_clipped_integration_filter_clipped():
+    datum, _ = create_datum(10)
+    datum.clipped[:, :10] = True
+    datum.clipped[:3, 10:20] = True
+
+    filter = SigmaClippedIntegrationFilter(threshold=10)
+    datum_filtrated = filter(datum)
+
+    assert np.all(datum_filtrated.clipped.flatten()[:10])
+    assert not np.any(datum_filtrated.clipped.flatten()[10:])
+    assert np.all(datum_filtrated.rejected.flatten()[:10] == 10)
+    assert np.all(datum_filtrated.rejected.flatten()[10:20] == 3)
+    assert np.allclose(datum_filtrated.intensity.flatten()[10:20], np.mean(datum.intensity[3:, 10:20], axis=0))
+
+
+def test_sigma_clipped_integration_filter_without_deviation_error():
+    intensity: Array[Percent] = np.random.randn(10, N_NUMBERS)
+    datum = Datum(
+        units=Units.percent,
+        intensity=intensity,
+    )
+
+    with pytest.raises(DatumFilterError):
+        SigmaClippedIntegrationFilter()(datum)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from tests.utils import calculate_clipped, calculate_deviation
+from vmk_spectrum3_wrapper.config import DEFAULT_ADC, DEFAULT_DETECTOR
+from vmk_spectrum3_wrapper.data import Data
+from vmk_spectrum3_wrapper.types import Array, Digit
+from vmk_spectrum3_wrapper.units import Units
+
+
+@pytest.fixture
+def fake_offset() -> Data:
+    units = Units.percent
+    intensity = np.full(DEFAULT_DETECTOR.config.n_pixels, 5)
+
+    return Data(
+        units=units,
+        intensity=intensity,
+        clipped=calculate_clipped(intensity, units=units),
+        deviation=calculate_deviation(intensity, units=units),
+    )
+
+
+@pytest.fixture
+def fake_frames() -> Array[Digit]:
+    n_frames = 120
+
+    frames = np.random.randint(0, DEFAULT_ADC.value_max, size=(n_frames, DEFAULT_DETECTOR.config.n_pixels))
+    frames[:, :10] = DEFAULT_ADC.value_max
+
+    return frames
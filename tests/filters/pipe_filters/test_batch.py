@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.data import Batch, Data, Datum
+from vmk_spectrum3_wrapper.data.exceptions import ArrayShapeError
+from vmk_spectrum3_wrapper.measurement_manager.filters import CorePreset, EyeFilter, PipeFilter, StandardIntegrationPreset, SwitchFilter
+from vmk_spectrum3_wrapper.types import Array, Digit
+from vmk_spectrum3_wrapper.units import Units
+
+
+def assert_batch_equal(batch: Batch, data: list[Datum]) -> None:
+    assert batch.n_schemas == len(data)
+
+    for i, datum in enumerate(data):
+        assert np.allclose(batch.intensity[i], datum.intensity, equal_nan=True)
+        assert np.array_equal(batch.clipped[i], datum.clipped)
+        assert np.allclose(batch.deviation[i], datum.deviation, equal_nan=True)
+
+
+def test_batch_create(
+    fake_frames: Array[Digit],
+):
+    batch = Batch.create(fake_frames, n_times=10)
+
+    assert batch.n_schemas == 12
+    assert batch.n_times == 10
+    assert np.shares_memory(batch.intensity, fake_frames)
+
+
+def test_batch_create_error(
+    fake_frames: Array[Digit],
+):
+    with pytest.raises(ArrayShapeError):
+        Batch.create(fake_frames, n_times=7)
+
+
+@pytest.mark.parametrize(
+    'n_times', [1, 10, 40],
+)
+def test_standard_integration_preset_batch(
+    n_times: int,
+    fake_frames: Array[Digit],
+    fake_offset: Data,
+):
+    filter = StandardIntegrationPreset(units=Units.percent, bias=fake_offset, dark=fake_offset)
+    batch = Batch.create(fake_frames, n_times=n_times)
+
+    expected = [
+        filter(Datum(units=Units.digit, intensity=fake_frames[t:t+n_times]), exposure=1, capacity=n_times)
+        for t in range(0, len(fake_frames), n_times)
+    ]
+
+    assert_batch_equal(filter.batch(batch, exposure=1, capacity=n_times), expected)
+
+
+def test_core_preset_batch(
+    fake_frames: Array[Digit],
+    fake_offset: Data,
+):
+    filter = CorePreset(units=Units.percent, bias=fake_offset, dark=fake_offset)
+    batch = Batch.create(fake_frames, n_times=10)
+
+    expected = [
+        filter(datum)
+        for datum in batch
+    ]
+
+    assert_batch_equal(filter.batch(batch), expected)
+
+
+def test_switch_filter_batch(
+    fake_frames: Array[Digit],
+    fake_offset: Data,
+):
+    capacity = (8, 2)
+    filter = PipeFilter([
+        EyeFilter(),
+        SwitchFilter([
+            StandardIntegrationPreset(bias=fake_offset),
+            StandardIntegrationPreset(bias=fake_offset),
+        ]),
+    ])
+    batch = Batch.create(fake_frames, n_times=sum(capacity))
+
+    expected = [
+        filter(datum, capacity=capacity)
+        for datum in batch
+    ]
+
+    assert_batch_equal(filter.batch(batch, capacity=capacity), expected)
+
+
+class FailingFilter(EyeFilter):
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        raise ValueError
+
+
+@pytest.mark.parametrize(
+    'filter', [
+        PipeFilter([EyeFilter(), FailingFilter()]),
+        PipeFilter([SwitchFilter([PipeFilter([FailingFilter()]), PipeFilter([EyeFilter()])])]),
+    ],
+)
+def test_batch_error(
+    filter: PipeFilter,
+    fake_frames: Array[Digit],
+):
+    batch = Batch.create(fake_frames, n_times=10)
+
+    with pytest.raises(ValueError):
+        filter.batch(batch, capacity=(8, 2))
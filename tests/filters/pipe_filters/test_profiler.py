@@ -0,0 +1,145 @@
+from functools import partial
+import logging
+
+import numpy as np
+import pytest
+
+from tests.fakes.device import device_manager_factory
+from vmk_spectrum3_wrapper.data import Data, Datum
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+from vmk_spectrum3_wrapper.measurement_manager.filters import EyeFilter, FilterProfiler, PipeFilter, StandardIntegrationPreset, SwitchFilter
+from vmk_spectrum3_wrapper.measurement_manager.storage import Storage
+from vmk_spectrum3_wrapper.types import Array, Digit
+from vmk_spectrum3_wrapper.units import Units
+
+
+def test_filter_profiler(
+    fake_frames: Array[Digit],
+    fake_offset: Data,
+):
+    filter = StandardIntegrationPreset(bias=fake_offset)
+    profiler = FilterProfiler()
+    filter.profile(profiler)
+
+    n_calls = 5
+    for _ in range(n_calls):
+        filter(Datum(units=Units.digit, intensity=fake_frames))
+
+    report = profiler.report()
+    assert list(report) == [
+        'StandardIntegrationPreset/0:CorePreset',
+        'StandardIntegrationPreset/0:CorePreset/0:ClipFilter',
+        'StandardIntegrationPreset/0:CorePreset/1:ScaleFilter',
+        'StandardIntegrationPreset/0:CorePreset/2:OffsetFilter',
+        'StandardIntegrationPreset/0:CorePreset/3:DeviationFilter',
+        'StandardIntegrationPreset/1:StandardIntegrationFilter',
+    ]
+    for stats in report.values():
+        assert stats['n_calls'] == n_calls
+        assert stats['total'] > 0
+        assert stats['p50'] <= stats['p99'] <= stats['max']
+
+    assert report['StandardIntegrationPreset/0:CorePreset/0:ClipFilter']['n_bytes'] == n_calls * fake_frames.size * np.dtype(bool).itemsize
+
+
+def test_filter_profiler_switch_filter(
+    fake_frames: Array[Digit],
+):
+    filter = PipeFilter([
+        SwitchFilter([
+            StandardIntegrationPreset(),
+            StandardIntegrationPreset(),
+        ]),
+    ])
+    profiler = FilterProfiler()
+    filter.profile(profiler)
+
+    filter(Datum(units=Units.digit, intensity=fake_frames[:10]), capacity=(8, 2))
+
+    report = profiler.report()
+    assert report['PipeFilter/0:SwitchFilter']['n_calls'] == 1
+    assert report['PipeFilter/0:SwitchFilter/1:StandardIntegrationPreset']['n_calls'] == 1
+    assert report['PipeFilter/0:SwitchFilter/1:StandardIntegrationPreset/1:StandardIntegrationFilter']['n_calls'] == 1
+
+
+def test_filter_profiler_disabled(
+    fake_frames: Array[Digit],
+):
+    filter = StandardIntegrationPreset()
+    profiler = FilterProfiler()
+    filter.profile(profiler)
+    filter.profile(None)
+
+    filter(Datum(units=Units.digit, intensity=fake_frames))
+
+    assert all(
+        stats['n_calls'] == 0
+        for stats in profiler.report().values()
+    )
+
+
+@pytest.mark.parametrize(
+    'profile', [True, False],
+)
+def test_storage_filter_report(
+    profile: bool,
+    fake_frames: Array[Digit],
+):
+    storage = Storage(exposure=1, capacity=10, profile=profile)
+
+    for frame in fake_frames:
+        storage.put(frame)
+
+    if profile:
+        assert storage.filter_report['StandardIntegrationPreset/1:StandardIntegrationFilter']['n_calls'] == len(fake_frames) // 10
+    else:
+        assert storage.filter_report is None
+
+
+def test_device_filter_report(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(Device, 'config', DeviceConfigAuto(change_exposure_timeout=0))
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
+    n_times = 10
+
+    device = Device()
+    device.connect()
+    device.setup(
+        n_times=n_times,
+        exposure=1,
+        profile=True,
+    )
+    device.read()
+
+    assert device.filter_report['StandardIntegrationPreset/0:CorePreset']['n_calls'] == n_times
+
+
+class FailingFilter(EyeFilter):
+
+    def __call__(self, datum: Datum, *args, **kwargs) -> Datum:
+        raise ValueError
+
+
+@pytest.mark.parametrize(
+    'profile', [True, False],
+)
+def test_filter_profiler_error(
+    profile: bool,
+    fake_frames: Array[Digit],
+    caplog: pytest.LogCaptureFixture,
+    capsys: pytest.CaptureFixture,
+):
+    filter = PipeFilter([FailingFilter(), EyeFilter()])
+    profiler = FilterProfiler()
+    filter.profile(profiler if profile else None)
+
+    datum = Datum(units=Units.digit, intensity=fake_frames)
+    with caplog.at_level(logging.ERROR):
+        result = filter(datum)
+
+    assert np.array_equal(result.intensity, datum.intensity)
+    assert any(record.exc_info for record in caplog.records)
+    assert capsys.readouterr().out == ''
+    if profile:
+        assert profiler.report()['PipeFilter/1:EyeFilter']['n_calls'] == 1
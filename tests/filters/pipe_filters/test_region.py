@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.data import Data, Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters import CorePreset, RegionFilter, StandardIntegrationPreset
+from vmk_spectrum3_wrapper.measurement_manager.filters.exceptions import FilterError
+from vmk_spectrum3_wrapper.types import Array, Digit
+from vmk_spectrum3_wrapper.units import Units
+
+
+def test_region_preset(
+    fake_offset: Data,
+    fake_frames: Array[Digit],
+):
+    index = np.concatenate([np.arange(5, 15), np.arange(1000, 1020)])
+    datum = Datum(
+        units=Units.digit,
+        intensity=fake_frames,
+    )
+    filter = StandardIntegrationPreset(bias=fake_offset)
+    filter_region = StandardIntegrationPreset(bias=fake_offset, region=index)
+
+    expected = filter(datum, exposure=1, capacity=len(fake_frames))
+    result = filter_region(datum, exposure=1, capacity=len(fake_frames))
+
+    assert result.n_numbers == len(index)
+    assert np.all(result.number == index)
+    assert np.allclose(result.intensity, expected.intensity[:, index])
+    assert np.all(result.clipped == expected.clipped[:, index])
+    assert np.allclose(result.deviation, expected.deviation[:, index], equal_nan=True)
+
+    data = Data.squeeze([result], meta=None)
+    assert np.all(Data.loads(data.dumps()).number == index)
+
+
+def test_region_preset_binning():
+    index = RegionFilter.from_windows([(0, 4), (100, 106)]).index
+    datum = Datum(
+        units=Units.digit,
+        intensity=np.arange(2048, dtype=float).reshape(1, -1),
+    )
+    filter = CorePreset(units=Units.digit, binning=2, region=index)
+
+    result = filter(datum)
+
+    assert np.all(result.number == [0, 2, 100, 102, 104])
+    assert np.allclose(result.intensity, [[.5, 2.5, 100.5, 102.5, 104.5]])
+
+
+@pytest.mark.parametrize(
+    'windows', [
+        [(0, 3), (100, 103)],
+        [(0, 4), (100, 103)],
+    ],
+)
+def test_region_preset_binning_error(
+    windows: list[tuple[int, int]],
+):
+    index = RegionFilter.from_windows(windows).index
+
+    with pytest.raises(FilterError):
+        CorePreset(binning=2, region=index)
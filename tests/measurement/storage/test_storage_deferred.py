@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters import EyeFilter, PipeFilter
+from vmk_spectrum3_wrapper.measurement_manager.storage import Storage
+
+
+N_NUMBERS = 2048
+
+
+@pytest.mark.parametrize(
+    'capacity', [1, 10],
+)
+def test_storage_deferred(capacity: int):
+    frames = np.random.randint(0, 2**16-1, size=(10*capacity, N_NUMBERS))
+    threads = set()
+
+    storage = Storage(1, capacity, filter=PipeFilter([EyeFilter()]), deferred=True)
+    storage.subscribe(lambda datum: threads.add(threading.current_thread().name))
+    for frame in frames:
+        storage.put(frame)
+
+    data, _, _ = storage.pull()
+    storage.close()
+
+    assert len(data) == 10
+    assert np.array_equal(np.concatenate([datum.intensity for datum in data]), frames)
+    assert threads == {'Storage.worker'}
+    assert not storage.deferred
+
+
+def test_storage_defer_at_runtime():
+    frames = np.random.randint(0, 2**16-1, size=(10, N_NUMBERS))
+
+    storage = Storage(1, 1, filter=PipeFilter([EyeFilter()]))
+    for n, frame in enumerate(frames):
+        if n == 5:
+            storage.defer()
+        storage.put(frame)
+
+    storage.join()
+    assert storage.deferred
+    assert storage.queue_depth == 0
+    assert np.array_equal(np.concatenate([datum.intensity for datum in storage.data]), frames)
+
+    storage.close()
+
+
+def test_storage_deferred_error():
+
+    def callback(datum: Datum) -> None:
+        raise ValueError
+
+    storage = Storage(1, 1, filter=PipeFilter([EyeFilter()]), deferred=True)
+    storage.subscribe(callback)
+    for frame in np.zeros((3, N_NUMBERS)):
+        storage.put(frame)
+    storage.join()
+
+    assert len(storage) == 3
+
+    storage.close()
@@ -0,0 +1,159 @@
+from functools import partial
+import os
+
+import numpy as np
+import pytest
+
+from tests.fakes.device import device_manager_factory, FakeDeviceManager
+from vmk_spectrum3_wrapper.codec import Codec
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+from vmk_spectrum3_wrapper.measurement_manager.filters import EyeFilter, PipeFilter
+from vmk_spectrum3_wrapper.recorder import RawFrameRecorder, Recording, record_dtype
+from vmk_spectrum3_wrapper.recorder.exceptions import RecordingError
+
+
+N_NUMBERS = 2048
+
+
+@pytest.mark.parametrize(
+    'n_frames', [0, 1, 10, 100],
+)
+@pytest.mark.parametrize(
+    'codec', [None, Codec(block_size=16)],
+)
+def test_recorder(
+    n_frames: int,
+    codec: Codec | None,
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    frames = np.random.randint(0, 2**16-1, size=(n_frames, N_NUMBERS))
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=100, codec=codec) as recorder:
+        for n, frame in enumerate(frames):
+            recorder.put(frame, frame_number=n + 1, assembly_id='0.0.0.2')
+
+    assert recorder.n_written == n_frames
+    assert recorder.n_dropped == 0
+
+    recording = Recording(filepath)
+    assert len(recording) == n_frames
+    assert np.array_equal(recording.frames, frames)
+    assert np.array_equal(recording.frame_number, np.arange(1, n_frames + 1))
+    assert np.all(recording.assembly_id == b'0.0.0.2')
+    assert np.all(np.diff(recording.timestamp) >= 0)
+
+
+def test_recorder_layout(
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=10) as recorder:
+        recorder.put(np.ones(N_NUMBERS), frame_number=1, assembly_id='0.0.0.2')
+
+    records = np.load(filepath, mmap_mode='r')
+    assert isinstance(records, np.memmap)
+    assert records.dtype == record_dtype(N_NUMBERS)
+    assert records.shape == (10, )
+
+
+def test_recorder_overflow(
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=5) as recorder:
+        for n in range(10):
+            recorder.put(np.ones(N_NUMBERS), frame_number=n + 1, assembly_id='0.0.0.2')
+
+    assert recorder.n_written == 5
+    assert recorder.n_dropped == 5
+    assert len(Recording(filepath)) == 5
+
+
+def test_recorder_closed(
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    recorder = RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=10)
+
+    assert not recorder.put(np.ones(N_NUMBERS), frame_number=1, assembly_id='0.0.0.2')
+    assert recorder.n_dropped == 1
+
+    with recorder:
+        recorder.put(np.ones(N_NUMBERS), frame_number=1, assembly_id='0.0.0.2')
+    assert not recorder.put(np.ones(N_NUMBERS), frame_number=2, assembly_id='0.0.0.2')
+    assert recorder.n_dropped == 1
+    assert recorder.queue_depth == 0
+
+    with recorder:  # кадры закрытого регистратора не записываются при следующем открытии
+        pass
+    assert recorder.n_written == 0
+    assert recorder.n_dropped == 0
+
+
+@pytest.mark.parametrize(
+    'codec', [None, Codec(block_size=16)],
+)
+def test_recorder_write_error(
+    codec: Codec | None,
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=10, codec=codec) as recorder:
+        recorder.put(np.ones(N_NUMBERS), frame_number=1, assembly_id='0.0.0.2')
+        recorder.put(np.ones(N_NUMBERS + 1), frame_number=2, assembly_id='0.0.0.2')  # кадр недопустимой формы
+        recorder.put(np.ones(N_NUMBERS), frame_number=3, assembly_id='0.0.0.2')
+
+    assert recorder.n_written == 2
+    assert recorder.n_dropped == 1
+    assert np.array_equal(Recording(filepath).frame_number, [1, 3])
+
+
+def test_recorder_assembly_id(
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.npy')
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=10) as recorder:
+        assert not recorder.put(np.ones(N_NUMBERS), frame_number=1, assembly_id='0' * 33)
+        assert recorder.put(np.ones(N_NUMBERS), frame_number=2, assembly_id='0' * 32)
+
+    assert recorder.n_written == 1
+    assert recorder.n_dropped == 1
+
+
+def test_recording_not_found_error(
+    tmp_path,
+):
+    with pytest.raises(RecordingError):
+        Recording(os.path.join(tmp_path, 'raw.npy'))
+
+
+def test_device_read_with_recorder(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path,
+):
+    monkeypatch.setattr(Device, 'config', DeviceConfigAuto(change_exposure_timeout=0))
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
+    filepath = os.path.join(tmp_path, 'raw.npy')
+    n_times = 10
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=100) as recorder:
+        device = Device(recorder=recorder)
+        device.connect()
+        device.setup(
+            n_times=n_times,
+            exposure=1,
+            filter=PipeFilter([
+                EyeFilter(),
+            ]),
+        )
+        data = device.read()
+
+    recording = Recording(filepath)
+    assert len(recording) == n_times
+    assert np.array_equal(recording.frames, data.intensity)
+    assert np.all(recording.assembly_id == FakeDeviceManager.FAKE_IP.encode())
@@ -0,0 +1,223 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.codec import Codec
+from vmk_spectrum3_wrapper.data import Batch, Data, Datum
+from vmk_spectrum3_wrapper.data.io import is_data_file
+from vmk_spectrum3_wrapper.measurement_manager.filters import EyeFilter, PipeFilter, StandardIntegrationPreset
+from vmk_spectrum3_wrapper.recorder import RawFrameRecorder, Recording
+from vmk_spectrum3_wrapper.reprocessing import Reprocessor
+from vmk_spectrum3_wrapper.reprocessing.__main__ import main
+from vmk_spectrum3_wrapper.reprocessing.exceptions import ReprocessingError
+from vmk_spectrum3_wrapper.types import Array, Digit, Path
+from vmk_spectrum3_wrapper.units import Units
+
+
+N_NUMBERS = 2048
+
+
+@pytest.fixture
+def fake_frames() -> Array[Digit]:
+    return np.random.randint(0, 2**16-1, size=(205, N_NUMBERS))
+
+
+@pytest.fixture
+def fake_recording(
+    fake_frames: Array[Digit],
+    tmp_path,
+) -> Path:
+    filepath = os.path.join(tmp_path, 'raw.npy')
+
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=len(fake_frames)) as recorder:
+        for n, frame in enumerate(fake_frames):
+            recorder.put(frame, frame_number=n + 1, assembly_id=f'0.0.0.{2 + n % 2}')
+
+    return filepath
+
+
+@pytest.mark.parametrize(
+    'n_workers', [1, 2],
+)
+@pytest.mark.parametrize(
+    'chunk_size', [1, 3, 100],
+)
+def test_reprocessor(
+    n_workers: int,
+    chunk_size: int,
+    fake_frames: Array[Digit],
+    fake_recording: Path,
+):
+    capacity = 10
+    filter = StandardIntegrationPreset(units=Units.percent)
+
+    reprocessor = Reprocessor(
+        fake_recording,
+        exposure=1,
+        capacity=capacity,
+        filter=filter,
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+    )
+    data = reprocessor.run()
+
+    expected = [
+        filter(Datum(units=Units.digit, intensity=fake_frames[t:t+capacity]), exposure=1, capacity=capacity)
+        for t in range(0, reprocessor.n_schemas*capacity, capacity)
+    ]
+    assert reprocessor.n_schemas == 20
+    assert data.n_times == 20
+    assert data.units == Units.percent
+    assert np.allclose(data.intensity, np.concatenate([datum.intensity for datum in expected]))
+    assert np.array_equal(data.clipped, np.concatenate([datum.clipped for datum in expected]))
+
+
+def test_reprocessor_assembly_id(
+    fake_frames: Array[Digit],
+    fake_recording: Path,
+):
+    reprocessor = Reprocessor(
+        fake_recording,
+        exposure=1,
+        capacity=1,
+        filter=StandardIntegrationPreset(units=Units.digit),
+        n_workers=1,
+        assembly_id='0.0.0.3',
+    )
+    data = reprocessor.run()
+
+    assert np.allclose(data.intensity, fake_frames[1::2])
+
+
+def test_reprocessor_meta(
+    fake_recording: Path,
+):
+    reprocessor = Reprocessor(
+        fake_recording,
+        exposure=1,
+        capacity=10,
+        n_workers=1,
+        assembly_id='0.0.0.3',
+    )
+    timestamp = Recording(fake_recording).timestamp
+
+    assert reprocessor.n_schemas == 10
+    assert reprocessor.meta.started_at == timestamp[1]
+    assert reprocessor.meta.finished_at == timestamp[199]  # последние кадры неполной схемы измерения не обрабатываются
+    assert abs(reprocessor.meta.started_at - time.time()) < 60  # системные часы (как у `meta` измерения)
+
+
+def test_reprocessor_main(
+    fake_recording: Path,
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'data.pkl')
+
+    main([fake_recording, '--exposure', '1', '--capacity', '5', '--output', filepath, '--workers', '1'])
+
+    data = Data.load(filepath)
+    assert data.n_times == 41
+    assert data.meta.capacity == 5
+
+
+def test_reprocessor_compressed(
+    fake_frames: Array[Digit],
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'raw.bin')
+    with RawFrameRecorder(filepath, n_numbers=N_NUMBERS, capacity=len(fake_frames), codec=Codec(filter='delta', block_size=16)) as recorder:
+        for n, frame in enumerate(fake_frames):
+            recorder.put(frame, frame_number=n + 1, assembly_id='0.0.0.2')
+
+    reprocessor = Reprocessor(
+        filepath,
+        exposure=1,
+        capacity=10,
+        filter=StandardIntegrationPreset(units=Units.percent),
+        chunk_size=3,
+        n_workers=2,
+    )
+    data = reprocessor.run()
+
+    assert data.n_times == len(fake_frames) // 10
+    assert np.allclose(data.intensity[0], StandardIntegrationPreset(units=Units.percent)(
+        Datum(units=Units.digit, intensity=fake_frames[:10]),
+        exposure=1,
+        capacity=10,
+    ).intensity[0])
+
+
+@pytest.mark.parametrize(
+    'n_workers', [1, 2],
+)
+def test_reprocessor_extended_schema_default_filter(
+    n_workers: int,
+    fake_recording: Path,
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.chdir(tmp_path)
+
+    reprocessor = Reprocessor(
+        fake_recording,
+        exposure=(1, 10),
+        capacity=(8, 2),
+        chunk_size=3,
+        n_workers=n_workers,
+    )
+    data = reprocessor.run()
+
+    assert data.n_times == reprocessor.n_schemas == 20
+    assert not np.any(np.isnan(data.intensity))
+    assert os.listdir(tmp_path) == ['raw.npy']
+
+
+class FailingFilter(EyeFilter):
+
+    def batch(self, batch: Batch, *args, **kwargs) -> Batch:
+        raise ValueError
+
+
+def test_reprocessor_filter_error(
+    fake_recording: Path,
+):
+    reprocessor = Reprocessor(
+        fake_recording,
+        exposure=1,
+        capacity=10,
+        filter=PipeFilter([EyeFilter(), FailingFilter()]),
+        n_workers=1,
+    )
+
+    with pytest.raises(ReprocessingError):
+        reprocessor.run()
+
+
+@pytest.mark.parametrize(
+    'n_workers', [1, 2],
+)
+def test_reprocessor_output(
+    n_workers: int,
+    fake_recording: Path,
+    tmp_path,
+):
+    filepath = os.path.join(tmp_path, 'data.dat')
+    reprocessor = Reprocessor(
+        fake_recording,
+        exposure=1,
+        capacity=10,
+        filter=StandardIntegrationPreset(units=Units.percent),
+        chunk_size=3,
+        n_workers=n_workers,
+    )
+
+    data = reprocessor.run(output=filepath)
+
+    expected = reprocessor.run()
+    assert is_data_file(filepath)
+    assert data.n_times == 20
+    assert data.meta.capacity == 10
+    assert np.allclose(data.intensity, expected.intensity)
+    assert np.array_equal(data.clipped, expected.clipped)
@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+BUDGET = .5  # s, время импорта пакета (без `numpy`)
+OPTIONAL = ('matplotlib', 'tqdm', 'dotenv', 'pkg_resources')
+
+SCRIPT = '''
+import json, sys, time
+
+import numpy
+
+started_at = time.perf_counter()
+import {modules}
+duration = time.perf_counter() - started_at
+
+print(json.dumps({{
+    'duration': duration,
+    'modules': [name for name in {optional} if name in sys.modules],
+}}))
+'''
+
+
+def run(modules: str, cwd) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join([root, os.environ.get('PYTHONPATH', '')]),
+    }
+
+    result = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(modules=modules, optional=OPTIONAL)],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    'modules',
+    [
+        'vmk_spectrum3_wrapper.data',
+        'vmk_spectrum3_wrapper.measurement_manager',
+        'vmk_spectrum3_wrapper.device',
+        'vmk_spectrum3_wrapper.calibration',
+        'vmk_spectrum3_wrapper.recorder, vmk_spectrum3_wrapper.reprocessing',
+    ],
+)
+def test_import_time(
+    tmp_path,
+    modules: str,
+):
+    result = run(modules, cwd=tmp_path)
+
+    assert result['modules'] == []
+    assert result['duration'] < BUDGET
+
+
+def test_import_version():
+    import vmk_spectrum3_wrapper
+
+    assert vmk_spectrum3_wrapper.__version__ == vmk_spectrum3_wrapper.VERSION
@@ -0,0 +1,104 @@
+from functools import partial
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from tests.fakes.device import device_manager_factory
+from vmk_spectrum3_wrapper.device.device import Device, DeviceConfigAuto, DeviceManagerFactory
+from vmk_spectrum3_wrapper.tracer import Tracer
+
+
+def complete_events(tracer: Tracer) -> list[dict]:
+    return [
+        event
+        for event in tracer.dumps()['traceEvents']
+        if event['ph'] == 'X'
+    ]
+
+
+def test_tracer_span():
+    tracer = Tracer()
+
+    with tracer.span('outer', category='test'):
+        with tracer.span('inner', category='test'):
+            time.sleep(1e-3)
+
+    outer, inner = complete_events(tracer)
+    assert (outer['name'], inner['name']) == ('outer', 'inner')
+    assert outer['cat'] == 'test'
+    assert outer['ts'] <= inner['ts']
+    assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert inner['dur'] >= 1e+3
+
+
+def test_tracer_threads():
+    tracer = Tracer()
+    barrier = threading.Barrier(4)  # потоки работают одновременно (идентификаторы потоков не переиспользуются)
+
+    def target():
+        for _ in range(100):
+            with tracer.span('worker'):
+                pass
+        barrier.wait()
+    threads = [threading.Thread(target=target, name=f'worker-{i}') for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    events = complete_events(tracer)
+    assert tracer.n_events == len(events) == 400
+    assert len({event['tid'] for event in events}) == 4
+
+    names = {event['args']['name'] for event in tracer.dumps()['traceEvents'] if event['ph'] == 'M'}
+    assert names == {f'worker-{i}' for i in range(4)}
+
+
+def test_tracer_overflow():
+    tracer = Tracer(capacity=10)
+
+    for _ in range(15):
+        tracer.add('span', 1., 2.)
+
+    assert tracer.n_events == 10
+    assert tracer.n_dropped == 5
+    assert tracer.dumps()['otherData']['n_dropped'] == 5
+
+    tracer.reset()
+    assert tracer.n_events == 0
+    assert tracer.n_dropped == 0
+
+
+def test_tracer_save(tmp_path):
+    filepath = os.path.join(tmp_path, 'trace.json')
+    tracer = Tracer()
+
+    with tracer.span('span'):
+        pass
+    tracer.save(filepath)
+
+    with open(filepath, 'r') as file:
+        dump = json.load(file)
+    assert dump['displayTimeUnit'] == 'ms'
+    assert [event['name'] for event in dump['traceEvents'] if event['ph'] == 'X'] == ['span']
+
+
+def test_device_tracer(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(DeviceManagerFactory, '_create', partial(device_manager_factory))
+    tracer = Tracer()
+    n_times, capacity = 5, 2
+
+    device = Device(config=DeviceConfigAuto(change_exposure_timeout=0), tracer=tracer).connect()
+    device.setup(n_times=n_times, exposure=1, capacity=capacity)
+    device.read(timeout=0)
+
+    names = [event['name'] for event in complete_events(tracer)]
+    assert names.count('Device.setup') == 1
+    assert names.count('Device.setup.wait') == 1
+    assert names.count('Device.read') == 1
+    assert names.count('Device.on_context') == n_times*capacity
+    assert names.count('Storage.flush') == n_times
+    assert any(name.startswith('StandardIntegrationPreset/') for name in names)
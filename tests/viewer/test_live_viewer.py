@@ -0,0 +1,81 @@
+import matplotlib
+import numpy as np
+import pytest
+
+from vmk_spectrum3_wrapper.data import Datum
+from vmk_spectrum3_wrapper.measurement_manager.filters import EyeFilter, PipeFilter
+from vmk_spectrum3_wrapper.measurement_manager.storage import Storage
+from vmk_spectrum3_wrapper.units import Units
+from vmk_spectrum3_wrapper.viewer import LiveViewer
+
+
+matplotlib.use('Agg')
+
+
+@pytest.fixture
+def fake_datum() -> Datum:
+    intensity = np.random.randn(1, 2048)
+
+    return Datum(
+        units=Units.percent,
+        intensity=intensity,
+        clipped=intensity > 2,
+    )
+
+
+@pytest.fixture
+def viewer():
+    viewer = LiveViewer(max_fps=25).start()
+    yield viewer
+    viewer.stop()
+
+
+def test_live_viewer_coalesce(
+    viewer: LiveViewer,
+    fake_datum: Datum,
+):
+    for _ in range(10):
+        viewer(fake_datum)
+
+    assert viewer.update()
+    assert not viewer.update()
+    assert viewer.n_received == 10
+    assert viewer.n_drawn == 1
+    assert viewer.n_skipped == 9
+
+
+def test_live_viewer_blit(
+    viewer: LiveViewer,
+    fake_datum: Datum,
+):
+    viewer(fake_datum)
+    viewer.update()
+    viewer.figure.canvas.draw()
+
+    viewer(fake_datum[:, :])
+    assert viewer.update()
+
+    segments = viewer._lines.get_segments()
+    assert len(segments) == 1
+    assert np.isclose(np.max(segments[0][:, 1]), np.max(fake_datum.intensity))
+    assert len(viewer._markers.get_offsets()) == np.sum(fake_datum.clipped)
+
+
+def test_storage_subscribe(
+    viewer: LiveViewer,
+):
+    storage = Storage(exposure=1, capacity=2, filter=PipeFilter([EyeFilter()]))
+
+    def broken(datum):
+        raise ValueError
+
+    storage.subscribe(broken)
+    storage.subscribe(viewer)
+    for _ in range(6):
+        storage.put(np.zeros(2048, dtype=np.uint16))
+    storage.unsubscribe(viewer)
+    storage.put(np.zeros(2048, dtype=np.uint16))
+    storage.put(np.zeros(2048, dtype=np.uint16))
+
+    assert len(storage) == 4
+    assert viewer.n_received == 3